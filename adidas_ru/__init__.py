@@ -1,10 +1,9 @@
 from datetime import datetime
-from json import loads, JSONDecodeError
+from json import JSONDecodeError
 from time import time
 from typing import List, Union
 
-from lxml import etree
-
+from scripts.embedded import extract
 from source import api
 from source.api import CURRENCIES, SIZE_TYPES, CatalogType, TargetType, RestockTargetType, TargetEndType, ItemType, \
     Price, Sizes, IRelease, IAnnounce
@@ -33,9 +32,8 @@ class Parser(api.Parser):
         result = []
 
         if mode == 0:
-            response_json = loads(etree.HTML(self.provider.request(self.catalog_url,
-                                                                   headers={'user-agent': self.user_agent}).text)
-                                  .xpath('//script[@type="text/javascript"]')[0].text.replace('window.ENV = ', ''))
+            response_json = extract(self.provider.request(self.catalog_url, headers={'user-agent': self.user_agent})
+                                    .content, 'window.ENV =')
 
             result.append(content)
 
@@ -1,26 +1,175 @@
+import lzma
+import os
+import queue
+import re
+import shutil
 import sqlite3
 import threading
+from time import gmtime, strftime
+from typing import Dict, List, Optional, Tuple
 
 from ujson import dumps
 
+from scripts import columnar
 from source import api
 from source import logger
 from source.tools import ScriptStorage
 
+batch_size = 512
+queue_size = 65536
+flush_interval = .5
+live_partitions = 3
+
+partition_pattern = re.compile(r'data-\d{4}-\d{2}\.db')
+
+
+def partitions(path: str) -> List[str]:
+    names = sorted(i for i in os.listdir(path) if partition_pattern.fullmatch(i))
+    if os.path.isfile(os.path.join(path, 'data.db')):
+        names.insert(0, 'data.db')
+    return names
+
+
+def compress(source: str, target: str) -> str:
+    try:
+        import zstandard
+    except ImportError:
+        zstandard = None
+
+    if zstandard:
+        target += '.zst'
+        with open(source, 'rb') as src, open(target + '.part', 'wb') as dst:
+            zstandard.ZstdCompressor(level=19).copy_stream(src, dst)
+    else:
+        target += '.xz'
+        with open(source, 'rb') as src, lzma.open(target + '.part', 'wb') as dst:
+            shutil.copyfileobj(src, dst, 1 << 20)
+
+    os.replace(target + '.part', target)
+    return target
+
 
 class EventsExecutor(api.EventsExecutor):
     db: sqlite3.Connection
+    partition: str
+    statements: Dict[str, str]
     lock: threading.RLock
+    items: queue.Queue
+    compactor: threading.Thread
 
     def __init__(self, name: str, log: logger.Logger, storage: ScriptStorage):
         super().__init__(name, log, storage)
         self.lock = threading.RLock()
 
-        if not self.storage.check('data.db'):
-            self.storage.file('data.db', 'w+')
-        self.db = sqlite3.connect(self.storage.path + '/data.db', 1, check_same_thread=False)
+        self.open(self.current())
+
+        self.items = queue.Queue(queue_size)
+        self.thread = threading.Thread(name='Analytic-Writer', target=self.loop, daemon=True)
+        self.thread.start()
+
+        self.compactor = threading.Thread(name='Analytic-Compactor', target=self.compact, daemon=True)
+        self.compactor.start()
+
+    @staticmethod
+    def current() -> str:
+        return strftime('data-%Y-%m.db', gmtime())
+
+    def open(self, partition: str) -> None:
+        if not self.storage.check(partition):
+            self.storage.file(partition, 'w+')
+        with self.lock:
+            self.db = sqlite3.connect(self.storage.path + '/' + partition, 1, check_same_thread=False, uri=True)
+            self.db.execute('pragma journal_mode=wal')
+            self.db.execute('pragma synchronous=normal')
+            self.partition = partition
+
+            self.check()
+            self.attach()
+
+    def attach(self) -> None:
+        names = partitions(self.storage.path)
+        previous = names[:names.index(self.partition)][-(live_partitions - 1):] if live_partitions > 1 else []
+
+        for i, name in enumerate(previous):
+            self.db.execute(f'ATTACH DATABASE ? AS p{i}',
+                            (f'file:{os.path.join(self.storage.path, name)}?mode=ro',))
 
-        self.check()
+        self.statements = {}
+        for table in ('items', 'announces'):
+            self.statements[table] = (
+                f'INSERT OR IGNORE INTO main.{table} '
+                f'SELECT NULL, ?1, ?2, ?3, ?4, ?5, ?6, ?7, ?8, ?9, ?10, ?11' +
+                ''.join(f'{" WHERE" if not i else " AND"} NOT EXISTS (SELECT 1 FROM p{i}.{table} WHERE hash = ?1)'
+                        for i in range(len(previous)))
+            )
+
+    def rollover(self, partition: str) -> None:
+        with self.lock:
+            self.db.close()
+            self.open(partition)
+
+        if not self.compactor.is_alive():
+            self.compactor = threading.Thread(name='Analytic-Compactor', target=self.compact, daemon=True)
+            self.compactor.start()
+
+    def archive(self, partition: str) -> str:
+        source = os.path.join(self.storage.path, partition)
+        directory = os.path.join(self.storage.path, 'archive')
+        os.makedirs(directory, exist_ok=True)
+
+        compacted = os.path.join(directory, partition + '.tmp')
+        if os.path.exists(compacted):
+            os.remove(compacted)
+
+        db = sqlite3.connect(source, 1)
+        try:
+            db.execute('VACUUM INTO ?', (compacted,))
+        finally:
+            db.close()
+
+        try:
+            target = compress(compacted, os.path.join(directory, partition))
+        finally:
+            os.remove(compacted)
+
+        for suffix in ('', '-wal', '-shm'):
+            if os.path.exists(source + suffix):
+                os.remove(source + suffix)
+        return target
+
+    def export(self, partition: str) -> None:
+        directory = os.path.join(self.storage.path, 'columnar')
+        target = os.path.join(directory, partition[:-3] + '.parquet')
+        if os.path.exists(target):
+            return
+
+        os.makedirs(directory, exist_ok=True)
+        try:
+            columnar.export(os.path.join(self.storage.path, partition), target)
+        except (OSError, ValueError, sqlite3.Error) as e:
+            self.log.error(f'{e.__class__.__name__} ({e.__str__()}) while exporting {partition}')
+        else:
+            self.log.info(f'Partition {partition} exported to {os.path.basename(target)}')
+
+    def compact(self) -> None:
+        names = partitions(self.storage.path)
+        try:
+            for partition in names:
+                if partition != self.partition:
+                    self.export(partition)
+        except ImportError as e:
+            self.log.error(f'Columnar export is disabled, {e.name} is not installed')
+
+        dated = [i for i in names if i != 'data.db']
+        for partition in dated[:-live_partitions]:
+            if partition == self.partition:
+                continue
+            try:
+                target = self.archive(partition)
+            except (OSError, sqlite3.Error, lzma.LZMAError) as e:
+                self.log.error(f'{e.__class__.__name__} ({e.__str__()}) while archiving {partition}')
+            else:
+                self.log.info(f'Partition {partition} archived to {os.path.basename(target)}')
 
     def check(self):
         with self.lock, self.db as c:
@@ -31,20 +180,166 @@ class EventsExecutor(api.EventsExecutor):
                             'create table if not exists announces (id integer primary key autoincrement,'
                             'hash blob not null unique, url text not null, channel text not null, name text not null, '
                             'image text not null, description text, price real not null, currency integer not null, '
-                            'sizes text not null, publish_date real not null, timestamp real not null);')
+                            'sizes text not null, publish_date real not null, timestamp real not null);'
+                            'create table if not exists sizes (item integer not null references items (id),'
+                            'size text not null, url text);'
+                            'create index if not exists items_channel_timestamp on items (channel, timestamp);'
+                            'create index if not exists items_publish_date on items (publish_date);'
+                            'create index if not exists items_url_timestamp on items (url, timestamp);'
+                            'create index if not exists announces_channel_timestamp on announces (channel, timestamp);'
+                            'create index if not exists announces_publish_date on announces (publish_date);'
+                            'create index if not exists announces_url_timestamp on announces (url, timestamp);'
+                            'create index if not exists sizes_item on sizes (item);')
+
+    @staticmethod
+    def row(item: api.ItemType) -> list:
+        return [
+            item.hash(4), item.url, item.channel, item.name, item.image, item.description,
+            item.price.current, item.price.currency, dumps(item.sizes.export()), item.publish_date,
+            item.timestamp
+        ]
+
+    def write(self, items: List[api.ItemType]) -> None:
+        skipped = 0
+        sizes = []
+
+        partition = self.current()
+        if partition != self.partition:
+            self.rollover(partition)
+
+        with self.lock, self.db as c:
+            for i in items:
+                if isinstance(i, api.IRelease):
+                    cursor = c.execute(self.statements['items'], self.row(i))
+                    if cursor.rowcount:
+                        sizes.extend((cursor.lastrowid, v.size, v.url) for v in i.sizes)
+                        continue
+                else:
+                    cursor = c.execute(self.statements['announces'], self.row(i))
+                    if cursor.rowcount:
+                        continue
+                skipped += 1
+            c.executemany('INSERT INTO sizes VALUES (?, ?, ?)', sizes)
+
+        if skipped:
+            self.log.error(f'Trying to insert non-unique item ({skipped})')
+
+    def loop(self):
+        while True:
+            try:
+                items = [self.items.get(timeout=flush_interval)]
+            except queue.Empty:
+                continue
+
+            try:
+                while len(items) < batch_size:
+                    items.append(self.items.get_nowait())
+            except queue.Empty:
+                pass
+
+            stop = any(i is None for i in items)
+            items = [i for i in items if i is not None]
+
+            if items:
+                try:
+                    self.write(items)
+                except Exception as e:
+                    self.log.error(f'{e.__class__.__name__} ({e.__str__()}) while writing {len(items)} items')
+
+            if stop:
+                break
+
+    def flush(self) -> None:
+        if self.thread.is_alive():
+            self.items.put(None)
+            self.thread.join()
+
+    def e_monitor_stopped(self) -> None:
+        self.flush()
+        with self.lock:
+            self.db.close()
 
     def e_item(self, item: api.ItemType) -> None:
         if isinstance(item, (api.IRelease, api.IAnnounce)):
-            with self.lock, self.db as c:
-                try:
-                    c.execute(
-                        f"INSERT INTO {'items' if isinstance(item, api.IRelease) else 'announces'} "
-                        f"VALUES (NULL, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
-                        [
-                            item.hash(4), item.url, item.channel, item.name, item.image, item.description,
-                            item.price.current, item.price.currency, dumps(item.sizes.export()), item.publish_date,
-                            item.timestamp
-                        ]
-                    )
-                except sqlite3.IntegrityError:
-                    self.log.error('Trying to insert non-unique item')
+            try:
+                self.items.put_nowait(item)
+            except queue.Full:
+                self.log.error(f'Analytic queue is full ({queue_size}), item dropped')
+
+
+class Reader:
+    path: str
+    db: sqlite3.Connection
+
+    def __init__(self, path: str):
+        self.path = path
+        self.db = sqlite3.connect('file::memory:', uri=True, check_same_thread=False)
+        self.reload()
+
+    def reload(self) -> None:
+        names = partitions(self.path)
+        if not names:
+            raise FileNotFoundError(f'No analytic partitions in {self.path}')
+
+        attached = [i for _, i, _ in self.db.execute('pragma database_list') if i.startswith('p')]
+        for table in ('items', 'announces', 'sizes'):
+            self.db.execute(f'DROP VIEW IF EXISTS temp.{table}')
+        for schema in attached:
+            self.db.execute(f'DETACH DATABASE {schema}')
+
+        for i, name in enumerate(names):
+            self.db.execute(f'ATTACH DATABASE ? AS p{i}', (f'file:{os.path.join(self.path, name)}?mode=ro',))
+        for table, empty in (('items', None), ('announces', None), ('sizes', 'NULL AS item, NULL AS size, NULL AS url')):
+            parts = [i for i in range(len(names)) if self.db.execute(
+                f"SELECT 1 FROM p{i}.sqlite_master WHERE type = 'table' AND name = ?", (table,)
+            ).fetchone()]
+            if not parts and empty:
+                self.db.execute(f'CREATE TEMP VIEW {table} AS SELECT NULL AS part, {empty} WHERE 0')
+                continue
+            self.db.execute(f'CREATE TEMP VIEW {table} AS ' + ' UNION ALL '.join(
+                f'SELECT {i} AS part, * FROM p{i}.{table}' for i in parts
+            ))
+
+    @staticmethod
+    def bounds(url: str) -> Tuple[str, str, str]:
+        base = columnar.product(url)
+        return base, base + '?', base + '@'
+
+    def recent(self, channel: str, limit: int = 50) -> List[Tuple[str, str, float, int, float]]:
+        return self.db.execute(
+            'SELECT url, name, price, currency, timestamp FROM items WHERE channel = ? '
+            'ORDER BY timestamp DESC LIMIT ?',
+            (channel, limit)
+        ).fetchall()
+
+    def restocks(self, url: str, since: float = 0.) -> List[float]:
+        base, start, end = self.bounds(url)
+        return [i for i, in self.db.execute(
+            'SELECT timestamp FROM items WHERE (url = ? OR url >= ? AND url < ?) AND timestamp >= ? '
+            'ORDER BY timestamp',
+            (base, start, end, since)
+        )]
+
+    def sellout(self, url: str) -> Optional[float]:
+        base, start, end = self.bounds(url)
+        first, = self.db.execute(
+            'SELECT min(timestamp) FROM items WHERE url = ? OR url >= ? AND url < ?',
+            (base, start, end)
+        ).fetchone()
+
+        if first is None:
+            return None
+
+        sold, = self.db.execute(
+            'SELECT min(timestamp) FROM ('
+            'SELECT timestamp FROM items WHERE (url = ? OR url >= ? AND url < ?) AND timestamp > ? '
+            'AND CASE WHEN json_valid(sizes) THEN json_array_length(sizes) END = 0 '
+            'UNION ALL '
+            'SELECT timestamp FROM announces WHERE (url = ? OR url = ? OR url >= ? AND url < ?) AND timestamp > ?)',
+            (base, start, end, first, base + columnar.announce, base, start, end, first)
+        ).fetchone()
+
+        return None if sold is None else sold - first
+
+    def close(self) -> None:
+        self.db.close()
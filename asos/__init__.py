@@ -7,6 +7,7 @@ import pycurl
 import yaml
 from ujson import loads
 
+from scripts import fetcher, keywords
 from source import api
 from source import logger
 from source.api import CatalogType, TargetType, IRelease, RestockTargetType, ItemType, TargetEndType, \
@@ -57,6 +58,12 @@ class Parser(api.Parser):
         self.pl_product_link = "https://www.asos.com/api/product/catalogue/v3/products/PRODUCT_ID" \
                                "?store=PL&currency=RUB&keyStoreDataversion=3pmn72e-27"
 
+        self.regions = {
+            'GBP': (self.en_product_link, 'GBP', 'gb', 'UK :flag_gb:'),
+            'RUB': (self.ru_product_link, 'RUB', 'ru', 'RU :flag_ru:'),
+            'POL': (self.pl_product_link, 'RUB', 'pl', 'PL :flag_pl:')
+        }
+
         self.headers = {
             'user-agent': 'Mozilla/5.0 (X11; Ubuntu; Linux x86_64; rv:71.0) Gecko/20100101 Firefox/71.0'
         }
@@ -84,6 +91,71 @@ class Parser(api.Parser):
         return (datetime.utcnow() + timedelta(minutes=1)) \
             .replace(second=0, microsecond=500000, tzinfo=timezone.utc).timestamp()
 
+    def product_link(self, pid: str, region: str) -> str:
+        return self.regions.get(region, self.regions['POL'])[0].replace('PRODUCT_ID', pid)
+
+    def parse(self, pid: str, region: str, label: str, ok: bool, response) -> List[ItemType]:
+        result: list = []
+        _, currency, slug, _ = self.regions.get(region, self.regions['POL'])
+
+        if not ok:
+            if response.args[0] == pycurl.E_OPERATION_TIMEOUTED:
+                return result
+            else:
+                raise response
+        try:
+            json_data = response.json()
+        except ValueError:
+            result.append(api.MAlert(f'Script is down {pid}', self.name))
+            return result
+
+        try:
+            name = json_data["name"]
+        except KeyError:
+            if json_data['errorCode'] == 'pdt_011':
+                return result
+
+        link = f'https://asos.com/{slug}/prd/{pid}'
+        image = f"https://images.weserv.nl/?url={json_data['media']['images'][0]['url']}"
+
+        raw_sizes = []
+
+        for sku in json_data['variants']:
+            if sku['isInStock']:
+                if sku['isLowInStock']:
+                    raw_sizes.append(
+                        api.Size(f"{sku['brandSize']} [LOW]"))
+                else:
+                    raw_sizes.append(
+                        api.Size(f"{sku['brandSize']} [HIGH]"))
+
+        sizes = api.Sizes(api.SIZE_TYPES[''], raw_sizes)
+        price = api.Price(api.CURRENCIES[currency],
+                          float(json_data['price']['current']['value']))
+
+        if raw_sizes:
+            result.append(
+                IRelease(
+                    f'{link}?shash={sizes.hash().hex()}',
+                    'asos',
+                    name,
+                    image,
+                    '',
+                    price,
+                    sizes,
+                    [
+                        FooterItem('Login', 'https://my.asos.com/'),
+                        FooterItem('Cart', 'https://www.asos.com/bag')
+                    ],
+                    {
+                        'Site': '[ASOS](https://asos.com)',
+                        'Region': label
+                    }
+                )
+            )
+
+        return result
+
     def execute(
             self,
             mode: int,
@@ -121,9 +193,7 @@ class Parser(api.Parser):
                                          ['catalog', self.pl_dunk_search_link, 'POL', 'PL :flag_pl:'], time()))
 
             for pid in self.pids:
-                result.append(api.TScheduled(str(pid), self.name, ['item', 'GBP', 'UK :flag_gb:'], time()))
-                result.append(api.TScheduled(str(pid), self.name, ['item', 'RUB', 'RU :flag_ru:'], time()))
-                result.append(api.TScheduled(str(pid), self.name, ['item', 'POL', 'PL :flag_pl:'], time()))
+                result.append(api.TScheduled(str(pid), self.name, ['items'], time()))
 
             if result or content.expired:
                 content.gen.time = self.time_gen()
@@ -143,7 +213,7 @@ class Parser(api.Parser):
 
                 for c in catalog['products']:
 
-                    if self.kw.check(c['name'].lower() + ' ' + str(c['id'])):
+                    if keywords.check(self, c['name'].lower() + ' ' + str(c['id'])):
                         result.append(
                             api.TScheduled(
                                 str(c['id']),
@@ -154,76 +224,25 @@ class Parser(api.Parser):
                         )
 
             elif content.data[0] == 'item':
-                if content.data[1] == 'RUB':
-                    product_url = self.ru_product_link
-                    currency = 'RUB'
-                    region = 'ru'
-                elif content.data[1] == 'GBP':
-                    product_url = self.en_product_link
-                    currency = 'GBP'
-                    region = 'gb'
-                else:
-                    product_url = self.pl_product_link
-                    currency = 'RUB'
-                    region = 'pl'
-
-                ok, response = self.provider.request(product_url.replace('PRODUCT_ID', content.name),
+                ok, response = self.provider.request(self.product_link(content.name, content.data[1]),
                                                      headers=self.headers)
-
-                if not ok:
-                    if response.args[0] == pycurl.E_OPERATION_TIMEOUTED:
-                        return result
-                    else:
-                        raise result
-                try:
-                    json_data = response.json()
-                except ValueError:
-                    result.append(result.append(api.MAlert(f'Script is down {content.name}', self.name)))
-                    return result
-
-                try:
-                    name = json_data["name"]
-                except KeyError:
-                    if json_data['errorCode'] == 'pdt_011':
-                        return result
-
-                link = f'https://asos.com/{region}/prd/{content.name}'
-                image = f"https://images.weserv.nl/?url={json_data['media']['images'][0]['url']}"
-
-                raw_sizes = []
-
-                for sku in json_data['variants']:
-                    if sku['isInStock']:
-                        if sku['isLowInStock']:
-                            raw_sizes.append(
-                                api.Size(f"{sku['brandSize']} [LOW]"))
-                        else:
-                            raw_sizes.append(
-                                api.Size(f"{sku['brandSize']} [HIGH]"))
-
-                sizes = api.Sizes(api.SIZE_TYPES[''], raw_sizes)
-                price = api.Price(api.CURRENCIES[currency],
-                                  float(json_data['price']['current']['value']))
-
-                if raw_sizes:
-                    result.append(
-                        IRelease(
-                            f'{link}?shash={sizes.hash().hex()}',
-                            'asos',
-                            name,
-                            image,
-                            '',
-                            price,
-                            sizes,
-                            [
-                                FooterItem('Login', 'https://my.asos.com/'),
-                                FooterItem('Cart', 'https://www.asos.com/bag')
-                            ],
-                            {
-                                'Site': '[ASOS](https://asos.com)',
-                                'Region': content.data[2]
-                            }
-                        )
-                    )
+                result.extend(self.parse(content.name, content.data[1], content.data[2], ok, response))
+
+            elif content.data[0] == 'items':
+                regions = list(self.regions)
+                responses = fetcher.fetch(self.provider.request,
+                                          [self.product_link(content.name, i) for i in regions],
+                                          len(regions), headers=self.headers)
+                errors = []
+                for region, response in zip(regions, responses):
+                    ok, response = (False, response) if isinstance(response, Exception) else response
+                    try:
+                        result.extend(self.parse(content.name, region, self.regions[region][3], ok, response))
+                    except Exception as e:
+                        self.log.error(f'{e.__class__.__name__} ({e.__str__()}) while parsing {content.name} '
+                                       f'({region})')
+                        errors.append(e)
+                if errors and len(errors) == len(regions):
+                    raise errors[0]
 
         return result
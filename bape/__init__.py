@@ -3,12 +3,20 @@ from typing import List, Union
 
 from lxml import etree
 
+from scripts import fetcher
+from scripts.markup import listing
 from source import api
 from source import logger
 from source.api import CatalogType, TargetType, RestockTargetType, ItemType, TargetEndType, IRelease, FooterItem
 from source.cache import HashStorage
 from source.library import SubProvider
 
+catalog_items = etree.XPath('//a[@class="thumb-link"]')
+product_sizes = etree.XPath('//select[@class="variation-select"]/option')
+og_title = etree.XPath('//meta[@property="og:title"]')
+og_image = etree.XPath('//meta[@property="og:image"]')
+product_price = etree.XPath('//div[@class="headline4 pdp-price-sales"]')
+
 
 class Parser(api.Parser):
     def __init__(self, name: str, log: logger.Logger, provider_: SubProvider):
@@ -39,9 +47,8 @@ class Parser(api.Parser):
         if mode == 0:
             links = []
             counter = 0
-            catalog_links = etree.HTML(self.provider.get(self.link,
-                                                         headers={'user-agent': self.user_agent}, proxy=True)) \
-                .xpath('//a[@class="thumb-link"]')
+            catalog_links = catalog_items(listing(self.provider.get(self.link, headers={'user-agent': self.user_agent},
+                                                                    proxy=True), 'class="thumb-link"'))
             if not catalog_links:
                 raise ConnectionResetError('Shopify banned this IP')
             for element in catalog_links:
@@ -51,29 +58,34 @@ class Parser(api.Parser):
                     links.append(api.Target(element.get('href'), self.name, 0))
                     counter += 1
 
-            for link in links:
+            links = [link for link in links if HashStorage.check_target(link.hash())]
+            pages = fetcher.fetch(self.provider.get, [link.name for link in links],
+                                  headers={'user-agent': self.user_agent}, proxy=True)
+            for link, get_content in zip(links, pages):
+                if isinstance(get_content, Exception):
+                    self.log.error(f'{get_content.__class__.__name__} ({get_content.__str__()}) while fetching {link.name}')
+                    continue
                 try:
                     if HashStorage.check_target(link.hash()):
-                        get_content = self.provider.get(link.name, headers={'user-agent': self.user_agent}, proxy=True)
-                        page_content = etree.Element = etree.HTML(get_content)
+                        page_content: etree.Element = etree.HTML(get_content)
                         sizes = [
                             api.Size(size.text.replace(' ', '').replace('\n', ''), size.get('value'))
-                            for size in page_content.xpath('//select[@class="variation-select"]/option')
+                            for size in product_sizes(page_content)
                             if ('UNAVAILABLE' not in size.text or
                                 'OUTOFSTOCK' not in size.text) and 'Select Size' not in size.text
                         ]
-                        name = page_content.xpath('//meta[@property="og:title"]')[0].get('content')
+                        name = og_title(page_content)[0].get('content')
                         HashStorage.add_target(link.hash())
                         result.append(IRelease(
                             link.name,
                             'bape',
                             name,
-                            page_content.xpath('//meta[@property="og:image"]')[0].get('content'),
+                            og_image(page_content)[0].get('content'),
                             '',
                             api.Price(
                                 api.CURRENCIES['USD'],
                                 float(
-                                    page_content.xpath('//div[@class="headline4 pdp-price-sales"]')[0]
+                                    product_price(page_content)[0]
                                         .text.split('$')[-1].replace(' ', '').replace('\n', '')
                                 )
                             ),
@@ -94,6 +106,5 @@ class Parser(api.Parser):
                 content.gen.time = self.time_gen()
                 content.expired = False
 
-            result.append(content)
         result.append(content)
         return result
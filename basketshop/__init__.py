@@ -4,6 +4,7 @@ from typing import List, Union
 from pycurl_requests import exceptions
 from ujson import loads
 
+from scripts import keywords
 from source import api
 from source import logger
 from source.api import CatalogType, TargetType, RestockTargetType, ItemType, TargetEndType, IRelease, FooterItem
@@ -53,7 +54,7 @@ class Parser(api.Parser):
 
             for item in json:
 
-                if self.kw.check(item['Name'].lower()):
+                if keywords.check(self, item['Name'].lower()):
 
                     url = item['Url']
                     pid = item['ItemId']
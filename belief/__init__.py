@@ -3,6 +3,7 @@ from typing import List, Union
 
 from ujson import loads
 
+from scripts import keywords
 from source import api
 from source import logger
 from source.api import CatalogType, TargetType, RestockTargetType, ItemType, TargetEndType, IRelease, FooterItem
@@ -60,7 +61,7 @@ class Parser(api.Parser):
 
             for product in products:
 
-                if self.kw.check(product['permalink'].lower()) or self.kw.check(product['title'].lower()):
+                if keywords.check(self, product['permalink'].lower()) or keywords.check(self, product['title'].lower()):
 
                     target = api.Target(f'https://beliefmoscow.com{product["url"]}', self.name, 0)
 
@@ -4,6 +4,9 @@ from lxml import etree
 from pycurl_requests import exceptions
 from user_agent import generate_user_agent
 
+from scripts import keywords
+from scripts.conditional import Validators
+from scripts.markup import document
 from source import api
 from source import logger
 from source.api import CatalogType, TargetType, RestockTargetType, ItemType, TargetEndType, IRelease, FooterItem, \
@@ -12,6 +15,15 @@ from source.cache import HashStorage
 from source.library import SubProvider, Keywords
 from source.tools import ScriptStorage
 
+catalog_items = etree.XPath('//div[@class="product"]/a[@class="product-image"]')
+item_image = etree.XPath('img')
+product_sizes = etree.XPath('//div[@class="sizeselect"]')
+product_name = etree.XPath('//span[@itemprop="name"]')
+product_offline = etree.XPath('//button[@class="btn btn-fluid btn-transparent"]')
+product_access = etree.XPath('//div[@class="access"]')
+product_price = etree.XPath('//meta[@itemprop="price"]')
+og_image = etree.XPath('//meta[@property="og:image"]')
+
 
 class Parser(api.Parser):
     def __init__(self, name: str, log: logger.Logger, provider_: SubProvider, storage: ScriptStorage, kw: Keywords):
@@ -19,6 +31,7 @@ class Parser(api.Parser):
         self.link: str = 'https://brandshop.ru/sneakers/?utm_source=telegram&utm_medium=post&utm_campaign=sneakers_23nov'
         self.interval: int = 1
         self.user_agent = generate_user_agent()
+        self.validators = Validators()
 
     @property
     def catalog(self) -> api.CatalogType:
@@ -32,7 +45,9 @@ class Parser(api.Parser):
         result = []
         if mode == 0:
 
-            ok, response = self.provider.request(self.link, headers={'user-agent': self.user_agent}, proxy=True)
+            ok, response = self.provider.request(
+                self.link, headers=self.validators.headers(self.link, {'user-agent': self.user_agent}), proxy=True
+            )
 
             if not ok:
 
@@ -42,28 +57,30 @@ class Parser(api.Parser):
                 else:
                     raise response
 
-            for element in etree.HTML(response.text) \
-                    .xpath('//div[@class="product"]/a[@class="product-image"]'):
+            if not self.validators.modified(self.link, response):
+                return [content]
+
+            for element in catalog_items(document(response, b'class="product"')):
 
                 if element.get('href') == 'javascript:void(0);':
                     result.append(IAnnounce(
                         'https://brandshop.ru/New/',
                         'brandshop',
-                        element.xpath('img')[0].get('alt'),
-                        element.xpath('img')[0].get('src'),
+                        item_image(element)[0].get('alt'),
+                        item_image(element)[0].get('src'),
                         'Подробности скоро',
                         api.Price(api.CURRENCIES['RUB'], float(0)),
                         api.Sizes(api.SIZE_TYPES[''], []),
                         [
                             FooterItem('StockX', 'https://stockx.com/search/sneakers?s=' +
-                                       element.xpath('img')[0].get('alt')
+                                       item_image(element)[0].get('alt')
                                        .replace(' ', '%20').replace('"', '').replace('\n', '').replace(' ', '')),
                             FooterItem('Cart', 'https://brandshop.ru/cart'),
                             FooterItem('Feedback', 'https://forms.gle/9ZWFdf1r1SGp9vDLA')
                         ],
                         {'Site': '[Brandshop](https://brandshop.ru)'}
                     ))
-                elif self.kw.check(element.xpath('img')[0].get('alt').lower()):
+                elif keywords.check(self, item_image(element)[0].get('alt').lower()):
                     result.append(api.TInterval(element.get('href'), self.name, 0, 1))
 
         if mode == 1:
@@ -89,21 +106,19 @@ class Parser(api.Parser):
                     else:
                         raise response
 
-                page_content = etree.HTML(
-                    response.text
-                )
+                page_content = document(response)
 
-                sizes = api.Sizes(api.SIZE_TYPES[''], [api.Size(size.text) for size in page_content.xpath('//div[@class="sizeselect"]')])
-                name = page_content.xpath('//span[@itemprop="name"]')[0].text
+                sizes = api.Sizes(api.SIZE_TYPES[''], [api.Size(size.text) for size in product_sizes(page_content)])
+                name = product_name(page_content)[0].text
                 try:
                     is_only_offline = \
-                        page_content.xpath('//button[@class="btn btn-fluid btn-transparent"]')[0].text \
+                        product_offline(page_content)[0].text \
                         == 'Доступен только в офлайн-магазине'
                 except Exception:
                     is_only_offline = False
 
                 if is_only_offline:
-                    location = page_content.xpath('//div[@class="access"]')[0].text
+                    location = product_access(page_content)[0].text
                     if 'петров' in location.lower():
                         ya_taxi_link = 'https://3.redirect.appmetrica.yandex.com/route?end-lat=55.767851&end' \
                                        '-lon=37.618764&appmetrica_tracking_id=1178268795219780156&app_code=3'
@@ -125,11 +140,11 @@ class Parser(api.Parser):
                             content.name + f'?shash={sizes.hash().hex()}&tp=offline',
                             'brandshop-offline',
                             name,
-                            page_content.xpath('//meta[@property="og:image"]')[0].get('content'),
+                            og_image(page_content)[0].get('content'),
                             '',
                             api.Price(
                                 api.CURRENCIES['RUB'],
-                                float(page_content.xpath('//meta[@itemprop="price"]')[0].get('content'))
+                                float(product_price(page_content)[0].get('content'))
                             ),
                             sizes,
                             [
@@ -151,11 +166,11 @@ class Parser(api.Parser):
                             content.name + f'?shash={sizes.hash().hex()}',
                             'brandshop',
                             name,
-                            page_content.xpath('//meta[@property="og:image"]')[0].get('content'),
+                            og_image(page_content)[0].get('content'),
                             '',
                             api.Price(
                                 api.CURRENCIES['RUB'],
-                                float(page_content.xpath('//meta[@itemprop="price"]')[0].get('content'))
+                                float(product_price(page_content)[0].get('content'))
                             ),
                             sizes,
                             [
@@ -0,0 +1,136 @@
+"""
+Columnar (Parquet) export of analytic partitions and vectorized aggregations over it
+"""
+
+import os
+import sqlite3
+from typing import Dict, List, Sequence, Union
+from urllib.parse import urlsplit
+
+from ujson import loads
+
+batch_size = 65536
+announce = 'f?stype=Announce'
+columns = ('kind', 'channel', 'site', 'product', 'url', 'name', 'price', 'currency', 'sizes', 'publish_date',
+           'timestamp')
+
+
+def schema():
+    import pyarrow
+
+    return pyarrow.schema([
+        ('kind', pyarrow.dictionary(pyarrow.int8(), pyarrow.string())),
+        ('channel', pyarrow.dictionary(pyarrow.int32(), pyarrow.string())),
+        ('site', pyarrow.dictionary(pyarrow.int32(), pyarrow.string())),
+        ('product', pyarrow.string()),
+        ('url', pyarrow.string()),
+        ('name', pyarrow.string()),
+        ('price', pyarrow.float64()),
+        ('currency', pyarrow.int32()),
+        ('sizes', pyarrow.list_(pyarrow.string())),
+        ('publish_date', pyarrow.float64()),
+        ('timestamp', pyarrow.float64())
+    ])
+
+
+def product(url: str) -> str:
+    base = url.split('?', 1)[0]
+    # Shopify announces are posted as <product>f?stype=Announce
+    return base[:-1] if url.startswith(announce, len(base) - 1) else base
+
+
+def sizes(raw: str) -> List[str]:
+    try:
+        value = loads(raw)
+    except ValueError:
+        return []
+    if not isinstance(value, list):
+        return []
+    return [str(i['size'] if isinstance(i, dict) and 'size' in i else i) for i in value]
+
+
+def export(source: str, target: str) -> str:
+    import pyarrow
+    import pyarrow.parquet
+
+    db = sqlite3.connect(f'file:{source}?mode=ro', uri=True)
+    try:
+        with pyarrow.parquet.ParquetWriter(target + '.part', schema(), compression='zstd',
+                                           use_dictionary=['kind', 'channel', 'site']) as writer:
+            for kind in ('items', 'announces'):
+                cursor = db.execute(f'SELECT url, channel, name, price, currency, sizes, publish_date, timestamp '
+                                    f'FROM {kind} ORDER BY id')
+                while True:
+                    rows = cursor.fetchmany(batch_size)
+                    if not rows:
+                        break
+                    data: Dict[str, list] = {i: [] for i in columns}
+                    for url, channel, name, price, currency, raw, publish_date, timestamp in rows:
+                        data['kind'].append(kind)
+                        data['channel'].append(channel)
+                        data['site'].append(urlsplit(url).netloc)
+                        data['product'].append(product(url))
+                        data['url'].append(url)
+                        data['name'].append(name)
+                        data['price'].append(price)
+                        data['currency'].append(currency)
+                        data['sizes'].append(sizes(raw))
+                        data['publish_date'].append(publish_date)
+                        data['timestamp'].append(timestamp)
+                    writer.write_table(pyarrow.Table.from_pydict(data, schema()))
+    finally:
+        db.close()
+
+    os.replace(target + '.part', target)
+    return target
+
+
+def load(path: str, fields: Sequence[str] = columns, since: float = 0.):
+    import pyarrow
+    import pyarrow.parquet
+
+    files = sorted(os.path.join(path, i) for i in os.listdir(path) if i.endswith('.parquet'))
+    tables = [pyarrow.parquet.read_table(i, columns=list(fields),
+                                         filters=[('timestamp', '>=', since)] if since else None) for i in files]
+    if not tables:
+        return schema().empty_table().select(list(fields))
+    return pyarrow.concat_tables(tables).unify_dictionaries().combine_chunks()
+
+
+def medians(codes, values):
+    import numpy
+
+    order = numpy.lexsort((values, codes))
+    codes, values = codes[order], values[order]
+
+    starts = numpy.flatnonzero(numpy.r_[True, codes[1:] != codes[:-1]])
+    counts = numpy.diff(numpy.r_[starts, len(codes)])
+    result = (values[starts + (counts - 1) // 2] + values[starts + counts // 2]) / 2
+    return codes[starts], result
+
+
+def restock_intervals(table) -> Dict[str, float]:
+    import numpy
+    import pyarrow
+    import pyarrow.compute
+
+    if 'kind' in table.column_names:
+        table = table.filter(pyarrow.compute.equal(table['kind'].cast(pyarrow.string()), 'items'))
+    table = table.sort_by([('product', 'ascending'), ('timestamp', 'ascending')]).combine_chunks()
+    if table.num_rows < 2:
+        return {}
+
+    products = table['product'].chunk(0)
+    same = pyarrow.compute.equal(products[1:], products[:-1]).to_numpy(zero_copy_only=False)
+    intervals = numpy.diff(table['timestamp'].to_numpy())[same]
+
+    site: Union[pyarrow.DictionaryArray, pyarrow.Array] = table['site'].chunk(0)
+    if not pyarrow.types.is_dictionary(site.type):
+        site = site.dictionary_encode()
+    codes = site.indices.to_numpy(zero_copy_only=False)[1:][same]
+    if not len(codes):
+        return {}
+
+    keys, values = medians(codes, intervals)
+    names = site.dictionary.to_pylist()
+    return {names[k]: float(v) for k, v in zip(keys.tolist(), values.tolist())}
@@ -1,14 +1,16 @@
-from json import loads, JSONDecodeError
-from re import findall
+from json import JSONDecodeError
 from typing import List
 
-from jsonpath2 import Path
 from lxml import etree
 
+from scripts import paths
+from scripts.embedded import extract
 from source import api
 from source.api import IndexType, TargetType, StatusType
 from source.logger import Logger
 
+variants = paths.parse_path('$.product.variants.*')
+
 
 def return_sold_out(data):
     return api.SSuccess(
@@ -72,9 +74,9 @@ class Parser(api.Parser):
                     available = True
                 else:
                     return return_sold_out(target.data)
-                sizes_data = Path.parse_str('$.product.variants.*').match(
-                    loads(findall(r'var meta = {.*}', get_content)[0]
-                          .replace('var meta = ', '')))
+                if 'var meta =' not in get_content:
+                    return return_sold_out(target.data)
+                sizes_data = variants(extract(get_content, 'var meta ='))
             else:
                 return api.SFail(self.name, 'Unknown target type')
         except etree.XMLSyntaxError:
@@ -103,10 +105,10 @@ class Parser(api.Parser):
                         {'Site': 'Concepts'},
                         tuple(
                             (
-                                str(size_data.current_value['public_title'].split(' ')[-1]) + ' US',
-                                'https://cncpts.com/cart/' + str(size_data.current_value['id']) + ':1'
+                                str(size_data['public_title'].split(' ')[-1]) + ' US',
+                                'https://cncpts.com/cart/' + str(size_data['id']) + ':1'
                             ) for size_data in sizes_data if
-                            size_data.current_value['public_title'].split(' ')[-1] in available_sizes
+                            size_data['public_title'].split(' ')[-1] in available_sizes
                         ),
                         (
                             ('StockX', 'https://stockx.com/search/sneakers?s=' + name.replace(' ', '%20')),
@@ -0,0 +1,55 @@
+"""
+Conditional GET (ETag / Last-Modified) support for catalog polling
+"""
+
+import threading
+from typing import Dict, Tuple
+
+
+class Validators:
+    lock: threading.Lock
+    store: Dict[str, Tuple[str, str]]
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.store = {}
+
+    def headers(self, url: str, headers: dict) -> dict:
+        with self.lock:
+            etag, modified = self.store.get(url, ('', ''))
+
+        if not etag and not modified:
+            return headers
+
+        headers = headers.copy()
+        if etag:
+            headers['If-None-Match'] = etag
+        if modified:
+            headers['If-Modified-Since'] = modified
+        return headers
+
+    def modified(self, url: str, response) -> bool:
+        if response.status_code == 304:
+            return False
+
+        if response.status_code == 200:
+            etag = response.headers.get('ETag', '')
+            modified = response.headers.get('Last-Modified', '')
+
+            with self.lock:
+                if etag or modified:
+                    self.store[url] = (etag, modified)
+                else:
+                    self.store.pop(url, None)
+        else:
+            with self.lock:
+                self.store.pop(url, None)
+
+        return True
+
+    def reset(self, url: str = '') -> None:
+        with self.lock:
+            if url:
+                self.store.pop(url, None)
+            else:
+                self.store.clear()
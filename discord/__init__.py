@@ -1,6 +1,8 @@
-import queue
+import heapq
+import itertools
 import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass, field
 from datetime import datetime
 from typing import List, Dict, Tuple, Optional
@@ -8,8 +10,10 @@ from typing import List, Dict, Tuple, Optional
 import requests
 import yaml
 from pytz import timezone
+from requests.adapters import HTTPAdapter
 from ujson import dumps
 
+from scripts.outbox import Outbox
 from source import __version__, __copyright__
 from source import api
 from source import codes
@@ -18,6 +22,11 @@ from source.tools import ScriptStorage
 
 currencies: tuple = ('', '£', '$', '€', '₽', '¥', 'kr', '₴', 'Br', 'zł', '$(HKD)', '$(CAD)', '$(AUD)')
 sizes_column_size = 5
+workers = 8
+messages_per_tick = 32
+max_in_flight = 256
+embeds_per_request = 10
+embeds_max_length = 6000
 
 
 @dataclass
@@ -61,6 +70,43 @@ class Hook:
         return f'https://discord.com/api/webhooks/{self.id}/{self.key}'
 
 
+@dataclass
+class Bucket:
+    __slots__ = ['remaining', 'reset']
+    remaining: int
+    reset: float
+
+    def delay(self) -> float:
+        return 0. if self.remaining > 0 else max(self.reset - time.monotonic(), 0.)
+
+    def take(self) -> None:
+        if self.remaining > 0:
+            self.remaining -= 1
+
+    def block(self, seconds: float) -> None:
+        self.remaining = 0
+        self.reset = time.monotonic() + seconds
+
+    def update(self, headers) -> None:
+        try:
+            remaining = int(headers['X-RateLimit-Remaining'])
+            reset_after = float(headers['X-RateLimit-Reset-After'])
+        except (KeyError, TypeError, ValueError):
+            return
+
+        self.remaining = remaining
+        self.reset = time.monotonic() + reset_after
+
+
+@dataclass
+class Lane:
+    __slots__ = ['bucket', 'posts', 'running', 'singles']
+    bucket: Bucket
+    posts: list
+    running: bool
+    singles: int
+
+
 @dataclass(order=True)
 class Message:
     priority: int
@@ -68,6 +114,10 @@ class Message:
     channel: str = field(default='', compare=False)
     item: Optional[api.ItemType] = field(default=None, compare=False)
     tries: int = field(default=5, repr=False, compare=False)
+    hooks: Tuple[Hook, ...] = field(default=(), repr=False, compare=False)
+    batchable: bool = field(default=False, repr=False, compare=False)
+    rendered: Dict[int, dict] = field(default_factory=dict, repr=False, compare=False)
+    payloads: Dict[int, bytes] = field(default_factory=dict, repr=False, compare=False)
 
     def __post_init__(self):
         if not self.channel:
@@ -75,6 +125,8 @@ class Message:
                 self.channel = self.item.channel
             else:
                 self.channel = 'tech'
+        if self.item is not None and not self.text:
+            self.batchable = True
 
     def retry(self) -> bool:
         if self.tries == 0:
@@ -83,6 +135,29 @@ class Message:
             self.tries -= 1
             return True
 
+    def render(self, group: Group) -> dict:
+        try:
+            return self.rendered[id(group)]
+        except KeyError:
+            rendered = self.rendered[id(group)] = self.build(group)
+            return rendered
+
+    def payload(self, group: Group) -> bytes:
+        try:
+            return self.payloads[id(group)]
+        except KeyError:
+            payload = self.payloads[id(group)] = dumps(self.render(group)).encode()
+            return payload
+
+    def length(self, group: Group) -> int:
+        length = 0
+        for embed in self.render(group).get('embeds', ()):
+            length += len(embed.get('title', '')) + len(embed.get('description', '')) \
+                      + len(embed['footer']['text'])
+            for i in embed['fields']:
+                length += len(i['name']) + len(i['value'])
+        return length
+
     def build(self, group: Group) -> dict:
         result: dict = {'content': self.text} if self.text else {}
 
@@ -160,6 +235,9 @@ class EventsExecutor(api.EventsExecutor):
     channels: Dict[str, List[Hook]]
     groups: Dict[str, Group]
 
+    lanes: Dict[int, Lane]
+    pending: Dict[int, list]
+
     def __init__(self, name: str, log: Logger, storage: ScriptStorage):
         super().__init__(name, log, storage)
         self.active = False
@@ -169,7 +247,19 @@ class EventsExecutor(api.EventsExecutor):
         self.config()
 
         self.state = 1
-        self.messages = queue.PriorityQueue(1024)
+        if not self.storage.check('outbox.db'):
+            self.storage.file('outbox.db', 'w+')
+        self.messages = Outbox(self.storage.path + '/outbox.db')
+        self.session = requests.Session()
+        self.session.headers['Content-Type'] = 'application/json'
+        self.session.mount('https://', HTTPAdapter(pool_connections=1, pool_maxsize=workers))
+        self.pool = ThreadPoolExecutor(workers, 'Discord-Sender')
+        self.lock = threading.Lock()
+        self.lanes = {}
+        self.pending = {}
+        self.counter = itertools.count()
+        self.blocked = 0.
+        self.errors = 0
         self.thread = threading.Thread(name='Discord-Bot', target=self.loop, daemon=True)
         self.thread.start()
         self.log.info('Thread started')
@@ -232,67 +322,222 @@ class EventsExecutor(api.EventsExecutor):
         else:
             raise FileNotFoundError('secret.yaml not found')
 
+    def dump(self, msg: Message) -> dict:
+        groups = {id(i.group) for i in msg.hooks or self.channels.get(msg.channel, ())}
+        return {
+            'text': msg.text,
+            'channel': msg.channel,
+            'tries': msg.tries,
+            'hooks': [i.id for i in msg.hooks],
+            'batchable': msg.batchable,
+            'rendered': {k: msg.render(v) for k, v in self.groups.items() if id(v) in groups}
+        }
+
+    def load(self, priority: int, record: dict) -> Message:
+        hooks = {i.id: i for v in self.channels.values() for i in v}
+        rendered = record.get('rendered', {})
+        return Message(
+            priority,
+            record.get('text', ''),
+            record.get('channel', ''),
+            tries=record.get('tries', 0),
+            hooks=tuple(hooks[i] for i in record.get('hooks', ()) if i in hooks),
+            batchable=record.get('batchable', False),
+            rendered={id(v): rendered[k] for k, v in self.groups.items() if k in rendered}
+        )
+
+    def put(self, msg: Message) -> None:
+        self.messages.put(msg.priority, self.dump(msg))
+
+    @staticmethod
+    def retry_after(response) -> float:
+        for i in ('Retry-After', 'X-RateLimit-Reset-After'):
+            try:
+                return float(response.headers[i])
+            except (KeyError, TypeError, ValueError):
+                pass
+        return 1.
+
+    @staticmethod
+    def pack(group: Group, msgs: List[Message]) -> bytes:
+        if len(msgs) == 1:
+            return msgs[0].payload(group)
+
+        result: dict = {'username': group.bot} if group.bot else {}
+        result['embeds'] = [embed for i in msgs for embed in i.render(group)['embeds']]
+        return dumps(result).encode()
+
+    def post(self, lane: Lane, hook: Hook, msgs: List[Message]) -> Tuple[bool, Optional[Exception]]:
+        if not self.state:
+            return True, InterruptedError('Executor stopped')
+
+        data = self.pack(hook.group, msgs)
+        lane.bucket.take()
+        try:
+            response = self.session.post(hook.build(), data=data)
+        except (requests.ConnectionError, requests.Timeout, requests.HTTPError) as e:
+            return True, e
+
+        lane.bucket.update(response.headers)
+
+        if response.status_code == 429:
+            retry_after = self.retry_after(response)
+            if response.headers.get('X-RateLimit-Global') \
+                    or response.headers.get('X-RateLimit-Scope') == 'global':
+                self.blocked = time.monotonic() + retry_after
+            else:
+                lane.bucket.block(retry_after)
+            self.log.warn(f'Rate limited on hook {hook.id} for {retry_after}s')
+            return False, None
+
+        if response.status_code == 400:
+            if len(msgs) > 1:
+                lane.singles = len(msgs)
+                return False, None
+            self.log.error(f'Message lost: {response.text}\n\n '
+                           f'{data.decode()}\n------------')
+        return True, None
+
+    def finish(self, hook: Hook, key: int, msg: Message, error: Optional[Exception]) -> None:
+        with self.lock:
+            entry = self.pending[key]
+            entry[0] -= 1
+            if error:
+                entry[1].append(hook)
+                entry[2] = error
+            if entry[0]:
+                return
+            del self.pending[key]
+
+        try:
+            if entry[1]:
+                e = entry[2]
+                if self.state == 2:
+                    self.log.error(f'{e.__class__.__name__} ({e.__str__()}) while sending message: {msg}')
+                    with self.lock:
+                        self.errors += 1
+                else:
+                    self.log.error(f'{e.__class__.__name__} ({e.__str__()}) while sending message')
+                msg.priority = 1
+                msg.hooks = tuple(entry[1])
+                self.messages.retry(key, msg.priority, self.dump(msg))
+            else:
+                self.messages.done(key)
+        except Exception:
+            self.messages.done(key)
+            raise
+
+    def defer(self, lane: Lane, delay: float) -> None:
+        timer = threading.Timer(delay, self.resume, (lane,))
+        timer.daemon = True
+        timer.start()
+
+    def resume(self, lane: Lane) -> None:
+        try:
+            self.pool.submit(self.drain, lane)
+        except RuntimeError:
+            with self.lock:
+                lane.running = False
+
+    def drain(self, lane: Lane) -> None:
+        while True:
+            with self.lock:
+                if not lane.posts:
+                    lane.running = False
+                    return
+
+                delay = max(lane.bucket.delay(), self.blocked - time.monotonic())
+                if delay > 0 and self.state:
+                    self.defer(lane, delay)
+                    return
+
+                batch = [heapq.heappop(lane.posts)]
+                if lane.singles:
+                    lane.singles -= 1
+                elif batch[0][4].batchable:
+                    while lane.posts and len(batch) < embeds_per_request and lane.posts[0][4].batchable \
+                            and lane.posts[0][2].group is batch[0][2].group:
+                        batch.append(heapq.heappop(lane.posts))
+
+            hook = batch[0][2]
+            length = 0
+            for i, post in enumerate(batch):
+                length += post[4].length(hook.group)
+                if i and length > embeds_max_length:
+                    with self.lock:
+                        for j in batch[i:]:
+                            heapq.heappush(lane.posts, j)
+                    batch = batch[:i]
+                    break
+
+            finished, error = self.post(lane, hook, [i[4] for i in batch])
+            if not finished:
+                with self.lock:
+                    for i in batch:
+                        heapq.heappush(lane.posts, i)
+                continue
+
+            for _, _, i, key, msg in batch:
+                self.finish(i, key, msg, error)
+
+    def dispatch(self, key: int, msg: Message) -> None:
+        if not msg.retry():
+            self.log.error(f'Max retries reached for message: {msg}')
+            self.messages.done(key)
+            return
+
+        if msg.channel not in self.channels:
+            self.log.warn(f'Message\'s channel does not exist: {msg.channel}')
+            self.messages.done(key)
+            return
+
+        hooks = msg.hooks or self.channels[msg.channel]
+        if not hooks:
+            self.messages.done(key)
+            return
+
+        with self.lock:
+            self.pending[key] = [len(hooks), [], None]
+            for i in hooks:
+                lane = self.lanes.setdefault(i.id, Lane(Bucket(1, 0.), [], False, 0))
+                heapq.heappush(lane.posts, (msg.priority, next(self.counter), i, key, msg))
+                if not lane.running:
+                    lane.running = True
+                    self.pool.submit(self.drain, lane)
+
     def loop(self):
-        errors = 0
         while True:
             start: float = time.time()
             if self.state >= 1:
-                try:
-                    msg: Message = self.messages.get_nowait()
-                    try:
-                        if msg.retry():
-                            if msg.channel not in self.channels:
-                                self.log.warn(f'Message\'s channel does not exist: {msg.channel}')
-                                continue
-
-                            for i in self.channels[msg.channel]:
-                                response = requests.post(
-                                    i.build(),
-                                    data=dumps(msg.build(i.group)),
-                                    headers={'Content-Type': 'application/json'}
-                                )
-
-                                if response.status_code == 400:
-                                    self.log.error(f'Message lost: {response.text}\n\n '
-                                                   f'{dumps(msg.build(i.group))}\n------------')
-                        else:
-                            self.log.error(f'Max retries reached for message: {msg}')
-                    except (requests.ConnectionError, requests.Timeout, requests.HTTPError) as e:
-                        if self.state == 2:
-                            self.log.error(f'{e.__class__.__name__} ({e.__str__()}) while sending message: {msg}')
-                            errors += 1
-                        else:
-                            self.log.error(f'{e.__class__.__name__} ({e.__str__()}) while sending message')
-                        msg.priority = 1
-                        self.messages.put_nowait(msg)
-                    finally:
-                        self.messages.task_done()
-                except queue.Empty:
-                    pass
-                if errors >= 3:
+                for key, priority, record in self.messages.get(
+                        min(messages_per_tick, max_in_flight - len(self.pending))):
+                    self.dispatch(key, self.load(priority, record))
+                if self.errors >= 3:
                     self.log.warn('Max retries reached. Turning off')
-                    self.messages.unfinished_tasks = 1
-                    self.messages.task_done()
+                    self.messages.release()
                     self.state = 0
             else:
+                self.pool.shutdown()
+                self.session.close()
+                self.messages.close()
                 self.log.info('Thread closed')
                 break
             delta: float = time.time() - start
             time.sleep(.1 - delta if delta <= .1 else 0)
 
     def e_monitor_starting(self) -> None:
-        self.messages.put(Message(1, f'INFO\nMonitor starting\nMonitor {__version__} ({__copyright__})'))
+        self.put(Message(1, f'INFO\nMonitor starting\nMonitor {__version__} ({__copyright__})'))
 
     def e_monitor_started(self) -> None:
-        self.messages.put(Message(1, 'INFO\nMonitor online'))
+        self.put(Message(1, 'INFO\nMonitor online'))
 
     def e_monitor_stopping(self) -> None:
-        self.messages.put(Message(1, 'INFO\nMonitor stopping'))
+        self.put(Message(1, 'INFO\nMonitor stopping'))
 
     def e_monitor_stopped(self) -> None:
         if self.thread.is_alive():
-            self.messages.put(Message(1, 'INFO\nMonitor offline'))
-            self.log.info(f'Waiting for messages ({self.messages.unfinished_tasks}) to sent')
+            self.put(Message(1, 'INFO\nMonitor offline'))
+            self.log.info(f'Waiting for messages ({self.messages.unfinished}) to sent')
             self.state = 2
             self.messages.join()
             self.log.info('All messages sent') if self.state == 2 else None
@@ -302,11 +547,11 @@ class EventsExecutor(api.EventsExecutor):
             self.log.warn('Script offline (due to raised exception)')
 
     def e_alert(self, code: codes.Code, thread: str) -> None:
-        self.messages.put(Message(3 if str(code.code)[0] == '5' else 4,
-                                  f'__**Alert**__\n{code.format()}\nThread: {thread}'))
+        self.put(Message(3 if str(code.code)[0] == '5' else 4,
+                         f'__**Alert**__\n{code.format()}\nThread: {thread}'))
 
     def e_item(self, item: api.ItemType) -> None:
-        self.messages.put(Message(10, item=item))
+        self.put(Message(10, item=item))
 
     def e_target_end(self, target_end: api.TargetEndType) -> None:
         if isinstance(target_end, api.TEFail):
@@ -316,7 +561,7 @@ class EventsExecutor(api.EventsExecutor):
         else:
             text = "Target Success"
 
-        self.messages.put(Message(
+        self.put(Message(
             5,
             f'__[TargetEnd]__\n**{text}**\n'
             f'\nDescription: {target_end.description}\nScript: {target_end.target.script}'
@@ -328,5 +573,5 @@ class EventsExecutor(api.EventsExecutor):
         else:
             header = '**Information Message**'
 
-        self.messages.put(Message(3 if isinstance(msg, api.MAlert) else 15,
-                                  f'{header}\n{msg.text}\n**Script: __{msg.script}__**', msg.channel))
+        self.put(Message(3 if isinstance(msg, api.MAlert) else 15,
+                         f'{header}\n{msg.text}\n**Script: __{msg.script}__**', msg.channel))
@@ -0,0 +1,53 @@
+"""
+Embedded JSON (window.__STATE__-style script blobs) extraction by plain search and incremental decoding
+"""
+
+from json import JSONDecodeError, JSONDecoder
+from typing import Any, Iterator, Union
+
+decoder = JSONDecoder()
+
+
+def text_of(data: Union[str, bytes]) -> str:
+    return data.decode('utf-8', 'replace') if isinstance(data, bytes) else data
+
+
+def locate(text: str, marker: str, start: int = 0) -> int:
+    index = text.find(marker, start)
+    if index < 0:
+        raise JSONDecodeError('Embedded JSON marker not found', text, start)
+
+    index += len(marker)
+    candidates = [i for i in (text.find('{', index), text.find('[', index)) if i >= 0]
+    if not candidates:
+        raise JSONDecodeError('Embedded JSON not found after marker', text, index)
+    return min(candidates)
+
+
+def extract(data: Union[str, bytes], marker: str, start: int = 0) -> Any:
+    text = text_of(data)
+    return decoder.raw_decode(text, locate(text, marker, start))[0]
+
+
+def extract_all(data: Union[str, bytes], marker: str) -> Iterator[Any]:
+    text = text_of(data)
+    start = 0
+    while text.find(marker, start) >= 0:
+        value, start = decoder.raw_decode(text, locate(text, marker, start))
+        yield value
+
+
+def strings(data: Union[str, bytes], key: str) -> Iterator[str]:
+    text = text_of(data)
+    start = 0
+    while True:
+        index = text.find(key, start)
+        if index < 0:
+            return
+        start = index + len(key)
+        if text.startswith('"', start):
+            try:
+                value, start = decoder.raw_decode(text, start)
+            except JSONDecodeError:
+                continue
+            yield value
@@ -1,7 +1,12 @@
 from datetime import datetime, timedelta, timezone
-from typing import List, Union
+from typing import FrozenSet, Iterable, List, NamedTuple, Tuple, Union
+from urllib.parse import quote, urlencode
 
 import pycurl
+from ujson import dumps, loads
+
+from scripts import keywords, schedule
+from scripts.fingerprints import Fingerprints
 from source import api
 from source import logger
 from source.api import CatalogType, TargetType, RestockTargetType, ItemType, TargetEndType, IRelease, FooterItem
@@ -10,6 +15,97 @@ from source.library import SubProvider, Keywords
 from source.tools import ScriptStorage
 
 
+browse: Tuple[str, ...] = ('browse', 'web', 'v2', 'ru', 'RU')
+search: Tuple[str, ...] = ('search', 'web', 'v2', 'ru', 'RU', '')
+
+latest: str = 'categories:Latest / Latest Sneakers'
+footwear: str = 'categories:Footwear'
+available: str = 'websites_available_at:13'
+
+attributes: Tuple[str, ...] = ('name', 'url_key', 'sku_stock', 'size', 'small_image', 'launches_mode',
+                               'launches_release_date', 'final_price_13')
+
+
+class Query(NamedTuple):
+    index: str
+    query: str
+    contexts: Tuple[str, ...]
+    filters: Tuple[FrozenSet[str], ...]
+    hits: int = 120
+
+
+watched: Tuple[Query, ...] = (
+    Query('catalog_products_en', '', browse,
+          (frozenset({latest}), frozenset({available}), frozenset({'brand:YEEZY'}))),
+    Query('catalog_products_en_search', 'yeezy', search, (frozenset({available}),)),
+    Query('catalog_products_en', '', browse,
+          (frozenset({footwear}), frozenset({available}), frozenset({'brand:Nike Jordan'}))),
+    Query('catalog_products_en', '', browse,
+          (frozenset({footwear}), frozenset({available}), frozenset({'brand:Nike SB', 'brand:Nike'}))),
+    Query('catalog_products_en', '', browse,
+          (frozenset({latest}), frozenset({available}), frozenset({'brand:Nike', 'brand:Nike SB'}))),
+    Query('catalog_products_en', '', browse,
+          (frozenset({latest}), frozenset({available}), frozenset({'brand:Nike Jordan'}))),
+    Query('catalog_products_en_search', 'nike dunk', search,
+          (frozenset({available}), frozenset({'department:Sneakers'})))
+)
+
+
+def merge(first: Query, second: Query) -> Union[Query, None]:
+    if first[:3] != second[:3] or len(first.filters) != len(second.filters):
+        return None
+
+    first_groups, second_groups = set(first.filters), set(second.filters)
+    if first_groups == second_groups:
+        return first._replace(hits=max(first.hits, second.hits))
+
+    left, right = first_groups - second_groups, second_groups - first_groups
+    if len(left) != 1 or len(right) != 1:
+        return None
+
+    union = left.pop() | right.pop()
+    return first._replace(
+        filters=tuple(sorted(first_groups & second_groups, key=sorted)) + (union,),
+        hits=min(first.hits + second.hits, 1000)
+    )
+
+
+def plan(queries: Iterable[Query]) -> List[Query]:
+    planned: List[Query] = []
+    for query in queries:
+        for index, other in enumerate(planned):
+            merged = merge(other, query)
+            if merged:
+                planned[index] = merged
+                break
+        else:
+            planned.append(query)
+    return planned
+
+
+def body(queries: Iterable[Query]) -> str:
+    requests = []
+    for query in queries:
+        contexts = dumps(query.contexts, escape_forward_slashes=False)
+        params = {
+            'query': query.query,
+            'analyticsTags': contexts,
+            'page': 0,
+            'facetFilters': dumps([sorted(i) for i in query.filters], escape_forward_slashes=False),
+            'filters': '',
+            'hitsPerPage': query.hits,
+            'ruleContexts': contexts,
+            'attributesToRetrieve': dumps(attributes),
+            'attributesToHighlight': '[]',
+            'attributesToSnippet': '[]',
+            'responseFields': '["hits"]'
+        }
+        if not query.query:
+            del params['query']
+        requests.append({'indexName': query.index, 'params': urlencode(params, quote_via=quote)})
+    return dumps({'requests': requests}, escape_forward_slashes=False)
+
+
 class Parser(api.Parser):
     def __init__(self, name: str, log: logger.Logger, provider_: SubProvider, storage: ScriptStorage, kw: Keywords):
         super().__init__(name, log, provider_, storage, kw)
@@ -25,178 +121,9 @@ class Parser(api.Parser):
             'Connection': 'keep-alive',
             'Referer': 'https://www.endclothing.com/ru'
         }
-        self.last_yeezy_data = '{"requests":[{"indexName":"catalog_products_en",' \
-                               '"params":"userToken=anonymous-9857eb1c-132e-4792-8703-ebf597c8cead&analyticsTags=%5B' \
-                               '%22browse%22%2C%22web%22%2C%22v2%22%2C%22ru%22%2C%22RU%22%5D&page=0&facetFilters=%5B' \
-                               '%5B%22categories%3ALatest%20%2F%20Latest%20Sneakers%22%5D%2C%5B' \
-                               '%22websites_available_at%3A13%22%5D%2C%5B%22brand%3AYEEZY%22%5D%5D&filters=&facets' \
-                               '=%5B%22*%22%5D&hitsPerPage=120&ruleContexts=%5B%22browse%22%2C%22web%22%2C%22v2%22%2C' \
-                               '%22ru%22%2C%22RU%22%5D&clickAnalytics=true"},{"indexName":"catalog_products_en",' \
-                               '"params":"userToken=anonymous-9857eb1c-132e-4792-8703-ebf597c8cead&analyticsTags=%5B' \
-                               '%22browse%22%2C%22web%22%2C%22v2%22%2C%22ru%22%2C%22RU%22%5D&page=0&facetFilters=%5B' \
-                               '%5B%22websites_available_at%3A13%22%5D%2C%5B%22categories%3ALatest%20%2F%20Latest' \
-                               '%20Sneakers%22%5D%5D&facets=%5B%22*%22%5D&hitsPerPage=120&ruleContexts=%5B%22browse' \
-                               '%22%2C%22web%22%2C%22v2%22%2C%22ru%22%2C%22RU%22%5D&clickAnalytics=true"},' \
-                               '{"indexName":"catalog_products_en",' \
-                               '"params":"userToken=anonymous-9857eb1c-132e-4792-8703-ebf597c8cead&analyticsTags=%5B' \
-                               '%22browse%22%2C%22web%22%2C%22v2%22%2C%22ru%22%2C%22RU%22%5D&page=0&facetFilters=%5B' \
-                               '%5B%22websites_available_at%3A13%22%5D%2C%5B%22brand%3AYEEZY%22%5D%5D&filters=&facets' \
-                               '=categories&hitsPerPage=120&ruleContexts=%5B%22browse%22%2C%22web%22%2C%22v2%22%2C' \
-                               '%22ru%22%2C%22RU%22%5D&analytics=false"},{"indexName":"catalog_products_en",' \
-                               '"params":"userToken=anonymous-9857eb1c-132e-4792-8703-ebf597c8cead&analyticsTags=%5B' \
-                               '%22browse%22%2C%22web%22%2C%22v2%22%2C%22ru%22%2C%22RU%22%5D&page=0&facetFilters=%5B' \
-                               '%5B%22categories%3ALatest%20%2F%20Latest%20Sneakers%22%5D%2C%5B%22brand%3AYEEZY%22%5D' \
-                               '%5D&filters=&facets=websites_available_at&hitsPerPage=120&ruleContexts=%5B%22browse' \
-                               '%22%2C%22web%22%2C%22v2%22%2C%22ru%22%2C%22RU%22%5D&analytics=false"},' \
-                               '{"indexName":"catalog_products_en",' \
-                               '"params":"userToken=anonymous-9857eb1c-132e-4792-8703-ebf597c8cead&analyticsTags=%5B' \
-                               '%22browse%22%2C%22web%22%2C%22v2%22%2C%22ru%22%2C%22RU%22%5D&page=0&facetFilters=%5B' \
-                               '%5B%22categories%3ALatest%20%2F%20Latest%20Sneakers%22%5D%2C%5B' \
-                               '%22websites_available_at%3A13%22%5D%5D&filters=&facets=brand&hitsPerPage=120' \
-                               '&ruleContexts=%5B%22browse%22%2C%22web%22%2C%22v2%22%2C%22ru%22%2C%22RU%22%5D' \
-                               '&analytics=false"}]} '
-        self.yeezy_data = '{"requests":[{"indexName":"catalog_products_en_search",' \
-                          '"params":"query=yeezy&query=yeezy&userToken=anonymous-9857eb1c-132e-4792-8703-ebf597c8cead' \
-                          '&analyticsTags=%5B%22search%22%2C%22web%22%2C%22v2%22%2C%22ru%22%2C%22RU%22%2C%22%22%5D' \
-                          '&page=0&facetFilters=%5B%5B%22websites_available_at%3A13%22%5D%5D&filters=&facets=%5B%22' \
-                          '*%22%5D&hitsPerPage=120&ruleContexts=%5B%22search%22%2C%22web%22%2C%22v2%22%2C%22ru%22%2C' \
-                          '%22RU%22%2C%22%22%5D&clickAnalytics=true"},{"indexName":"catalog_products_en_search",' \
-                          '"params":"query=yeezy&query=yeezy&userToken=anonymous-9857eb1c-132e-4792-8703-ebf597c8cead' \
-                          '&analyticsTags=%5B%22search%22%2C%22web%22%2C%22v2%22%2C%22ru%22%2C%22RU%22%2C%22%22%5D' \
-                          '&page=0&facetFilters=%5B%5B%22websites_available_at%3A13%22%5D%5D&facets=%5B%22*%22%5D' \
-                          '&hitsPerPage=120&ruleContexts=%5B%22search%22%2C%22web%22%2C%22v2%22%2C%22ru%22%2C%22RU%22' \
-                          '%2C%22%22%5D&clickAnalytics=true"},{"indexName":"catalog_products_en_search",' \
-                          '"params":"query=yeezy&query=yeezy&userToken=anonymous-9857eb1c-132e-4792-8703-ebf597c8cead' \
-                          '&analyticsTags=%5B%22search%22%2C%22web%22%2C%22v2%22%2C%22ru%22%2C%22RU%22%2C%22%22%5D' \
-                          '&page=0&facetFilters=%5B%5D&filters=&facets=websites_available_at&hitsPerPage=120' \
-                          '&ruleContexts=%5B%22search%22%2C%22web%22%2C%22v2%22%2C%22ru%22%2C%22RU%22%2C%22%22%5D' \
-                          '&analytics=false"}]} '
-        self.jordan_data = '{"requests":[{"indexName":"catalog_products_en","params":"analytic' \
-                           'sTags=%5B%22browse%22%2C%22web%22%2C%22v2%22%2C%22ru%22%5D&page=0&facetF' \
-                           'ilters=%5B%5B%22categories%3AFootwear%22%5D%2C%5B%22websites_available_at' \
-                           '%3A13%22%5D%2C%5B%22brand%3ANike%20Jordan%22%5D%5D&filters=&facets=%5B%22*%2' \
-                           '2%5D&hitsPerPage=120&ruleContexts=%5B%22browse%22%2C%22web%22%2C%22v2%22%2C%22ru%22%5D' \
-                           '&clickAnalytics=true"},{"indexName":"catalog_products_en",' \
-                           '"params":"analyticsTags=%5B%22browse%22%2C%22web%22%2C%22v2%22%2C%22ru%22%5D&page=0' \
-                           '&facetFilters=%5B%5B%22websites_available_at%3A13%22%5D%2C%5B%22categories%3AFootwear%22' \
-                           '%5D%5D&facets=%5B%22*%22%5D&hitsPerPage=120&ruleContexts=%5B%22browse%22%2C%22web%22%2C' \
-                           '%22v2%22%2C%22ru%22%5D&clickAnalytics=true"},{"indexName":"catalog_products_en",' \
-                           '"params":"analyticsTags=%5B%22browse%22%2C%22web%22%2C%22v2%22%2C%22ru%22%5D&page=0' \
-                           '&facetFilters=%5B%5B%22websites_available_at%3A13%22%5D%2C%5B%22brand%3ANike%20Jordan%22' \
-                           '%5D%5D&filters=&facets=categories&hitsPerPage=120&ruleContexts=%5B%22browse%22%2C%22web' \
-                           '%22%2C%22v2%22%2C%22ru%22%5D&analytics=false"},{"indexName":"catalog_products_en",' \
-                           '"params":"analyticsTags=%5B%22browse%22%2C%22web%22%2C%22v2%22%2C%22ru%22%5D&page=0' \
-                           '&facetFilters=%5B%5B%22categories%3AFootwear%22%5D%2C%5B%22brand%3ANike%20Jordan%22%5D%5D' \
-                           '&filters=&facets=websites_available_at&hitsPerPage=120&ruleContexts=%5B%22browse%22%2C' \
-                           '%22web%22%2C%22v2%22%2C%22ru%22%5D&analytics=false"},{"indexName":"catalog_products_en",' \
-                           '"params":"analyticsTags=%5B%22browse%22%2C%22web%22%2C%22v2%22%2C%22ru%22%5D&page=0' \
-                           '&facetFilters=%5B%5B%22categories%3AFootwear%22%5D%2C%5B%22websites_available_at%3A13%22' \
-                           '%5D%5D&filters=&facets=brand&hitsPerPage=120&ruleContexts=%5B%22browse%22%2C%22web%22%2C' \
-                           '%22v2%22%2C%22ru%22%5D&analytics=false"}]}'
-        self.nike_data = '{"requests":[{"indexName":"catalog_products_en",' \
-                         '"params":"analyticsTags=%5B%22browse%22%2C%22web%22%2C%22v2%22%2C%22ru%22%5D&page=0' \
-                         '&facetFilters=%5B%5B%22categories%3AFootwear%22%5D%2C%5B%22websites_available_at%3A13%22%5D' \
-                         '%2C%5B%22brand%3ANike%20SB%22%2C%22brand%3ANike%22%5D%5D&filters=&facets=%5B%22*%22%5D' \
-                         '&hitsPerPage=120&ruleContexts=%5B%22browse%22%2C%22web%22%2C%22v2%22%2C%22ru%22%5D' \
-                         '&clickAnalytics=true"},{"indexName":"catalog_products_en",' \
-                         '"params":"analyticsTags=%5B%22browse%22%2C%22web%22%2C%22v2%22%2C%22ru%22%5D&page=0' \
-                         '&facetFilters=%5B%5B%22websites_available_at%3A13%22%5D%2C%5B%22categories%3AFootwear%22%5D' \
-                         '%5D&facets=%5B%22*%22%5D&hitsPerPage=120&ruleContexts=%5B%22browse%22%2C%22web%22%2C%22v2' \
-                         '%22%2C%22ru%22%5D&clickAnalytics=true"},{"indexName":"catalog_products_en",' \
-                         '"params":"analyticsTags=%5B%22browse%22%2C%22web%22%2C%22v2%22%2C%22ru%22%5D&page=0' \
-                         '&facetFilters=%5B%5B%22websites_available_at%3A13%22%5D%2C%5B%22brand%3ANike%20SB%22%2C' \
-                         '%22brand%3ANike%22%5D%5D&filters=&facets=categories&hitsPerPage=120&ruleContexts=%5B' \
-                         '%22browse%22%2C%22web%22%2C%22v2%22%2C%22ru%22%5D&analytics=false"},' \
-                         '{"indexName":"catalog_products_en",' \
-                         '"params":"analyticsTags=%5B%22browse%22%2C%22web%22%2C%22v2%22%2C%22ru%22%5D&page=0' \
-                         '&facetFilters=%5B%5B%22categories%3AFootwear%22%5D%2C%5B%22brand%3ANike%20SB%22%2C%22brand' \
-                         '%3ANike%22%5D%5D&filters=&facets=websites_available_at&hitsPerPage=120&ruleContexts=%5B' \
-                         '%22browse%22%2C%22web%22%2C%22v2%22%2C%22ru%22%5D&analytics=false"},' \
-                         '{"indexName":"catalog_products_en",' \
-                         '"params":"analyticsTags=%5B%22browse%22%2C%22web%22%2C%22v2%22%2C%22ru%22%5D&page=0' \
-                         '&facetFilters=%5B%5B%22categories%3AFootwear%22%5D%2C%5B%22websites_available_at%3A13%22%5D' \
-                         '%5D&filters=&facets=brand&hitsPerPage=120&ruleContexts=%5B%22browse%22%2C%22web%22%2C%22v2' \
-                         '%22%2C%22ru%22%5D&analytics=false"}]} '
-        self.last_nike = '{"requests":[{"indexName":"catalog_products_en",' \
-                         '"params":"userToken=anonymous-9857eb1c-132e-4792-8703-ebf597c8cead&analyticsTags=%5B' \
-                         '%22browse%22%2C%22web%22%2C%22v2%22%2C%22ru%22%2C%22RU%22%5D&page=0&facetFilters=%5B%5B' \
-                         '%22categories%3ALatest%20%2F%20Latest%20Sneakers%22%5D%2C%5B%22websites_available_at%3A13' \
-                         '%22%5D%2C%5B%22brand%3ANike%22%2C%22brand%3ANike%20SB%22%5D%5D&filters=&facets=%5B%22*%22' \
-                         '%5D&hitsPerPage=120&ruleContexts=%5B%22browse%22%2C%22web%22%2C%22v2%22%2C%22ru%22%2C%22RU' \
-                         '%22%5D&clickAnalytics=true"},{"indexName":"catalog_products_en",' \
-                         '"params":"userToken=anonymous-9857eb1c-132e-4792-8703-ebf597c8cead&analyticsTags=%5B' \
-                         '%22browse%22%2C%22web%22%2C%22v2%22%2C%22ru%22%2C%22RU%22%5D&page=0&facetFilters=%5B%5B' \
-                         '%22websites_available_at%3A13%22%5D%2C%5B%22categories%3ALatest%20%2F%20Latest%20Sneakers' \
-                         '%22%5D%5D&facets=%5B%22*%22%5D&hitsPerPage=120&ruleContexts=%5B%22browse%22%2C%22web%22%2C' \
-                         '%22v2%22%2C%22ru%22%2C%22RU%22%5D&clickAnalytics=true"},{"indexName":"catalog_products_en",' \
-                         '"params":"userToken=anonymous-9857eb1c-132e-4792-8703-ebf597c8cead&analyticsTags=%5B' \
-                         '%22browse%22%2C%22web%22%2C%22v2%22%2C%22ru%22%2C%22RU%22%5D&page=0&facetFilters=%5B%5B' \
-                         '%22websites_available_at%3A13%22%5D%2C%5B%22brand%3ANike%22%2C%22brand%3ANike%20SB%22%5D%5D' \
-                         '&filters=&facets=categories&hitsPerPage=120&ruleContexts=%5B%22browse%22%2C%22web%22%2C' \
-                         '%22v2%22%2C%22ru%22%2C%22RU%22%5D&analytics=false"},{"indexName":"catalog_products_en",' \
-                         '"params":"userToken=anonymous-9857eb1c-132e-4792-8703-ebf597c8cead&analyticsTags=%5B' \
-                         '%22browse%22%2C%22web%22%2C%22v2%22%2C%22ru%22%2C%22RU%22%5D&page=0&facetFilters=%5B%5B' \
-                         '%22categories%3ALatest%20%2F%20Latest%20Sneakers%22%5D%2C%5B%22brand%3ANike%22%2C%22brand' \
-                         '%3ANike%20SB%22%5D%5D&filters=&facets=websites_available_at&hitsPerPage=120&ruleContexts' \
-                         '=%5B%22browse%22%2C%22web%22%2C%22v2%22%2C%22ru%22%2C%22RU%22%5D&analytics=false"},' \
-                         '{"indexName":"catalog_products_en",' \
-                         '"params":"userToken=anonymous-9857eb1c-132e-4792-8703-ebf597c8cead&analyticsTags=%5B' \
-                         '%22browse%22%2C%22web%22%2C%22v2%22%2C%22ru%22%2C%22RU%22%5D&page=0&facetFilters=%5B%5B' \
-                         '%22categories%3ALatest%20%2F%20Latest%20Sneakers%22%5D%2C%5B%22websites_available_at%3A13' \
-                         '%22%5D%5D&filters=&facets=brand&hitsPerPage=120&ruleContexts=%5B%22browse%22%2C%22web%22%2C' \
-                         '%22v2%22%2C%22ru%22%2C%22RU%22%5D&analytics=false"}]} '
-        self.last_jordan = '{"requests":[{"indexName":"catalog_products_en",' \
-                           '"params":"userToken=anonymous-9857eb1c-132e-4792-8703-ebf597c8cead&analyticsTags=%5B' \
-                           '%22browse%22%2C%22web%22%2C%22v2%22%2C%22ru%22%2C%22RU%22%5D&page=0&facetFilters=%5B%5B' \
-                           '%22categories%3ALatest%20%2F%20Latest%20Sneakers%22%5D%2C%5B%22websites_available_at%3A13' \
-                           '%22%5D%2C%5B%22brand%3ANike%20Jordan%22%5D%5D&filters=&facets=%5B%22*%22%5D&hitsPerPage' \
-                           '=120&ruleContexts=%5B%22browse%22%2C%22web%22%2C%22v2%22%2C%22ru%22%2C%22RU%22%5D' \
-                           '&clickAnalytics=true"},{"indexName":"catalog_products_en",' \
-                           '"params":"userToken=anonymous-9857eb1c-132e-4792-8703-ebf597c8cead&analyticsTags=%5B' \
-                           '%22browse%22%2C%22web%22%2C%22v2%22%2C%22ru%22%2C%22RU%22%5D&page=0&facetFilters=%5B%5B' \
-                           '%22websites_available_at%3A13%22%5D%2C%5B%22categories%3ALatest%20%2F%20Latest%20Sneakers' \
-                           '%22%5D%5D&facets=%5B%22*%22%5D&hitsPerPage=120&ruleContexts=%5B%22browse%22%2C%22web%22' \
-                           '%2C%22v2%22%2C%22ru%22%2C%22RU%22%5D&clickAnalytics=true"},' \
-                           '{"indexName":"catalog_products_en",' \
-                           '"params":"userToken=anonymous-9857eb1c-132e-4792-8703-ebf597c8cead&analyticsTags=%5B' \
-                           '%22browse%22%2C%22web%22%2C%22v2%22%2C%22ru%22%2C%22RU%22%5D&page=0&facetFilters=%5B%5B' \
-                           '%22websites_available_at%3A13%22%5D%2C%5B%22brand%3ANike%20Jordan%22%5D%5D&filters' \
-                           '=&facets=categories&hitsPerPage=120&ruleContexts=%5B%22browse%22%2C%22web%22%2C%22v2%22' \
-                           '%2C%22ru%22%2C%22RU%22%5D&analytics=false"},{"indexName":"catalog_products_en",' \
-                           '"params":"userToken=anonymous-9857eb1c-132e-4792-8703-ebf597c8cead&analyticsTags=%5B' \
-                           '%22browse%22%2C%22web%22%2C%22v2%22%2C%22ru%22%2C%22RU%22%5D&page=0&facetFilters=%5B%5B' \
-                           '%22categories%3ALatest%20%2F%20Latest%20Sneakers%22%5D%2C%5B%22brand%3ANike%20Jordan%22' \
-                           '%5D%5D&filters=&facets=websites_available_at&hitsPerPage=120&ruleContexts=%5B%22browse%22' \
-                           '%2C%22web%22%2C%22v2%22%2C%22ru%22%2C%22RU%22%5D&analytics=false"},' \
-                           '{"indexName":"catalog_products_en",' \
-                           '"params":"userToken=anonymous-9857eb1c-132e-4792-8703-ebf597c8cead&analyticsTags=%5B' \
-                           '%22browse%22%2C%22web%22%2C%22v2%22%2C%22ru%22%2C%22RU%22%5D&page=0&facetFilters=%5B%5B' \
-                           '%22categories%3ALatest%20%2F%20Latest%20Sneakers%22%5D%2C%5B%22websites_available_at%3A13' \
-                           '%22%5D%5D&filters=&facets=brand&hitsPerPage=120&ruleContexts=%5B%22browse%22%2C%22web%22' \
-                           '%2C%22v2%22%2C%22ru%22%2C%22RU%22%5D&analytics=false"}]} '
-        self.dunk_data = '{"requests":[{"indexName":"catalog_products_en_search","params":"query=nike ' \
-                         'dunk&query=nike&userToken=anonymous-9857eb1c-132e-4792-8703-ebf597c8cead&analyticsTags=%5B' \
-                         '%22search%22%2C%22web%22%2C%22v2%22%2C%22ru%22%2C%22RU%22%2C%22%22%5D&page=0&facetFilters' \
-                         '=%5B%5B%22websites_available_at%3A13%22%5D%2C%5B%22department%3ASneakers%22%5D%5D&filters' \
-                         '=&facets=%5B%22*%22%5D&hitsPerPage=120&ruleContexts=%5B%22search%22%2C%22web%22%2C%22v2%22' \
-                         '%2C%22ru%22%2C%22RU%22%2C%22%22%5D&clickAnalytics=true"},' \
-                         '{"indexName":"catalog_products_en_search",' \
-                         '"params":"query=nike&query=nike&userToken=anonymous-9857eb1c-132e-4792-8703-ebf597c8cead' \
-                         '&analyticsTags=%5B%22search%22%2C%22web%22%2C%22v2%22%2C%22ru%22%2C%22RU%22%2C%22%22%5D' \
-                         '&page=0&facetFilters=%5B%5B%22websites_available_at%3A13%22%5D%5D&facets=%5B%22*%22%5D' \
-                         '&hitsPerPage=120&ruleContexts=%5B%22search%22%2C%22web%22%2C%22v2%22%2C%22ru%22%2C%22RU%22' \
-                         '%2C%22%22%5D&clickAnalytics=true"},{"indexName":"catalog_products_en_search",' \
-                         '"params":"query=nike&query=nike&userToken=anonymous-9857eb1c-132e-4792-8703-ebf597c8cead' \
-                         '&analyticsTags=%5B%22search%22%2C%22web%22%2C%22v2%22%2C%22ru%22%2C%22RU%22%2C%22%22%5D' \
-                         '&page=0&facetFilters=%5B%5B%22department%3ASneakers%22%5D%5D&filters=&facets' \
-                         '=websites_available_at&hitsPerPage=120&ruleContexts=%5B%22search%22%2C%22web%22%2C%22v2%22' \
-                         '%2C%22ru%22%2C%22RU%22%2C%22%22%5D&analytics=false"},' \
-                         '{"indexName":"catalog_products_en_search",' \
-                         '"params":"query=nike&query=nike&userToken=anonymous-9857eb1c-132e-4792-8703-ebf597c8cead' \
-                         '&analyticsTags=%5B%22search%22%2C%22web%22%2C%22v2%22%2C%22ru%22%2C%22RU%22%2C%22%22%5D' \
-                         '&page=0&facetFilters=%5B%5B%22websites_available_at%3A13%22%5D%5D&filters=&facets' \
-                         '=department&hitsPerPage=120&ruleContexts=%5B%22search%22%2C%22web%22%2C%22v2%22%2C%22ru%22' \
-                         '%2C%22RU%22%2C%22%22%5D&analytics=false"}]} '
+        self.fingerprints = Fingerprints()
+        self.data = body(plan(watched))
+        self.schedule = schedule.Adaptive(3., 30.)
 
     @property
     def catalog(self) -> api.CatalogType:
@@ -214,14 +141,7 @@ class Parser(api.Parser):
     ) -> List[Union[CatalogType, TargetType, RestockTargetType, ItemType, TargetEndType]]:
         result = []
         if mode == 0:
-            result.append(api.TInterval('last_yeezy', self.name, [self.last_yeezy_data], 3))
-            result.append(api.TInterval('yeezy', self.name, [self.yeezy_data], 3))
-            result.append(api.TInterval('jordan', self.name, [self.jordan_data], 3))
-            result.append(api.TInterval('yeezy', self.name, [self.yeezy_data], 3))
-            result.append(api.TInterval('nike', self.name, [self.nike_data], 3))
-            result.append(api.TInterval('last_nike', self.name, [self.last_nike], 3))
-            result.append(api.TInterval('last_jordan', self.name, [self.last_jordan], 3))
-            result.append(api.TInterval('dunk', self.name, [self.dunk_data], 3))
+            result.append(api.TInterval('algolia', self.name, [self.data], self.schedule.interval()))
         if mode == 1:
             ok, response = self.provider.request(self.link, headers=self.headers, data=content.data[0], method='POST')
 
@@ -233,19 +153,36 @@ class Parser(api.Parser):
                     raise response
 
             try:
-                json = response.json()
-            except ValueError:
+                json = loads(response.content)
+            except (AttributeError, ValueError):
                 return [content, api.MAlert('Script crashed', self.name)]
 
-            catalog = [element for element in json['results'][0]['hits']]
+            catalog = [element for results in json['results'] for element in results['hits']]
 
             if not catalog:
                 raise Exception('Catalog is empty')
 
+            seen = set()
             for element in catalog:
 
+                url_key = element['url_key']
+                if url_key in seen:
+                    continue
+                seen.add(url_key)
+
+                fingerprint = self.fingerprints.check(
+                    url_key,
+                    element['sku_stock'],
+                    element['size'],
+                    element.get('final_price_13'),
+                    element.get('launches_mode'),
+                    element.get('launches_release_date')
+                )
+                if fingerprint is None:
+                    continue
+
                 name = element['name']
-                handle = element['url_key'] + '.html'
+                handle = url_key + '.html'
                 skus = element['sku_stock']
                 sku_stock = [skus[key] for key in skus if skus[key] != 0]
                 available_sizes = element['size']
@@ -289,7 +226,7 @@ class Parser(api.Parser):
 
                 sizes = api.Sizes(api.SIZE_TYPES[''], sizes)
 
-                if self.kw.check(name + ' ' + handle):
+                if keywords.check(self, name + ' ' + handle):
                     result.append(IRelease(
                         target.name + f'?shash={sizes.hash().hex()}',
                         'end',
@@ -325,5 +262,10 @@ class Parser(api.Parser):
                         additional_columns
                     )
                     )
+                self.fingerprints.add(url_key, fingerprint)
+
+            self.schedule.observe(bool(result))
+            content.interval = self.schedule.interval()
+
         result.append(content)
         return result
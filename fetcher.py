@@ -0,0 +1,66 @@
+"""
+Bounded concurrent requests through a shared thread pool
+"""
+
+import threading
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Any, Callable, Dict, List, Optional, Sequence, TypeVar, Union
+from urllib.parse import urlsplit
+
+T = TypeVar('T')
+
+workers: int = 16
+per_domain: int = 4
+
+lock = threading.Lock()
+pool: Optional[ThreadPoolExecutor] = None
+domains: Dict[str, threading.BoundedSemaphore] = {}
+
+
+def executor() -> ThreadPoolExecutor:
+    global pool
+    with lock:
+        if pool is None:
+            pool = ThreadPoolExecutor(workers, 'Fetcher')
+        return pool
+
+
+def semaphore(url: str) -> threading.BoundedSemaphore:
+    domain = urlsplit(url).netloc
+    with lock:
+        if domain not in domains:
+            domains[domain] = threading.BoundedSemaphore(per_domain)
+        return domains[domain]
+
+
+def call(request: Callable[..., T], url: str, kwargs: Dict[str, Any]) -> Union[T, Exception]:
+    # A failed URL yields its exception in place so the rest of the batch survives
+    with semaphore(url):
+        try:
+            return request(url, **kwargs)
+        except Exception as e:
+            return e
+
+
+def fetch(
+        request: Callable[..., T],
+        urls: Sequence[str],
+        limit: int = per_domain,
+        **kwargs
+) -> List[Union[T, Exception]]:
+    if len(urls) <= 1 or limit <= 1:
+        return [call(request, i, kwargs) for i in urls]
+
+    results: List[Union[T, Exception]] = [None] * len(urls)
+    futures: Dict[Future, int] = {}
+
+    for index, url in enumerate(urls):
+        if len(futures) >= limit:
+            done, _ = wait(futures, return_when=FIRST_COMPLETED)
+            for i in done:
+                results[futures.pop(i)] = i.result()
+        futures[executor().submit(call, request, url, kwargs)] = index
+
+    for i, index in futures.items():
+        results[index] = i.result()
+    return results
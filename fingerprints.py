@@ -0,0 +1,45 @@
+"""
+Per-script product fingerprints for skipping unchanged catalog entries
+"""
+
+import threading
+from typing import Dict, Union
+
+from ujson import dumps
+
+
+class Fingerprints:
+    lock: threading.Lock
+    store: Dict[str, int]
+    size: int
+
+    def __init__(self, size: int = 8192):
+        self.lock = threading.Lock()
+        self.store = {}
+        self.size = size
+
+    def check(self, key: str, *fields) -> Union[int, None]:
+        try:
+            fingerprint = hash(dumps(fields, sort_keys=True))
+        except (TypeError, OverflowError, ValueError):
+            return 0
+
+        with self.lock:
+            return None if self.store.get(key) == fingerprint else fingerprint
+
+    def add(self, key: str, fingerprint: int) -> None:
+        if not fingerprint:
+            return
+
+        with self.lock:
+            self.store.pop(key, None)
+            self.store[key] = fingerprint
+            if len(self.store) > self.size:
+                del self.store[next(iter(self.store))]
+
+    def reset(self, key: str = '') -> None:
+        with self.lock:
+            if key:
+                self.store.pop(key, None)
+            else:
+                self.store.clear()
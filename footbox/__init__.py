@@ -2,10 +2,11 @@ from datetime import datetime, timedelta, timezone
 from json import loads, JSONDecodeError
 from typing import List, Union
 
-from lxml import etree
 from pycurl_requests import exceptions
 from user_agent import generate_user_agent
 
+from scripts import keywords
+from scripts.markup import document
 from source import api
 from source import logger
 from source.api import CatalogType, TargetType, RestockTargetType, ItemType, TargetEndType, IRelease, FooterItem
@@ -49,7 +50,7 @@ class Parser(api.Parser):
                 else:
                     raise response
 
-            resp_html = etree.HTML(response.text)
+            resp_html = document(response)
 
             catalog = [element for element in resp_html.xpath('//div[@class="product col-md-4 col-sm-6 col-12"]/a')]
             if len(catalog) == 0:
@@ -58,7 +59,7 @@ class Parser(api.Parser):
             for element in catalog:
                 href = element.get('href')
 
-                if self.kw.check(href.split('/')[3], '-'):
+                if keywords.check(self, href.split('/')[3], '-'):
                     link = f'https://www.footboxshop.ru{href}'
                     target = api.Target(link, self.name, 0)
 
@@ -71,7 +72,7 @@ class Parser(api.Parser):
                             else:
                                 raise response
 
-                        element_html = etree.HTML(response.text)
+                        element_html = document(response)
 
                         price = api.Price(api.CURRENCIES['RUB'],
                                           float(element_html.xpath('//p[@class="item_price"]/span')[0].text
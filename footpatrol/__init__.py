@@ -1,15 +1,22 @@
 from datetime import datetime, timedelta, timezone
-from re import findall
 from typing import List, Union
 
 from lxml import etree
 
+from scripts import fetcher
+from scripts.embedded import strings
+from scripts.markup import listing
 from source import api
 from source import logger
 from source.api import CatalogType, TargetType, RestockTargetType, ItemType, TargetEndType, IRelease, FooterItem
 from source.cache import HashStorage
 from source.library import SubProvider
 
+catalog_items = etree.XPath('//a[@data-e2e="product-listing-name"]')
+meta_title = etree.XPath('//meta[@name="title"]')
+og_image = etree.XPath('//meta[@property="og:image"]')
+twitter_price = etree.XPath('//meta[@name="twitter:data1"]')
+
 
 class Parser(api.Parser):
     def __init__(self, name: str, log: logger.Logger, provider_: SubProvider):
@@ -34,8 +41,8 @@ class Parser(api.Parser):
         if mode == 0:
             links = list()
             counter = 0
-            for element in etree.HTML(self.provider.get(self.link, headers={'user-agent': self.user_agent}, mode=1
-                                                        )).xpath('//a[@data-e2e="product-listing-name"]'):
+            for element in catalog_items(listing(self.provider.get(self.link, headers={'user-agent': self.user_agent},
+                                                                   mode=1), 'data-e2e="product-listing-name"')):
                 if counter == 200:
                     break
                 if 'yeezy' in element.get('href') or 'air' in element.get('href') or 'sacai' in element.get('href') \
@@ -43,24 +50,28 @@ class Parser(api.Parser):
                     links.append([api.Target('https://www.footpatrol.com' + element.get('href'), self.name, 0),
                                   'https://www.footpatrol.com' + element.get('href')])
                     counter += 1
-            for link in links:
+            links = [link for link in links if HashStorage.check_target(link[0].hash())]
+            pages = fetcher.fetch(self.provider.get, [link[1] for link in links],
+                                  headers={'user-agent': self.user_agent}, mode=1)
+            for link, get_content in zip(links, pages):
+                if isinstance(get_content, Exception):
+                    self.log.error(f'{get_content.__class__.__name__} ({get_content.__str__()}) while fetching {link[1]}')
+                    continue
                 try:
                     if HashStorage.check_target(link[0].hash()):
-                        get_content = self.provider.get(link[1], headers={'user-agent': self.user_agent}, mode=1)
                         page_content: etree.Element = etree.HTML(get_content)
-                        name = page_content.xpath('//meta[@name="title"]')[0].get('content').split(' |')[0]
-                        sizes = [api.Size(size.replace('name:', '').replace('"', '') + ' UK')
-                                 for size in findall(r'name:".*"', get_content)]
+                        name = meta_title(page_content)[0].get('content').split(' |')[0]
+                        sizes = [api.Size(size + ' UK') for size in strings(get_content, 'name:')]
                         HashStorage.add_target(link[0].hash())
                         result.append(IRelease(
                             link[1],
                             'footsites',
                             name,
-                            page_content.xpath('//meta[@property="og:image"]')[0].get('content'),
+                            og_image(page_content)[0].get('content'),
                             '',
                             api.Price(
                                 api.CURRENCIES['GBP'],
-                                float(page_content.xpath('//meta[@name="twitter:data1"]')[0].get('content'))
+                                float(twitter_price(page_content)[0].get('content'))
                             ),
                             api.Sizes(api.SIZE_TYPES[''], sizes),
                             [
@@ -5,6 +5,7 @@ from typing import List, Union
 from lxml import etree
 from user_agent import generate_user_agent
 
+from scripts.markup import listing
 from source import api
 from source.api import CatalogType, TargetType, RestockTargetType, TargetEndType, ItemType, FooterItem
 from source.logger import Logger
@@ -24,6 +25,13 @@ MOUNTS = {
     'DEC': 12
 }
 
+catalog_items = etree.XPath('//a[@class="thumb-link has-alt-image"]')
+product_sizes = etree.XPath('//ul[@class="swatches size "]/li[@class="selectable"]/a')
+product_name = etree.XPath('//h1[@itemprop="name"]')
+product_image = etree.XPath('//img[@class="lazy"]')
+product_date = etree.XPath('//div[@class="launch-date-box"]/script')
+product_price = etree.XPath('//span[@class="price-sales"]')
+
 
 class Parser(api.Parser):
     def __init__(self, name: str, log: Logger, provider: api.SubProvider):
@@ -44,9 +52,9 @@ class Parser(api.Parser):
         result = []
         if mode == 0:
             counter = 0
-            for element in etree.HTML(self.provider.get(url=self.link, proxy=True, mode=1,
-                                                        headers={'user-agent': self.user_agent})) \
-                    .xpath('//a[@class="thumb-link has-alt-image"]'):
+            for element in catalog_items(listing(self.provider.get(url=self.link, proxy=True, mode=1,
+                                                                   headers={'user-agent': self.user_agent}),
+                                                 'class="thumb-link has-alt-image"')):
                 if counter == 10:
                     break
                 if 'dunk' in element.get('href') or 'yeezy' in element.get('href') or 'jordan' in element.get('href') \
@@ -59,7 +67,7 @@ class Parser(api.Parser):
                                                         headers={'user-agent': self.user_agent}))
             available_sizes = []
             data_for_image = content.name.split('/')[-1]
-            for element in page_content.xpath('//ul[@class="swatches size "]/li[@class="selectable"]/a'):
+            for element in product_sizes(page_content):
                 size = element.get('href').split('size=')[-1].split('&')[0].replace('0', '')
                 if len(size) == 2:
                     if size == '15':
@@ -78,18 +86,18 @@ class Parser(api.Parser):
                         size = f'{size} US'
                 available_sizes.append(api.Size(size, element.get('href')))
             try:
-                name = page_content.xpath('//h1[@itemprop="name"]')[0].text
+                name = product_name(page_content)[0].text
             except IndexError:
                 name = ''
             try:
-                image = page_content.xpath('//img[@class="lazy"]')[0].get('data-src')
+                image = product_image(page_content)[0].get('data-src')
             except IndexError:
                 image = f'https://i1.adis.ws/i/hibbett/{data_for_image.split(".html")[0]}' + \
                         f'_{data_for_image.split("color=")[-1].split("&")[0]}_' + \
                         f'right1?w=580&h=580&fmt=jpg&bg=rgb(255,255,255)&img404=404&v=0'
 
             if not available_sizes:
-                date_for_print = page_content.xpath('//div[@class="launch-date-box"]/script')[0].text.split('\'')[1]
+                date_for_print = product_date(page_content)[0].text.split('\'')[1]
                 date_data = date_for_print.split(' ')
                 date = mktime(datetime.datetime(int(date_data[-1]), MOUNTS[date_data[1].upper()], int(date_data[2]),
                                                 int(date_data[3].split(':')[0]), int(date_data[3].split(':')[1]),
@@ -101,7 +109,7 @@ class Parser(api.Parser):
                         name,
                         image,
                         '',
-                        api.Price(api.CURRENCIES['USD'], float(page_content.xpath('//span[@class="price-sales"]')[0]
+                        api.Price(api.CURRENCIES['USD'], float(product_price(page_content)[0]
                                                                .get('content'))),
                         api.Sizes(api.SIZE_TYPES[''], []),
                         [
@@ -121,7 +129,7 @@ class Parser(api.Parser):
                     name,
                     image,
                     '',
-                    api.Price(api.CURRENCIES['USD'], float(page_content.xpath('//span[@class="price-sales"]')[0]
+                    api.Price(api.CURRENCIES['USD'], float(product_price(page_content)[0]
                                                            .get('content'))),
                     api.Sizes(api.SIZE_TYPES[''], available_sizes),
                     [
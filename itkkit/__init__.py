@@ -5,6 +5,8 @@ from typing import List, Union
 from lxml import etree
 from pycurl_requests import exceptions
 
+from scripts import keywords
+from scripts.markup import document
 from source import api
 from source import logger
 from source.api import CatalogType, TargetType, RestockTargetType, ItemType, TargetEndType, IRelease, FooterItem, \
@@ -18,6 +20,13 @@ SIZES = ["4 US", "4.5 US", "5 US", "5.5 US", "6 US", "6.5 US", "7 US", "7.5 US",
          "10 US", "10.5 US", "11 US", "11.5 US", "12 US", "12.5 US", "13 US", "13.5 US", "14 US", "14.5 US",
          "15 US", "15.5 US", "16 US", "16.5 US", "17 US", "17.5 US", "18.5 US", "19 US"]
 
+catalog_items = etree.XPath('//a[@class="catalog-item catalog-item--compact link link--primary"]')
+item_title = etree.XPath('div[@class="catalog-item__title"]/div')
+item_sizes = etree.XPath('div[@class="catalog-item__img-wrapper"]/div[@class="catalog-item__img-hover"]/div')
+item_image = etree.XPath('div[@class="catalog-item__img-wrapper"]/div[@class="catalog-item__img-list"]'
+                         '/div[@class="catalog-item__img catalog-item__img--active "]/picture/img')
+item_price = etree.XPath('div[@class="catalog-item__price"]/div/div/span/span')
+
 
 class Parser(api.Parser):
     def __init__(self, name: str, log: logger.Logger, provider_: SubProvider, storage: ScriptStorage, kw: Keywords):
@@ -68,18 +77,17 @@ class Parser(api.Parser):
 
                     raise result
 
-            catalog = [element for element in etree.HTML(response.text).xpath(
-                '//a[@class="catalog-item catalog-item--compact link link--primary"]')]
+            catalog = catalog_items(document(response, b'class="catalog-item catalog-item--compact'))
 
             if not catalog:
                 return [api.CInterval(self.name, 500), api.MAlert('Script go to sleep (Empty Catalog)', self.name)]
 
             for element in catalog:
 
-                parts_of_name = element.xpath('div[@class="catalog-item__title"]/div')
+                parts_of_name = item_title(element)
                 name = f'{parts_of_name[0].text} {parts_of_name[1].text.split("] ")[-1]}'
 
-                if self.kw.check(name.lower()):
+                if keywords.check(self, name.lower()):
                     id = int(element.get('href').split('/')[3].split('_')[0])
                     try:
                         if HashStorage.check_target(
@@ -91,18 +99,12 @@ class Parser(api.Parser):
                             additional_columns = {'Site': '[ITKKit](https://www.itkkit.ru)',
                                                   'Type': 'Restock'}
 
-                        sizes_data = element.xpath('div[@class="catalog-item__img-wrapper"]'
-                                                   '/div[@class="catalog-item__img-hover"]/div')[0].text
+                        sizes_data = item_sizes(element)[0].text
 
-                        image = 'https://www.itkkit.ru' + \
-                                element.xpath('div[@class="catalog-item__img-wrapper"]'
-                                              '/div[@class="catalog-item__img-list"]'
-                                              '/div[@class="catalog-item__img catalog-item__img--active "]'
-                                              '/picture/img')[0].get('data-src')
+                        image = 'https://www.itkkit.ru' + item_image(element)[0].get('data-src')
 
                         price = api.Price(api.CURRENCIES['EUR'],
-                                          float(element.xpath('div[@class="catalog-item__price"]/div/div'
-                                                              '/span/span')[0].text.replace(' ', '')
+                                          float(item_price(element)[0].text.replace(' ', '')
                                                 .replace('\t', '').replace('\n', '').split('.')[0]))
 
                         if 'Sold' in sizes_data:
@@ -0,0 +1,185 @@
+"""
+Compiled absolute / positive / negative keyword matching (Aho-Corasick)
+"""
+
+import os
+import threading
+from collections import deque
+from functools import lru_cache
+from time import monotonic
+from typing import Dict, FrozenSet, Iterable, List, NamedTuple, Sequence, Set, Tuple, Union
+
+import yaml
+
+ABSOLUTE: int = 0
+POSITIVE: int = 1
+NEGATIVE: int = 2
+
+
+class Hits(NamedTuple):
+    absolute: FrozenSet[str]
+    positive: FrozenSet[str]
+    negative: FrozenSet[str]
+
+
+class Automaton:
+    goto: List[Dict[str, int]]
+    fail: List[int]
+    out: List[FrozenSet[int]]
+    empty: FrozenSet[int]
+
+    def __init__(self, terms: Sequence[str]):
+        self.goto = [{}]
+        self.fail = [0]
+        out: List[Set[int]] = [set()]
+
+        for index, term in enumerate(terms):
+            node = 0
+            for char in term:
+                child = self.goto[node].get(char)
+                if child is None:
+                    child = len(self.goto)
+                    self.goto[node][char] = child
+                    self.goto.append({})
+                    self.fail.append(0)
+                    out.append(set())
+                node = child
+            out[node].add(index)
+
+        queue = deque(self.goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for char, child in self.goto[node].items():
+                queue.append(child)
+                state = self.fail[node]
+                while state and char not in self.goto[state]:
+                    state = self.fail[state]
+                if node:
+                    self.fail[child] = self.goto[state].get(char, 0)
+                out[child] |= out[self.fail[child]]
+
+        self.empty = frozenset(out[0])
+        self.out = [frozenset(i) for i in out]
+
+    def scan(self, text: str) -> Set[int]:
+        goto, fail, out = self.goto, self.fail, self.out
+        found = set(self.empty)
+        node = 0
+        for char in text:
+            while node and char not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(char, 0)
+            if out[node]:
+                found |= out[node]
+        return found
+
+
+class Matcher:
+    terms: Tuple[str, ...]
+    kinds: Tuple[int, ...]
+    automaton: Automaton
+
+    def __init__(self, absolute: Iterable[str], positive: Iterable[str], negative: Iterable[str]):
+        terms: List[str] = []
+        kinds: List[int] = []
+        for kind, group in ((ABSOLUTE, absolute), (POSITIVE, positive), (NEGATIVE, negative)):
+            for term in group:
+                terms.append(str(term))
+                kinds.append(kind)
+
+        self.terms = tuple(terms)
+        self.kinds = tuple(kinds)
+        self.automaton = Automaton(self.terms)
+
+    def hits(self, text: str) -> Hits:
+        groups: Tuple[Set[str], Set[str], Set[str]] = (set(), set(), set())
+        for index in self.automaton.scan(text):
+            groups[self.kinds[index]].add(self.terms[index])
+        return Hits(*(frozenset(i) for i in groups))
+
+    def check(self, text: str) -> bool:
+        kinds = {self.kinds[i] for i in self.automaton.scan(text)}
+        if ABSOLUTE in kinds:
+            return True
+        elif NEGATIVE in kinds:
+            return False
+        else:
+            return POSITIVE in kinds
+
+
+@lru_cache(maxsize=16)
+def build(absolute: Tuple[str, ...], positive: Tuple[str, ...], negative: Tuple[str, ...]) -> Matcher:
+    return Matcher(absolute, positive, negative)
+
+
+def load(path: str) -> Matcher:
+    with open(path) as file:
+        raw = yaml.safe_load(file)
+
+    if isinstance(raw, dict):
+        if 'absolute' in raw and isinstance(raw['absolute'], list) \
+                and 'positive' in raw and isinstance(raw['positive'], list) \
+                and 'negative' in raw and isinstance(raw['negative'], list):
+            return build(tuple(raw['absolute']), tuple(raw['positive']), tuple(raw['negative']))
+        else:
+            raise TypeError('Keywords must be list')
+    else:
+        raise TypeError('Types of keywords must be in dict')
+
+
+class Registry:
+    path: str
+    interval: float
+    lock: threading.Lock
+    matcher: Union[Matcher, None]
+    mtime: int
+    checked: float
+
+    def __init__(self, path: str, interval: float = 1.):
+        self.path = path
+        self.interval = interval
+        self.lock = threading.Lock()
+        self.matcher = None
+        self.mtime = 0
+        self.checked = -interval
+
+    def current(self, log=None) -> Union[Matcher, None]:
+        if monotonic() - self.checked >= self.interval and self.lock.acquire(blocking=False):
+            try:
+                self.checked = monotonic()
+                self.reload(log)
+            finally:
+                self.lock.release()
+        return self.matcher
+
+    def reload(self, log=None) -> None:
+        try:
+            mtime = os.stat(self.path).st_mtime_ns
+        except OSError:
+            self.matcher, self.mtime = None, 0
+            return
+
+        if mtime == self.mtime:
+            return
+
+        try:
+            matcher = load(self.path)
+        except (OSError, yaml.YAMLError, TypeError) as e:
+            if log:
+                log.error(f'{e.__class__.__name__} ({e.__str__()}) while loading {os.path.basename(self.path)}, '
+                          f'keeping {"previous" if self.matcher else "script"} keywords')
+            return
+        finally:
+            self.mtime = mtime
+
+        self.matcher = matcher
+
+
+registry: Registry = Registry(os.path.join(os.path.dirname(os.path.abspath(__file__)), 'keywords.yaml'))
+
+
+def check(parser, text: str, div: str = '') -> bool:
+    matcher = registry.current(parser.log)
+    if matcher is None:
+        return parser.kw.check(text, div) if div else parser.kw.check(text)
+    return matcher.check((text.replace(div, ' ') if div else text).lower())
@@ -4,6 +4,9 @@ import yaml
 from lxml import etree
 from user_agent import generate_user_agent
 
+from scripts import keywords
+from scripts.fingerprints import Fingerprints
+from scripts.markup import document
 from source import api
 from source import logger
 from source.api import CatalogType, TargetType, RestockTargetType, ItemType, TargetEndType, IRelease, FooterItem, \
@@ -12,12 +15,23 @@ from source.cache import HashStorage
 from source.library import SubProvider, Keywords
 from source.tools import ScriptStorage
 
+og_title = etree.XPath('//meta[@property="og:title"]')
+og_image = etree.XPath('//meta[@property="og:image"]')
+product_sizes = etree.XPath('//div[@class="ii-select__column ii-select__column_native"]/div')
+
+catalog_items = etree.XPath('//div[@class="products-list-item" or @class="products-list-item m_loading"]')
+item_link = etree.XPath('a[@class="products-list-item__link link"]')
+item_brand = etree.XPath('a[@class="products-list-item__link link"]/div[@class="products-list-item__brand"]/span')
+item_price = etree.XPath('a[@class="products-list-item__link link"]/div')
+item_sizes = etree.XPath('div[@class="products-list-item__extra"]/div/div[@class="products-list-item__sizes"]/a')
+
 
 class Parser(api.Parser):
     def __init__(self, name: str, log: logger.Logger, provider_: SubProvider, storage: ScriptStorage, kw: Keywords):
         super().__init__(name, log, provider_, storage, kw)
         self.interval: int = 1
         self.user_agent = generate_user_agent()
+        self.fingerprints = Fingerprints()
         if self.storage.check('secret.yaml'):
             raw = yaml.safe_load(self.storage.file('secret.yaml'))
             if isinstance(raw, dict):
@@ -68,14 +82,14 @@ class Parser(api.Parser):
                     if not ok:
                         return [api.MAlert('Timeout: ' + content.name, self.name), content]
 
-                    html_response = etree.HTML(response.text)
+                    html_response = document(response)
                     link = content.data[0]
-                    name = html_response.xpath('//meta[@property="og:title"]')[0].get('content')
+                    name = og_title(html_response)[0].get('content')
                     price = api.Price(api.CURRENCIES['RUB'], .0)
 
-                    image = html_response.xpath('//meta[@property="og:image"]')[0].get('content')
+                    image = og_image(html_response)[0].get('content')
                     raw_sizes = []
-                    for size in html_response.xpath('//div[@class="ii-select__column ii-select__column_native"]/div'):
+                    for size in product_sizes(html_response):
                         if 'disabled' in size.get('class'):
                             continue
                         if 'last' in size.get('class'):
@@ -129,17 +143,21 @@ class Parser(api.Parser):
                     if not ok:
                         return [api.MAlert('Timeout: ' + content.name, self.name), content]
 
-                    html_response = etree.HTML(response.text)
+                    html_response = document(response, b'class="products-list-item')
+
+                    for element in catalog_items(html_response):
+                        link = 'https://www.lamoda.ru' + item_link(element)[0].get('href')
+
+                        name = item_brand(element)[0].text
 
-                    for element in html_response.xpath(
-                            '//div[@class="products-list-item" or @class="products-list-item m_loading"]'):
-                        link = 'https://www.lamoda.ru' + element.xpath('a[@class="products-list-item__link link"]') \
-                            [0].get('href')
+                        if keywords.check(self, name.lower() + ' ' + link):
+                            raw_price = item_price(element)[0].get('data-price')
+                            size_links = [(size.text, size.get('data-link')) for size in item_sizes(element)]
 
-                        name = element.xpath('a[@class="products-list-item__link link"]'
-                                             '/div[@class="products-list-item__brand"]/span')[0].text
+                            fingerprint = self.fingerprints.check(link, raw_price, size_links)
+                            if fingerprint is None:
+                                continue
 
-                        if self.kw.check(name.lower() + ' ' + link):
                             target = api.Target(link, self.name, 0)
 
                             if HashStorage.check_target(target.hash()):
@@ -148,16 +166,12 @@ class Parser(api.Parser):
                             else:
                                 additional_columns = {'Site': '[Lamoda](https://www.lamoda.ru)', 'Type': 'Restock'}
                             try:
-                                price = api.Price(api.CURRENCIES['RUB'],
-                                                  float(
-                                                      element.xpath('a[@class="products-list-item__link link"]/div')[0]
-                                                      .get('data-price')))
+                                price = api.Price(api.CURRENCIES['RUB'], float(raw_price))
                             except TypeError:
                                 price = api.Price(api.CURRENCIES['RUB'], .0)
                             image = 'https:' + element.get('data-src')
-                            raw_sizes = [api.Size(size.text, f'https://www.lamoda.ru{size.get("data-link")}')
-                                         for size in element.xpath(f'div[@class="products-list-item__extra"]'
-                                                                   f'/div/div[@class="products-list-item__sizes"]/a')]
+                            raw_sizes = [api.Size(text, f'https://www.lamoda.ru{data_link}')
+                                         for text, data_link in size_links]
 
                             sizes = api.Sizes(api.SIZE_TYPES[''], raw_sizes)
                             if raw_sizes:
@@ -194,6 +208,7 @@ class Parser(api.Parser):
                                         additional_columns
                                     )
                                 )
+                            self.fingerprints.add(link, fingerprint)
                 except Exception:
                     result.append(api.MAlert('Script is crashed!', self.name))
                     pass
@@ -0,0 +1,69 @@
+"""
+HTML parsing from raw response bytes with shared parsers, optionally limited to the product listing
+"""
+
+import codecs
+from functools import lru_cache
+from typing import Optional, Union
+
+from lxml import etree
+
+
+@lru_cache(maxsize=None)
+def parser(encoding: Optional[str] = None) -> etree.HTMLParser:
+    return etree.HTMLParser(encoding=encoding, remove_blank_text=True, no_network=True)
+
+
+def normalize(value: Union[str, bytes]) -> Optional[str]:
+    if isinstance(value, bytes):
+        value = value.decode('ascii', 'ignore')
+    value = value.strip('"\' ').lower()
+    if not value:
+        return None
+    try:
+        return codecs.lookup(value).name
+    except LookupError:
+        return None
+
+
+def charset(response) -> Optional[str]:
+    for param in response.headers.get('Content-Type', '').split(';')[1:]:
+        key, _, value = param.strip().partition('=')
+        if key.lower() == 'charset':
+            return normalize(value)
+    return None
+
+
+def declared(head: bytes) -> Optional[str]:
+    index = head.lower().find(b'charset=')
+    if index < 0:
+        return None
+    value = head[index + 8:index + 48].lstrip(b'"\' ')
+    for stop in (b'"', b"'", b' ', b';', b'/', b'>'):
+        value = value.split(stop, 1)[0]
+    return normalize(value)
+
+
+def fallback(response) -> str:
+    encoding = normalize(getattr(response, 'encoding', None) or '')
+    return encoding if encoding and encoding != 'iso8859-1' else 'utf-8'
+
+
+def listing(data: Union[str, bytes], marker: Union[str, bytes], encoding: Optional[str] = None,
+            default: str = 'utf-8') -> etree._Element:
+    if isinstance(data, bytes) and not encoding:
+        encoding = declared(data[:4096]) or default
+
+    index = data.find(marker)
+    if index > 0:
+        start = data.rfind(b'<' if isinstance(data, bytes) else '<', 0, index)
+        if start > 0:
+            data = data[start:]
+    return etree.HTML(data, parser(encoding if isinstance(data, bytes) else None))
+
+
+def document(response, marker: Optional[bytes] = None) -> etree._Element:
+    encoding = charset(response) or declared(response.content[:4096]) or fallback(response)
+    if marker:
+        return listing(response.content, marker, encoding)
+    return etree.HTML(response.content, parser(encoding))
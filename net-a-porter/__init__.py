@@ -6,6 +6,8 @@ from typing import List, Union
 from pycurl_requests import exceptions
 from ujson import loads
 
+from scripts import keywords
+from scripts.conditional import Validators
 from source import api
 from source import logger
 from source.api import CatalogType, TargetType, IRelease, RestockTargetType, ItemType, TargetEndType, \
@@ -26,6 +28,7 @@ class Parser(api.Parser):
             'user-agent': 'mobile-nap-netaporter/8.5.2 (iPhone; iOS 14.0.1; Scale/2.0)',
             'accept-language': 'ru'
         }
+        self.validators = Validators()
 
     @property
     def catalog(self) -> CatalogType:
@@ -45,7 +48,7 @@ class Parser(api.Parser):
 
         if mode == 0:
             result.append(content)
-            ok, resp = self.provider.request(self.link, headers=self.headers)
+            ok, resp = self.provider.request(self.link, headers=self.validators.headers(self.link, self.headers))
 
             if not ok:
 
@@ -55,8 +58,17 @@ class Parser(api.Parser):
                 else:
                     raise resp
 
-            for c in loads(resp.text)['summaries']:
-                if self.kw.check(c['name'].lower()):
+            if self.validators.modified(self.link, resp):
+                try:
+                    summaries = loads(resp.content)['summaries']
+                except (ValueError, KeyError):
+                    self.validators.reset(self.link)
+                    raise
+            else:
+                summaries = []
+
+            for c in summaries:
+                if keywords.check(self, c['name'].lower()):
                     result.append(
                         api.TScheduled(
                             str(c['id']),
@@ -3,6 +3,8 @@ from typing import List, Union
 
 from lxml import etree
 
+from scripts import keywords
+from scripts.markup import document
 from source import api
 from source import logger
 from source.api import CatalogType, TargetType, RestockTargetType, ItemType, TargetEndType, IRelease, TScheduled
@@ -20,6 +22,17 @@ LINKS = {
     "dunk": "https://up-and-run.ru/catalog/?PAGEN_1=1&q=dunk&searchFilter_57_1536390870=Y&searchFilter_P3_MIN=&searchFilter_P3_MAX=&set_filter=Y&AJAX_PAGE=Y"
 }
 
+catalog_items = etree.XPath('//div[@class="container" or @class="container w1024"]')
+item_name = etree.XPath('div/a/div[@class="name"]')
+item_link = etree.XPath('div/a')
+item_color = etree.XPath('div/a/div[@class="img"]/div[@class="carousel"]/div/div/div/img')
+item_new_price = etree.XPath('div/a/div[@class="price"]/span[@class="new_price"]')
+item_old_price = etree.XPath('div/a/div[@class="price"]/span[@class="old_price"]')
+item_price = etree.XPath('div/a/div[@class="price"]')
+item_image = etree.XPath('div/a/div[@class="img"]/img')
+stock_sizes = etree.XPath('//div[@class="form__item __right"]/select')
+stock_shops = etree.XPath('option')
+
 
 class Parser(api.Parser):
     def __init__(self, name: str, log: logger.Logger, provider_: SubProvider, storage: ScriptStorage, kw: Keywords):
@@ -55,30 +68,26 @@ class Parser(api.Parser):
             if content.name.split(' ')[-1] == 'catalog':
                 ok, response = self.provider.request(LINKS[content.name.split(' ')[0]], headers=self.headers)
 
-                lxml = etree.HTML(response.text)
-                catalog = lxml.xpath('//div[@class="container" or @class="container w1024"]')
+                lxml = document(response)
+                catalog = catalog_items(lxml)
 
                 for item in catalog:
-                    name = item.xpath('div/a/div[@class="name"]')[0].text
-                    if self.kw.check(name.lower()):
-                        link = 'https://up-and-run.ru' + item.xpath('div/a')[0].get('href')
+                    name = item_name(item)[0].text
+                    if keywords.check(self, name.lower()):
+                        link = 'https://up-and-run.ru' + item_link(item)[0].get('href')
 
                         pid = link.split('/')
                         pid = pid[len(pid) - 2]
 
-                        color_id = item.xpath('div/a/div[@class="img"]'
-                                              '/div[@class="carousel"]/div/div/div/img')[0].get('data-link')
+                        color_id = item_color(item)[0].get('data-link')
                         try:
-                            price = api.Price(api.CURRENCIES[''], float(item.xpath('div/a/div[@class="price"]'
-                                                                                   '/span[@class="new_price"]')[0]
-                                                                        .text.replace(' ', '')),
-                                              float(item.xpath('div/a/div[@class="price"]/span[@class="old_price"]')
-                                                    [0].text.replace(' ', '')))
+                            price = api.Price(api.CURRENCIES[''],
+                                              float(item_new_price(item)[0].text.replace(' ', '')),
+                                              float(item_old_price(item)[0].text.replace(' ', '')))
                         except IndexError:
-                            price = api.Price(api.CURRENCIES[''], float(item.xpath('div/a/div[@class="price"]')[0]
-                                                                        .text.replace(' ', '')))
+                            price = api.Price(api.CURRENCIES[''], float(item_price(item)[0].text.replace(' ', '')))
 
-                        image = 'https://up-and-run.ru' + item.xpath('div/a/div[@class="img"]/img')[0].get('src')
+                        image = 'https://up-and-run.ru' + item_image(item)[0].get('src')
                         result.append(api.TScheduled(name, self.name, [link, pid, color_id, price, image], time.time()))
                 result.append(content)
             else:
@@ -87,12 +96,12 @@ class Parser(api.Parser):
                                                      .replace('COLOR_ID', content.data[2]),
                                                      headers=self.headers
                                                      )
-                lxml_data = etree.HTML(response.text)
+                lxml_data = document(response)
 
                 raw_sizes = []
-                for size in lxml_data.xpath('//div[@class="form__item __right"]/select'):
+                for size in stock_sizes(lxml_data):
                     shops = ''
-                    for shop in size.xpath('option'):
+                    for shop in stock_shops(size):
                         if shop.text != 'Не выбран':
                             shops += f"{shop.text} [{shop.get('data-merch-count')}]\n"
                     raw_sizes.append(api.Size(f"**{size.get('id').replace('_', '.')}**\n{shops}"))
@@ -0,0 +1,114 @@
+"""
+Persistent priority queue (SQLite WAL) for outbound notifications
+"""
+
+import sqlite3
+import threading
+from typing import Dict, List, Set, Tuple
+
+from ujson import dumps, loads
+
+
+class Outbox:
+    db: sqlite3.Connection
+    lock: threading.Condition
+
+    buffer: List[Tuple[int, str]]
+    updates: Dict[int, Tuple[int, str]]
+    acked: List[int]
+    taken: Set[int]
+    unfinished: int
+    released: bool
+
+    def __init__(self, path: str):
+        self.db = sqlite3.connect(path, 1, check_same_thread=False)
+        self.db.execute('pragma journal_mode=wal')
+        self.db.execute('pragma synchronous=normal')
+        with self.db as c:
+            c.execute('create table if not exists messages (id integer primary key autoincrement,'
+                      'priority integer not null, body blob not null)')
+            self.unfinished = c.execute('select count(*) from messages').fetchone()[0]
+
+        self.lock = threading.Condition(threading.Lock())
+        self.buffer = []
+        self.updates = {}
+        self.acked = []
+        self.taken = set()
+        self.released = False
+
+    def put(self, priority: int, record: dict) -> None:
+        body = dumps(record, ensure_ascii=False)
+        with self.lock:
+            self.buffer.append((priority, body))
+            self.unfinished += 1
+
+    def retry(self, key: int, priority: int, record: dict) -> None:
+        body = dumps(record, ensure_ascii=False)
+        with self.lock:
+            self.updates[key] = (priority, body)
+
+    def done(self, key: int) -> None:
+        with self.lock:
+            self.acked.append(key)
+
+    def flush(self) -> None:
+        with self.lock:
+            buffer, self.buffer = self.buffer, []
+            updates, self.updates = self.updates, {}
+            acked, self.acked = self.acked, []
+
+        if buffer or updates or acked:
+            with self.db as c:
+                c.executemany('insert into messages values (null, ?, ?)', buffer)
+                c.executemany('update messages set priority = ?, body = ? where id = ?',
+                              [(*v, k) for k, v in updates.items()])
+                c.executemany('delete from messages where id = ?', [(i,) for i in acked])
+
+        if updates or acked:
+            with self.lock:
+                self.taken.difference_update(updates)
+                self.taken.difference_update(acked)
+                self.unfinished -= len(acked)
+                self.lock.notify_all()
+
+    def get(self, count: int) -> List[Tuple[int, int, dict]]:
+        self.flush()
+        if count <= 0:
+            return []
+
+        with self.lock:
+            taken = self.taken.copy()
+
+        result = []
+        for key, priority, body in self.db.execute('select id, priority, body from messages '
+                                                   'order by priority, id limit ?', (count + len(taken),)):
+            if key in taken:
+                continue
+            try:
+                record = loads(body)
+            except (ValueError, TypeError):
+                record = None
+            if not isinstance(record, dict):
+                self.done(key)
+                continue
+            result.append((key, priority, record))
+            if len(result) == count:
+                break
+
+        with self.lock:
+            self.taken.update(i for i, _, _ in result)
+        return result
+
+    def join(self) -> None:
+        with self.lock:
+            while self.unfinished > 0 and not self.released:
+                self.lock.wait()
+
+    def release(self) -> None:
+        with self.lock:
+            self.released = True
+            self.lock.notify_all()
+
+    def close(self) -> None:
+        self.flush()
+        self.db.close()
@@ -0,0 +1,77 @@
+"""
+Compiled JSONPath expressions with direct dict/list access for simple paths
+"""
+
+import re
+from functools import lru_cache
+from typing import Any, Callable, Iterator, List, Tuple, Union
+
+Step = Union[str, int, None]
+
+_step = re.compile(r"\.([A-Za-z_][\w-]*)|\.\*|\[\*]|\['([^']*)']|\[(\d+)]")
+
+
+def _lower(expression: str) -> Union[Tuple[Step, ...], None]:
+    if not expression.startswith('$'):
+        return None
+
+    steps: List[Step] = []
+    position = 1
+    while position < len(expression):
+        match = _step.match(expression, position)
+        if not match:
+            return None
+        name, quoted, index = match.groups()
+        if name is not None:
+            steps.append(name)
+        elif quoted is not None:
+            steps.append(quoted)
+        elif index is not None:
+            steps.append(int(index))
+        else:
+            steps.append(None)
+        position = match.end()
+    return tuple(steps)
+
+
+def _walk(steps: Tuple[Step, ...], value: Any) -> Iterator[Any]:
+    if not steps:
+        yield value
+        return
+
+    step, rest = steps[0], steps[1:]
+    if step is None:
+        if isinstance(value, dict):
+            children = value.values()
+        elif isinstance(value, list):
+            children = value
+        else:
+            return
+        if rest:
+            for i in children:
+                yield from _walk(rest, i)
+        else:
+            yield from children
+    elif isinstance(step, int):
+        if isinstance(value, list) and step < len(value):
+            yield from _walk(rest, value[step])
+    elif isinstance(value, dict) and step in value:
+        yield from _walk(rest, value[step])
+
+
+@lru_cache(maxsize=None)
+def parse_path(expression: str) -> Callable[[Any], Iterator[Any]]:
+    steps = _lower(expression)
+
+    if steps is not None:
+        def match(value: Any) -> Iterator[Any]:
+            return _walk(steps, value)
+    else:
+        from jsonpath2 import Path
+
+        path = Path.parse_str(expression)
+
+        def match(value: Any) -> Iterator[Any]:
+            return (i.current_value for i in path.match(value))
+
+    return match
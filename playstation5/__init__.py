@@ -3,6 +3,8 @@ from typing import Union, List
 from pycurl_requests import exceptions
 from ujson import loads
 
+from scripts import schedule
+from scripts.conditional import Validators
 from source import api
 from source import logger
 from source.api import CatalogType, TargetType, RestockTargetType, ItemType, TargetEndType, IRelease
@@ -24,10 +26,12 @@ class Parser(api.Parser):
             'Upgrade-Insecure-Requests': '1',
             'User-Agent': 'Mozilla/5.0 (X11; Ubuntu; Linux x86_64; rv:71.0) Gecko/20100101 Firefox/71.0'
         }
+        self.validators = Validators()
+        self.schedule = schedule.Adaptive(5., 60.)
 
     @property
     def catalog(self) -> api.CatalogType:
-        return api.CInterval(self.name, 5)
+        return api.CInterval(self.name, self.schedule.interval())
 
     def execute(
             self,
@@ -36,7 +40,7 @@ class Parser(api.Parser):
     ) -> List[Union[CatalogType, TargetType, RestockTargetType, ItemType, TargetEndType]]:
         result = []
         if mode == 0:
-            ok, response = self.provider.request(self.link, headers=self.headers)
+            ok, response = self.provider.request(self.link, headers=self.validators.headers(self.link, self.headers))
 
             if not ok:
                 if isinstance(response, exceptions.Timeout):
@@ -44,7 +48,15 @@ class Parser(api.Parser):
                 else:
                     raise response
 
-            json_data = loads(response.text)
+            if not self.validators.modified(self.link, response):
+                self.schedule.observe(False)
+                return [api.CInterval(self.name, self.schedule.interval())]
+
+            try:
+                json_data = loads(response.content)
+            except ValueError:
+                self.validators.reset(self.link)
+                raise
 
             catalog = [element for element in json_data['data']['shops'].values()]
             if not catalog:
@@ -95,6 +107,10 @@ class Parser(api.Parser):
                 except TypeError:
                     continue
 
+            self.schedule.observe(bool(result))
+            result.append(api.CInterval(self.name, self.schedule.interval()))
+            return result
+
         result.append(content)
         return result
 
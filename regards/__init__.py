@@ -1,8 +1,8 @@
 from datetime import datetime, timedelta, timezone
 from typing import List, Union
 
-from lxml import etree
 
+from scripts.markup import document
 from source import api
 from source import logger
 from source.api import CatalogType, TargetType, RestockTargetType, ItemType, TargetEndType, IRelease, FooterItem
@@ -47,8 +47,8 @@ class Parser(api.Parser):
             if not ok:
                 return [api.CInterval(self.name, 60.), api.MAlert('Script go to sleep', self.name)]
             try:
-                catalog = [element for element in etree.HTML(response.content).xpath('//div[@class="content"]'
-                                                                                  '/div[@class="block"]/div')]
+                catalog = [element for element in document(response).xpath('//div[@class="content"]'
+                                                                                '/div[@class="block"]/div')]
             except AttributeError:
                 return [api.CInterval(self.name, 60.), api.MAlert('Script go to sleep', self.name)]
             if not catalog:
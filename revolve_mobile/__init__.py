@@ -9,6 +9,7 @@ from pycurl_requests import exceptions
 from ujson import loads
 from user_agent import generate_user_agent
 
+from scripts import keywords
 from source import api
 from source import logger
 from source.api import CatalogType, TargetType, RestockTargetType, ItemType, TargetEndType, IRelease, FooterItem, \
@@ -63,7 +64,7 @@ class Parser(api.Parser):
             for item in json_response['results']:
                 title = item['title']
                 id = item['_id']
-                if self.kw.check(title.lower() + ' ' + id.lower()):
+                if keywords.check(self, title.lower() + ' ' + id.lower()):
 
                     result.append(
                         api.TScheduled(id, self.name, [item['custom_data']['isPreorder']], time())
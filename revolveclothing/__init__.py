@@ -5,6 +5,8 @@ from typing import List, Union
 
 from lxml import etree
 
+from scripts import keywords
+from scripts.markup import document
 from source import api
 from source import logger
 from source.api import CatalogType, TargetType, RestockTargetType, ItemType, \
@@ -49,7 +51,7 @@ class Parser(api.Parser):
             if not ok:
                 return [content, api.MAlert('Connection is lost, Script go to sleep!', self.name)]
 
-            catalog = etree.HTML(response.text).xpath(
+            catalog = document(response).xpath(
                 '//div[@class="plp_image_wrap u-center"]/a')
 
             if len(catalog) == 0:
@@ -62,7 +64,7 @@ class Parser(api.Parser):
                 link_to_request = f'https://www.revolveclothing.ru/r/dialog/QuickView.jsp?fmt=plp&code={href.split("/")[3]}&callBackAfterAddToBag='
                 price = float(re.sub("[^0-9]", "", element.xpath('div/div[@class="price js-plp-prices-div"]/span')[0].text))
 
-                if self.kw.check(name + ' ' + href.split('?')[0]):
+                if keywords.check(self, name + ' ' + href.split('?')[0]):
                     result.append(result.append(api.TScheduled(href.split("/")[3], self.name, [link_to_request, href, name, price], time())))
         if mode == 1:
 
@@ -74,7 +76,7 @@ class Parser(api.Parser):
                 if not ok:
                     return [api.MAlert('Connection is lost', self.name)]
 
-                page_content = etree.HTML(page_response.text)
+                page_content = document(page_response)
                 try:
                     sizes = [api.Size(f"{size.get('value')} [{size.get('data-qty')}]")
                              for size in page_content.xpath('//input[@class="size-options__radio '
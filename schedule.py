@@ -0,0 +1,121 @@
+"""
+Adaptive polling cadence from the observed change rate, learned busy hours and known release windows
+"""
+
+import threading
+from dataclasses import dataclass
+from time import time
+from typing import List, Tuple
+
+hour: int = 3600
+day: int = 24 * hour
+week: int = 7 * day
+
+
+def position(timestamp: float) -> float:
+    # The epoch fell on a Thursday, shift so that zero is Monday 00:00 UTC
+    return (timestamp + 3 * day) % week
+
+
+@dataclass(frozen=True)
+class Window:
+    weekday: int
+    hour: int
+    minute: int = 0
+    before: float = 600.
+    after: float = 1800.
+
+    def __post_init__(self):
+        if not 0 <= self.weekday < 7:
+            raise ValueError('weekday must be in [0, 7)')
+        if not 0 <= self.hour < 24:
+            raise ValueError('hour must be in [0, 24)')
+        if not 0 <= self.minute < 60:
+            raise ValueError('minute must be in [0, 60)')
+        if self.before < 0 or self.after < 0 or self.before + self.after >= week:
+            raise ValueError('before and after must be non-negative and shorter than a week together')
+
+    @property
+    def offset(self) -> int:
+        return self.weekday * day + self.hour * hour + self.minute * 60
+
+    def remaining(self, now: float = None) -> float:
+        now = time() if now is None else now
+        delta = (self.offset - position(now)) % week
+        if delta <= self.before or week - delta <= self.after:
+            return 0.
+        return delta - self.before
+
+
+class Adaptive:
+    lock: threading.Lock
+    minimum: float
+    maximum: float
+    windows: Tuple[Window, ...]
+    share: float
+    alpha: float
+    decay: float
+    busy: float
+    gap: float
+    last: float
+    hours: List[float]
+
+    def __init__(
+            self,
+            minimum: float,
+            maximum: float,
+            windows: Tuple[Window, ...] = (),
+            share: float = .1,
+            alpha: float = .2,
+            decay: float = .98,
+            busy: float = 4.
+    ):
+        if not 0 < minimum <= maximum:
+            raise ValueError('minimum must be positive and not greater than maximum')
+        if not 0 < share <= 1 or not 0 < alpha <= 1 or not 0 < decay <= 1:
+            raise ValueError('share, alpha and decay must be in (0, 1]')
+
+        self.lock = threading.Lock()
+        self.minimum = minimum
+        self.maximum = maximum
+        self.windows = windows
+        self.share = share
+        self.alpha = alpha
+        self.decay = decay
+        self.busy = busy
+        self.gap = minimum / share
+        self.last = time()
+        self.hours = [0.] * (week // hour)
+
+    def observe(self, changed: bool, now: float = None) -> None:
+        if not changed:
+            return
+
+        now = time() if now is None else now
+        with self.lock:
+            self.gap += self.alpha * (max(now - self.last, 0.) - self.gap)
+            self.last = now
+            self.hours = [i * self.decay for i in self.hours]
+            self.hours[int(position(now) // hour)] += 1.
+
+    def hot(self, timestamp: float) -> bool:
+        count = self.hours[int(position(timestamp) // hour)]
+        return count >= 1. and count * len(self.hours) >= self.busy * sum(self.hours)
+
+    def interval(self, now: float = None) -> float:
+        now = time() if now is None else now
+        with self.lock:
+            if self.hot(now):
+                return self.minimum
+
+            value = min(max(self.share * max(self.gap, now - self.last), self.minimum), self.maximum)
+            if self.hot(now + value):
+                value = max(hour - position(now) % hour, self.minimum)
+
+        for i in self.windows:
+            value = min(value, max(i.remaining(now), self.minimum))
+        return value
+
+    def due(self, now: float = None) -> float:
+        now = time() if now is None else now
+        return now + self.interval(now)
@@ -0,0 +1,267 @@
+"""
+Shared products.json monitor for Shopify based stores
+"""
+
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from time import time
+from typing import Callable, List, Union, Tuple, Dict
+
+from pycurl_requests import exceptions
+from ujson import loads
+from user_agent import generate_user_agent
+
+from scripts import keywords, schedule
+from scripts.conditional import Validators
+from scripts.fingerprints import Fingerprints
+from source import api
+from source import logger
+from source.api import CatalogType, TargetType, RestockTargetType, ItemType, TargetEndType, IRelease, FooterItem, \
+    IAnnounce
+from source.cache import HashStorage
+from source.library import SubProvider, Keywords
+from source.tools import LinearSmart, ScriptStorage
+
+placeholder: str = 'http://via.placeholder.com/300/2A2A2A/FFF?text=No+image'
+
+
+@dataclass
+class Shop:
+    domain: str
+    site: str
+    channel: str = 'shopify-filtered'
+    currency: str = 'USD'
+    size_key: str = 'option1'
+    size_suffix: str = ' US'
+    footer: Tuple[Tuple[str, str], ...] = ()
+    columns: Dict[str, str] = field(default_factory=dict)
+    details: str = ''
+    stale: float = 90.
+    filtered: bool = True
+    restocks: bool = True
+    announces: bool = True
+    stockx: bool = True
+    limit: int = 100
+    offset: float = 0.
+    smart: Tuple[int, int] = (12, 5)
+    quiet: float = 300.
+    windows: Tuple[schedule.Window, ...] = ()
+
+    def __post_init__(self):
+        if not isinstance(self.domain, str):
+            raise TypeError('domain must be str')
+        if not isinstance(self.site, str):
+            raise TypeError('site must be str')
+        if self.currency not in api.CURRENCIES:
+            raise ValueError(f'unknown currency: {self.currency}')
+        if self.details not in ('', '.js', '/count.json'):
+            raise ValueError('details must be "", ".js" or "/count.json"')
+        if self.stale < 0:
+            raise ValueError('stale must be non-negative')
+        if not 0 <= self.offset < 60:
+            raise ValueError('offset must be in [0, 60)')
+        if self.quiet < 60:
+            raise ValueError('quiet must be at least 60')
+        if not self.footer:
+            self.footer = (('Cart', self.domain + '/cart'), ('Login', self.domain + '/account'))
+
+
+class Parser(api.Parser):
+    shop: Shop
+
+    def __init__(self, name: str, log: logger.Logger, provider_: SubProvider, storage: ScriptStorage, kw: Keywords):
+        super().__init__(name, log, provider_, storage, kw)
+        self.link: str = f'{self.shop.domain}/products.json?limit={self.shop.limit}'
+        self.prefix: str = self.shop.domain + '/products/'
+        self.cart: str = self.shop.domain + '/cart/'
+        self.footer: List[FooterItem] = [FooterItem(k, v) for k, v in self.shop.footer]
+        self.validators: Validators = Validators()
+        self.fingerprints: Fingerprints = Fingerprints()
+        self.schedule: schedule.Adaptive = schedule.Adaptive(60., self.shop.quiet, self.shop.windows)
+
+    @property
+    def catalog(self) -> CatalogType:
+        return api.CSmart(self.name, LinearSmart(self.time_gen(self.schedule.due(), self.shop.offset),
+                                                 *self.shop.smart))
+
+    @staticmethod
+    def time_gen(due: float = 0., offset: float = 0.) -> float:
+        return datetime.fromtimestamp(due or time() + 60., timezone.utc) \
+            .replace(second=0, microsecond=0).timestamp() + offset
+
+    def label(self, variant: dict) -> str:
+        return str(variant[self.shop.size_key]) + self.shop.size_suffix
+
+    def links(self, title: str) -> List[FooterItem]:
+        if self.shop.stockx:
+            return [FooterItem('StockX', 'https://stockx.com/search/sneakers?s=' + title.replace(' ', '%20')),
+                    *self.footer]
+        else:
+            return self.footer.copy()
+
+    def fresh(self, element: dict) -> bool:
+        try:
+            return time() - datetime.fromisoformat(element['updated_at']).timestamp() < self.shop.stale
+        except (KeyError, TypeError, ValueError):
+            return False
+
+    def details(self, url: str, label: Callable[[dict], str] = None) -> Union[List[api.Size], None]:
+        label, cart = label or self.label, self.cart
+
+        ok, response = self.provider.request(url + self.shop.details, headers={'user-agent': generate_user_agent()},
+                                             proxy=True)
+
+        if not ok or response.status_code != 200:
+            return None
+
+        try:
+            json = loads(response.content)
+        except ValueError:
+            return None
+
+        if self.shop.details == '.js':
+            return [api.Size(label(i) + ' [?]', f'{cart}{i["id"]}:1') for i in json['variants']
+                    if i['available'] is True]
+        else:
+            return [api.Size(label(i) + f' [{i["inventory_quantity"]}]', f'{cart}{i["id"]}:1')
+                    for i in json['product']['variants'] if int(i['inventory_quantity']) > 0]
+
+    def sizes(self, url: str, element: dict, label: Callable[[dict], str] = None) -> Union[List[api.Size], None]:
+        label, cart = label or self.label, self.cart
+        marker = ' [?]' if self.shop.details else ''
+
+        try:
+            sizes = [api.Size(label(i) + marker, f'{cart}{i["id"]}:1') for i in element['variants']
+                     if i['available'] is True]
+        except KeyError:
+            sizes = None
+
+        if self.shop.details and (sizes is None or not sizes and self.fresh(element)):
+            detailed = self.details(url, label)
+            return sizes if detailed is None else detailed
+        else:
+            return sizes
+
+    def volatile(self, element: dict) -> bool:
+        return bool(self.shop.details) and self.fresh(element)
+
+    def execute(
+            self,
+            mode: int,
+            content: Union[CatalogType, TargetType]
+    ) -> List[Union[CatalogType, TargetType, RestockTargetType, ItemType, TargetEndType]]:
+        result = []
+        if mode == 0:
+            ok, response = self.provider.request(
+                self.link, headers=self.validators.headers(self.link, {'user-agent': generate_user_agent()}),
+                proxy=True
+            )
+
+            if not ok:
+                if isinstance(response, exceptions.Timeout):
+                    return [api.CInterval(self.name, 900.), api.MAlert('Script go to sleep', self.name)]
+                else:
+                    raise response
+
+            if response.status_code == 430 or response.status_code == 520:
+                return [api.CInterval(self.name, 900.), api.MAlert('Script go to sleep', self.name)]
+
+            if self.validators.modified(self.link, response):
+                try:
+                    products = loads(response.content)['products']
+                except (ValueError, KeyError, TypeError):
+                    self.validators.reset(self.link)
+                    return [api.CInterval(self.name, 900.), api.MAlert('Script go to sleep', self.name)]
+            else:
+                products = ()
+
+            shop = self.shop
+            matcher = keywords.registry.current(self.log)
+            check = (matcher.check if matcher else self.kw.check) if shop.filtered else None
+            currency = api.CURRENCIES[shop.currency]
+
+            for element in products:
+                handle = element['handle']
+                title = element['title']
+
+                if check and not (check(handle) or check(title.lower())):
+                    continue
+
+                variants = element['variants']
+
+                fingerprint = self.fingerprints.check(handle, variants)
+                if fingerprint is None and not self.volatile(element):
+                    continue
+
+                target = api.Target(self.prefix + handle, self.name, 0)
+
+                if not shop.restocks and not HashStorage.check_target(target.hash()):
+                    self.fingerprints.add(handle, fingerprint)
+                    continue
+
+                sizes = self.sizes(target.name, element)
+                if sizes is None:
+                    continue
+
+                if not sizes and not shop.announces:
+                    HashStorage.add_target(target.hash())
+                    self.fingerprints.add(handle, fingerprint)
+                    continue
+
+                images = element['images']
+                image = images[0]['src'] if images else placeholder
+                published_date = datetime.fromisoformat(element['published_at'])
+
+                try:
+                    price = api.Price(currency, float(variants[0]['price']))
+                except (KeyError, IndexError, ValueError):
+                    price = api.Price(currency, 0.)
+
+                if HashStorage.check_target(target.hash()):
+                    HashStorage.add_target(target.hash())
+                    additional_columns = {'Site': shop.site, **shop.columns}
+                else:
+                    additional_columns = {'Site': shop.site, **shop.columns, 'Type': 'Restock'}
+
+                if not sizes:
+                    result.append(IAnnounce(
+                        target.name + 'f?stype=Announce',
+                        shop.channel,
+                        title,
+                        image,
+                        'NO SIZES',
+                        price,
+                        api.Sizes(api.SIZE_TYPES[''], []),
+                        self.links(title),
+                        {'Site': shop.site, 'Publish Date': str(published_date), **shop.columns}
+                    ))
+                    self.fingerprints.add(handle, fingerprint)
+                    continue
+
+                sizes = api.Sizes(api.SIZE_TYPES[''], sizes)
+
+                result.append(IRelease(
+                    target.name + f'?shash={sizes.hash().hex()}',
+                    shop.channel,
+                    title,
+                    image,
+                    '',
+                    price,
+                    sizes,
+                    self.links(title),
+                    additional_columns,
+                    publish_date=published_date.timestamp()
+                ))
+                self.fingerprints.add(handle, fingerprint)
+
+            self.schedule.observe(bool(result))
+
+            if isinstance(content, api.CSmart):
+                if result or content.expired:
+                    content.gen.time = self.time_gen(self.schedule.due(), self.shop.offset)
+                    content.expired = False
+                result.append(content)
+            else:
+                result.extend([self.catalog, api.MAlert('Script is awake', self.name)])
+
+        return result
@@ -5,6 +5,8 @@ from lxml import etree
 from pycurl_requests import exceptions
 from user_agent import generate_user_agent
 
+from scripts import keywords
+from scripts.markup import document
 from source import api
 from source import logger
 from source.api import CatalogType, TargetType, RestockTargetType, ItemType, TargetEndType, IRelease, FooterItem
@@ -47,9 +49,9 @@ class Parser(api.Parser):
                 else:
                     raise response
 
-            for element in etree.HTML(response.text).xpath(
+            for element in document(response).xpath(
                     '//a[@class="top-item top-item--catalog"]'):
-                if self.kw.check(element.get('href').lower()):
+                if keywords.check(self, element.get('href').lower()):
 
                     try:
                         if HashStorage.check_target(
@@ -64,7 +66,7 @@ class Parser(api.Parser):
                                 else:
                                     raise response
 
-                            page_content = etree.HTML(response.text)
+                            page_content = document(response)
 
                             sizes = api.Sizes(
                                 api.SIZE_TYPES[''], [api.Size(size.text + ' US') for size in
@@ -2,12 +2,20 @@ from typing import List, Union
 
 from lxml import etree
 
+from scripts import fetcher
+from scripts.markup import listing
 from source import api
 from source import logger
 from source.api import CatalogType, TargetType, RestockTargetType, ItemType, TargetEndType, IRelease, FooterItem
 from source.cache import HashStorage
 from source.library import SubProvider
 
+catalog_items = etree.XPath('//div[@class="product "]')
+product_sizes = etree.XPath('//select[@id="select-prenotation"]/option')
+meta_keywords = etree.XPath('//meta[@name="keywords"]')
+product_image = etree.XPath('//div[@class="slider-data-large"]/div')
+product_price = etree.XPath('//div[@itemprop="price"]')
+
 
 class Parser(api.Parser):
     def __init__(self, name: str, log: logger.Logger, provider_: SubProvider):
@@ -26,9 +34,8 @@ class Parser(api.Parser):
         if mode == 0:
             links = list()
             counter = 0
-            for element in etree.HTML(self.provider.get(self.link,
-                                                        headers={'user-agent': self.user_agent}, proxy=True, mode=1)) \
-                    .xpath('//div[@class="product "]'):
+            for element in catalog_items(listing(self.provider.get(self.link, headers={'user-agent': self.user_agent},
+                                                                   proxy=True, mode=1), 'class="product "')):
                 if counter == 5:
                     break
                 if 'air' in element.get('data-url') or 'yeezy' in element.get('data-url') or 'jordan' \
@@ -38,26 +45,30 @@ class Parser(api.Parser):
                     counter += 1
             if len(links) == 0:
                 return result
-            for link in links:
+            links = [link for link in links if HashStorage.check_target(link[0].hash())]
+            pages = fetcher.fetch(self.provider.get, [link[1] for link in links], mode=1, proxy=True,
+                                  headers={'user-agent': self.user_agent})
+            for link, get_content in zip(links, pages):
+                if isinstance(get_content, Exception):
+                    self.log.error(f'{get_content.__class__.__name__} ({get_content.__str__()}) while fetching {link[1]}')
+                    continue
                 try:
                     if HashStorage.check_target(link[0].hash()):
-                        page_content: etree.Element = etree.HTML(self.provider.get(link[1], mode=1, proxy=True,
-                                                                                   headers={
-                                                                                       'user-agent': self.user_agent}))
+                        page_content: etree.Element = etree.HTML(get_content)
                         sizes = [api.Size(element.text + ' EU')
-                                 for element in page_content.xpath('//select[@id="select-prenotation"]/option')
+                                 for element in product_sizes(page_content)
                                  if element.get('data-availability') == 'true']
-                        name = page_content.xpath('//meta[@name="keywords"]')[0].get('content')
+                        name = meta_keywords(page_content)[0].get('content')
                         HashStorage.add_target(link[0].hash())
                         result.append(IRelease(
                             link[1],
                             'shopify-filtered',
                             name,
-                            page_content.xpath('//div[@class="slider-data-large"]/div')[0].get('data-image-url'),
+                            product_image(page_content)[0].get('data-image-url'),
                             '',
                             api.Price(
                                 api.CURRENCIES['RUB'],
-                                float(page_content.xpath('//div[@itemprop="price"]')[0].text)
+                                float(product_price(page_content)[0].text)
                             ),
                             api.Sizes(api.SIZE_TYPES[''], sizes),
                             [
@@ -3,6 +3,8 @@ from typing import List, Union
 
 from lxml import etree
 
+from scripts import keywords
+from scripts.markup import document
 from source import api
 from source import logger
 from source.api import CatalogType, TargetType, RestockTargetType, ItemType, TargetEndType, IRelease, FooterItem
@@ -10,6 +12,14 @@ from source.cache import HashStorage
 from source.library import SubProvider, Keywords
 from source.tools import LinearSmart, ScriptStorage
 
+catalog_items = etree.XPath('//div[@class="product-cards__item"]')
+item_description = etree.XPath('meta[@itemprop="description"]')
+item_link = etree.XPath('h5[@class="product-card__title"]/a')
+item_sku = etree.XPath('meta[@itemprop="sku"]')
+item_image = etree.XPath('div[@class="product-card__image"]/div/picture/source')
+item_price = etree.XPath('div[@class="product-card__price"]/meta[@itemprop="price"]')
+item_sizes = etree.XPath('div[@class="product-card__hover"]/dl/dd')
+
 
 class Parser(api.Parser):
     def __init__(self, name: str, log: logger.Logger, provider_: SubProvider, storage: ScriptStorage, kw: Keywords):
@@ -47,20 +57,19 @@ class Parser(api.Parser):
             if not ok:
                 return [api.CInterval(self.name, 60.), api.MAlert('Script go to sleep', self.name)]
             try:
-                catalog = [element for element in etree.HTML(response.text).xpath('//div[@class="product-cards__item"]')]
-            except AttributeError:
+                catalog = catalog_items(document(response, b'class="product-cards__item"'))
+            except (AttributeError, TypeError):
                 return [api.CInterval(self.name, 60.), api.MAlert('Script go to sleep', self.name)]
             if not catalog:
                 return [api.CInterval(self.name, 60.), api.MAlert('Script go to sleep', self.name)]
 
             for element in catalog:
 
-                if self.kw.check(element[0].xpath('meta[@itemprop="description"]')[0].get('content').lower()):
+                if keywords.check(self, item_description(element[0])[0].get('content').lower()):
 
                     try:
 
-                        link = 'https://sneakerhead.ru' + element[0].xpath('h5[@class="product-card__title"]/a')[0] \
-                            .get('href')
+                        link = 'https://sneakerhead.ru' + item_link(element[0])[0].get('href')
 
                         if HashStorage.check_target(api.Target(link, self.name, 0).hash()):
                             HashStorage.add_target(api.Target(link, self.name, 0).hash())
@@ -68,15 +77,12 @@ class Parser(api.Parser):
                         else:
                             additional_columns = {'Site': '[Sneakerhead](https://sneakerhead.ru)', 'Type': 'Restock'}
 
-                        name = element[0].xpath('meta[@itemprop="description"]')[0].get('content')
-                        sku = element[0].xpath('meta[@itemprop="sku"]')[0].get('content')
-                        image = 'https://sneakerhead.ru' + \
-                                element[0].xpath(
-                                    'div[@class="product-card__image"]/div/picture/source')[0].get('data-src')
+                        name = item_description(element[0])[0].get('content')
+                        sku = item_sku(element[0])[0].get('content')
+                        image = 'https://sneakerhead.ru' + item_image(element[0])[0].get('data-src')
                         price = api.Price(
                             api.CURRENCIES['RUB'],
-                            float(element[0].xpath('div[@class="product-card__price"]/meta[@itemprop="price"]')[0]
-                                  .get('content'))
+                            float(item_price(element[0])[0].get('content'))
                         )
 
                         sizes = api.Sizes(api.SIZE_TYPES[''], [
@@ -84,7 +90,7 @@ class Parser(api.Parser):
                                 str(size.text),
                                 f'http://static.sellars.cf/links?site=sneakerhead&id={size.get("data-id")}'
                             )
-                            for size in element[0].xpath('div[@class="product-card__hover"]/dl/dd')
+                            for size in item_sizes(element[0])
                         ])
 
                         result.append(
@@ -1,9 +1,10 @@
 from datetime import datetime, timedelta, timezone
 from typing import List, Union
 
-from lxml import etree
 from pycurl_requests import exceptions
 
+from scripts import keywords
+from scripts.markup import document
 from source import api
 from source import logger
 from source.api import CatalogType, TargetType, RestockTargetType, ItemType, TargetEndType, IRelease, FooterItem
@@ -51,7 +52,7 @@ class Parser(api.Parser):
                     result.append(content)
                     return result
 
-            lxml_resp = etree.HTML(resp.text)
+            lxml_resp = document(resp)
             catalog = [element for element in lxml_resp.xpath('//div[@class="pli"]')]
 
             if not catalog:
@@ -64,7 +65,7 @@ class Parser(api.Parser):
                 name = item.xpath('a[@class="pli__main"]/span[@class="pli__main__brand"]')[0].text + ' ' + \
                        item.xpath('a[@class="pli__main"]/span[@class="pli__main__name"]')[0].text
 
-                if self.kw.check(name.lower()):
+                if keywords.check(self, name.lower()):
 
                     if HashStorage.check_target(
                             api.Target(link, self.name, 0).hash()):
@@ -2,11 +2,20 @@ from typing import List, Union
 
 from lxml import etree
 
+from scripts.markup import listing
 from source import api
 from source import logger
 from source.api import CatalogType, TargetType, RestockTargetType, ItemType, TargetEndType, IRelease, FooterItem
 from source.library import SubProvider
 
+catalog_items = etree.XPath('//a[@class="b-product-tile-image-link js-product-tile-link"]')
+breadcrumb = etree.XPath('//span[@class="b-breadcrumb-text"]')
+release_button = etree.XPath('//button[@class="f-pdp-button f-pdp-button--release js-btn-release"]')
+coming_soon_button = etree.XPath('//button[@class="f-pdp-button f-pdp-button-coming-soon f-pdp-button--lowercase"]')
+og_image = etree.XPath('//meta[@property="og:image"]')
+product_price = etree.XPath('//span[@class="b-product-tile-price-item"]')
+product_sizes = etree.XPath('//a[@class="js-pdp-attribute-btn b-pdp-swatch-link js-pdp-attribute-btn--size"]')
+
 
 class Parser(api.Parser):
     def __init__(self, name: str, log: logger.Logger, provider_: SubProvider):
@@ -31,10 +40,10 @@ class Parser(api.Parser):
         Union[CatalogType, TargetType, RestockTargetType, ItemType, TargetEndType]]:
         result = [content]
         if mode == 0:
-            page_content = etree.HTML(self.provider.get(
+            page_content = listing(self.provider.get(
                 self.link, headers=self.headers, proxy=True, mode=1, timeout=60
-            ))
-            for element in page_content.xpath('//a[@class="b-product-tile-image-link js-product-tile-link"]'):
+            ), 'class="b-product-tile-image-link')
+            for element in catalog_items(page_content):
                 if 'yeezy' in element.get('href') or 'air' in element.get('href') or 'sacai' in element.get('href') \
                         or 'dunk' in element.get('href') or 'retro' in element.get('href'):
                     result.append(api.TInterval('https://www.solebox.com' + element.get('href'), self.name, 0, 3.))
@@ -44,29 +53,25 @@ class Parser(api.Parser):
                 self.provider.get(content.name, headers=self.headers,
                                   proxy=True, mode=1, timeout=60))
             try:
-                name = page_content.xpath('//span[@class="b-breadcrumb-text"]')[0].text
+                name = breadcrumb(page_content)[0].text
             except IndexError:
                 name = ''
             try:
-                date = page_content.xpath('//button[@class="f-pdp-button f-pdp-button--release js-btn-release"]')[
-                    0].text
+                date = release_button(page_content)[0].text
             except IndexError:
                 date = 'Date not indicated'
             try:
-                if page_content.xpath(
-                        '//button[@class="f-pdp-button f-pdp-button-coming-soon f-pdp-button--lowercase"]') \
-                        or page_content.xpath('//button[@class="f-pdp-button f-pdp-button--release js-btn-release"]'):
+                if coming_soon_button(page_content) or release_button(page_content):
                     result.append(
                         api.IAnnounce(
                             content.name,
                             'solebox',
                             name,
-                            page_content.xpath('//meta[@property="og:image"]')[0].get('content'),
+                            og_image(page_content)[0].get('content'),
                             '',
                             api.Price(api.CURRENCIES['EUR'], float(
-                                page_content.xpath('//span[@class="b-product-tile-price-item"]')[0].text.replace('€',
-                                                                                                                 '').replace(
-                                    '\n', '').replace(' ', '').split(',')[0])),
+                                product_price(page_content)[0].text.replace('€', '').replace('\n', '')
+                                .replace(' ', '').split(',')[0])),
                             api.Sizes(api.SIZE_TYPES[''], []),
                             [
                                 FooterItem('StockX', 'https://stockx.com/search/sneakers?s=' +
@@ -80,20 +85,18 @@ class Parser(api.Parser):
                 else:
                     sizes = [api.Size(size.get('data-value') + ' EU', size.get('href'))
                              for size in
-                             page_content.xpath('//a[@class="js-pdp-attribute-btn b-pdp-swatch-link '
-                                                'js-pdp-attribute-btn--size"]')]
+                             product_sizes(page_content)]
                     name = content.name.split('/')[5].split('%')[0].replace('_', ' ').upper()
                     if sizes:
                         result.append(IRelease(
                             content.name,
                             'solebox',
                             name,
-                            page_content.xpath('//meta[@property="og:image"]')[0].get('content'),
+                            og_image(page_content)[0].get('content'),
                             '',
                             api.Price(api.CURRENCIES['EUR'], float(
-                                page_content.xpath('//span[@class="b-product-tile-price-item"]')[0].text.replace('€',
-                                                                                                                 '').replace(
-                                    '\n', '').replace(' ', '').split(',')[0])),
+                                product_price(page_content)[0].text.replace('€', '').replace('\n', '')
+                                .replace(' ', '').split(',')[0])),
                             api.Sizes(api.SIZE_TYPES[''], sizes),
                             [
                                 FooterItem('StockX', 'https://stockx.com/search/sneakers?s=' +
@@ -2,9 +2,10 @@ from datetime import datetime, timedelta, timezone
 from json import JSONDecodeError, dumps
 from typing import List, Union
 
-from lxml import etree
 from pycurl_requests import exceptions
 
+from scripts import keywords
+from scripts.markup import document
 from source import api
 from source import logger
 from source.api import CatalogType, TargetType, RestockTargetType, ItemType, TargetEndType, IRelease, FooterItem
@@ -74,7 +75,7 @@ class Parser(api.Parser):
                 else:
                     raise response
 
-            lxml_catalog = etree.HTML(response.text)
+            lxml_catalog = document(response)
 
             catalog = [item for item in lxml_catalog.xpath('//div[@class="grid-row grid-row--flex"]/div/div')]
 
@@ -87,7 +88,7 @@ class Parser(api.Parser):
                 link = 'https://street-beat.ru' + \
                        item.xpath('a[@class="link link--no-color catalog-item__title ddl_product_link"]')[0].get('href')
 
-                if self.kw.check(name.lower()):
+                if keywords.check(self, name.lower()):
 
                     try:
                         if HashStorage.check_target(api.Target(link, self.name, 0).hash()):
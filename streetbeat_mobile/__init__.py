@@ -5,6 +5,7 @@ from typing import List, Union
 
 from pycurl_requests import exceptions
 
+from scripts import keywords
 from source import api
 from source import logger
 from source.api import CatalogType, TargetType, RestockTargetType, ItemType, TargetEndType, IRelease, FooterItem
@@ -98,7 +99,7 @@ class Parser(api.Parser):
             for element in json_response['items']:
                 name = element['name']
 
-                if self.kw.check(name.lower()):
+                if keywords.check(self, name.lower()):
                     link = element['externalUrl']
 
                     if HashStorage.check_target(api.Target(link, self.name, 0).hash()):
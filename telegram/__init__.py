@@ -1,11 +1,15 @@
-import queue
+import heapq
+import itertools
 import threading
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass, field
-from time import time, sleep
-from typing import List, Dict, Optional
+from time import time, sleep, monotonic
+from typing import List, Dict, Optional, Tuple
 
 import requests
 import yaml
+from requests.adapters import HTTPAdapter
+from scripts.outbox import Outbox
 from source import __version__, __copyright__
 from source import api
 from source import codes
@@ -15,6 +19,9 @@ from ujson import dumps
 
 currencies: tuple = ('', '£', '$', '€', '₽', '¥', 'kr', '₴', 'Br', 'zł', '$(HKD)', '$(CAD)', '$(AUD)')
 sizes_column_size = 5
+workers = 8
+messages_per_tick = 32
+max_in_flight = 256
 
 
 @dataclass
@@ -46,6 +53,39 @@ class Chat:
             raise TypeError('short must bool')
 
 
+class Limiter:
+    __slots__ = ['rate', 'capacity', 'tokens', 'stamp', 'lock']
+    rate: float
+    capacity: float
+    tokens: float
+    stamp: float
+    lock: threading.Lock
+
+    def __init__(self, rate: float, capacity: float):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.stamp = monotonic()
+        self.lock = threading.Lock()
+
+    def reserve(self) -> float:
+        with self.lock:
+            now = monotonic()
+            self.tokens = min(self.capacity, self.tokens + (now - self.stamp) * self.rate) - 1
+            self.stamp = now
+            return 0. if self.tokens >= 0 else -self.tokens / self.rate
+
+
+@dataclass
+class Lane:
+    __slots__ = ['limiters', 'posts', 'running', 'blocked', 'reserved']
+    limiters: Tuple[Limiter, ...]
+    posts: list
+    running: bool
+    blocked: float
+    reserved: bool
+
+
 @dataclass(order=True)
 class Message:
     priority: int
@@ -53,6 +93,8 @@ class Message:
     channel: str = field(default='', compare=False)
     item: Optional[api.ItemType] = field(default=None, compare=False)
     tries: int = field(default=5, repr=False, compare=False)
+    chats: Tuple[Chat, ...] = field(default=(), repr=False, compare=False)
+    rendered: Dict[int, str] = field(default_factory=dict, repr=False, compare=False)
 
     def __post_init__(self):
         if not self.channel:
@@ -75,6 +117,13 @@ class Message:
         else:
             return False
 
+    def render(self, chat: Chat) -> str:
+        try:
+            return self.rendered[chat.id]
+        except KeyError:
+            rendered = self.rendered[chat.id] = self.build(chat)
+            return rendered
+
     def build(self, chat: Chat) -> str:
         if self.item:
             msg = [f'''<a href="{self.item.url}">{"[ANNOUNCE] " if isinstance(self.item, api.IAnnounce) else
@@ -111,6 +160,9 @@ class EventsExecutor(api.EventsExecutor):
     channels: Dict[str, List[Chat]]
     groups: Dict[str, Group]
 
+    lanes: Dict[int, Lane]
+    pending: Dict[int, list]
+
     def __init__(self, name: str, log: Logger, storage: ScriptStorage):
         super().__init__(name, log, storage)
         self._token = ''
@@ -121,7 +173,19 @@ class EventsExecutor(api.EventsExecutor):
         self.config()
 
         self.state = 1
-        self.messages = queue.PriorityQueue(1024)
+        if not self.storage.check('outbox.db'):
+            self.storage.file('outbox.db', 'w+')
+        self.messages = Outbox(self.storage.path + '/outbox.db')
+        self.session = requests.Session()
+        self.session.headers['Content-Type'] = 'application/json'
+        self.session.mount('https://', HTTPAdapter(pool_connections=1, pool_maxsize=workers))
+        self.pool = ThreadPoolExecutor(workers, 'Telegram-Sender')
+        self.lock = threading.Lock()
+        self.limiter = Limiter(30., 30.)
+        self.lanes = {}
+        self.pending = {}
+        self.counter = itertools.count()
+        self.errors = 0
         self.thread = threading.Thread(name='Telegram-Bot', target=self.loop, daemon=True)
         self.thread.start()
         self.log.info('Thread started')
@@ -183,76 +247,200 @@ class EventsExecutor(api.EventsExecutor):
         else:
             raise FileNotFoundError('secret.yaml not found')
 
-    def wait(self, delta: float) -> None:
-        if self.messages.qsize() > 5:
-            est = ((self.messages.qsize() - 5) * 1)
+    @staticmethod
+    def lane(chat: Chat) -> Lane:
+        if chat.id < 0:
+            return Lane((Limiter(1., 1.), Limiter(20. / 60., 20.)), [], False, 0., False)
         else:
-            est = .1
-
-        sleep(est - delta if delta <= est else 0)
+            return Lane((Limiter(1., 1.),), [], False, 0., False)
+
+    def dump(self, msg: Message) -> dict:
+        return {
+            'text': msg.text,
+            'channel': msg.channel,
+            'tries': msg.tries,
+            'chats': [i.id for i in msg.chats],
+            'rendered': {str(i.id): msg.render(i) for i in msg.chats or self.channels.get(msg.channel, ())}
+        }
+
+    def load(self, priority: int, record: dict) -> Message:
+        chats = {i.id: i for v in self.channels.values() for i in v}
+        rendered = record.get('rendered', {})
+        return Message(
+            priority,
+            record.get('text', ''),
+            record.get('channel', ''),
+            tries=record.get('tries', 0),
+            chats=tuple(chats[i] for i in record.get('chats', ()) if i in chats),
+            rendered={int(k): v for k, v in rendered.items()}
+        )
+
+    def put(self, msg: Message) -> None:
+        self.messages.put(msg.priority, self.dump(msg))
+
+    @staticmethod
+    def retry_after(resp) -> float:
+        try:
+            return float(resp.json()['parameters']['retry_after'])
+        except (ValueError, KeyError, TypeError):
+            return 1.
+
+    def post(self, lane: Lane, chat: Chat, msg: Message) -> Tuple[bool, Optional[Exception]]:
+        if not self.state:
+            return True, InterruptedError('Executor stopped')
+
+        try:
+            resp = self.session.post(
+                f'https://api.telegram.org/bot{self._token}/sendMessage',
+                data=dumps({'chat_id': chat.id, 'text': msg.render(chat), 'parse_mode': 'HTML'})
+            )
+        except (requests.ConnectionError, requests.Timeout, requests.HTTPError) as e:
+            return True, e
+
+        if resp.status_code == 429:
+            retry_after = self.retry_after(resp)
+            lane.blocked = monotonic() + retry_after
+            self.log.warn(f'Rate limited on chat {chat.id} for {retry_after}s')
+            return False, None
+
+        if resp.status_code in (400, 500):
+            self.log.error(f'Message lost: {resp.text}\n'
+                           f'------------\n{dumps(msg.render(chat))}\n------------')
+        return True, None
+
+    def finish(self, chat: Chat, key: int, msg: Message, error: Optional[Exception]) -> None:
+        with self.lock:
+            entry = self.pending[key]
+            entry[0] -= 1
+            if error:
+                entry[1].append(chat)
+                entry[2] = error
+            if entry[0]:
+                return
+            del self.pending[key]
+
+        try:
+            if entry[1]:
+                e = entry[2]
+                if self.state == 2:
+                    self.log.error(f'{e.__class__.__name__} ({e.__str__()}) while sending message: {msg}')
+                    with self.lock:
+                        self.errors += 1
+                else:
+                    self.log.error(f'{e.__class__.__name__} ({e.__str__()}) while sending message')
+                msg.priority = 1
+                msg.chats = tuple(entry[1])
+                self.messages.retry(key, msg.priority, self.dump(msg))
+            else:
+                self.messages.done(key)
+        except Exception:
+            self.messages.done(key)
+            raise
+
+    def defer(self, lane: Lane, delay: float) -> None:
+        timer = threading.Timer(delay, self.resume, (lane,))
+        timer.daemon = True
+        timer.start()
+
+    def resume(self, lane: Lane) -> None:
+        try:
+            self.pool.submit(self.drain, lane)
+        except RuntimeError:
+            with self.lock:
+                lane.running = False
+
+    def drain(self, lane: Lane) -> None:
+        while True:
+            with self.lock:
+                if not lane.posts:
+                    lane.running = False
+                    return
+
+                delay = lane.blocked - monotonic()
+                if delay > 0 and self.state:
+                    self.defer(lane, delay)
+                    return
+
+                if not lane.reserved and self.state:
+                    lane.reserved = True
+                    delay = max(self.limiter.reserve(), *(i.reserve() for i in lane.limiters))
+                    if delay > 0:
+                        self.defer(lane, delay)
+                        return
+
+                lane.reserved = False
+                post = heapq.heappop(lane.posts)
+
+            _, _, chat, key, msg = post
+            finished, error = self.post(lane, chat, msg)
+            if not finished:
+                with self.lock:
+                    heapq.heappush(lane.posts, post)
+                continue
+
+            self.finish(chat, key, msg, error)
+
+    def dispatch(self, key: int, msg: Message) -> None:
+        if not msg.retry():
+            self.log.error(f'Max retries reached for message: {msg}')
+            self.messages.done(key)
+            return
+
+        if msg.channel not in self.channels:
+            self.log.warn(f'Message\'s channel does not exist: {msg.channel}')
+            self.messages.done(key)
+            return
+
+        chats = msg.chats or self.channels[msg.channel]
+        if not chats:
+            self.messages.done(key)
+            return
+
+        with self.lock:
+            self.pending[key] = [len(chats), [], None]
+            for i in chats:
+                if i.id not in self.lanes:
+                    self.lanes[i.id] = self.lane(i)
+                lane = self.lanes[i.id]
+                heapq.heappush(lane.posts, (msg.priority, next(self.counter), i, key, msg))
+                if not lane.running:
+                    lane.running = True
+                    self.pool.submit(self.drain, lane)
 
     def loop(self):
-        errors = 0
         while True:
             start: float = time()
             if self.state >= 1:
-                try:
-                    msg: Message = self.messages.get_nowait()
-                    try:
-                        if msg.retry():
-                            if msg.channel not in self.channels:
-                                self.log.warn(f'Message\'s channel does not exist: {msg.channel}')
-                                continue
-
-                            for i in self.channels[msg.channel]:
-                                resp = requests.post(
-                                    f'https://api.telegram.org/bot{self._token}/sendMessage',
-                                    data=dumps({'chat_id': i.id, 'text': msg.build(i), 'parse_mode': 'HTML'}),
-                                    headers={'Content-Type': 'application/json'}
-                                )
-
-                                if resp.status_code in (400, 429, 500):
-                                    self.log.error(f'Message lost: {resp.text}\n'
-                                                   f'------------\n{dumps(msg.build(i))}\n------------')
-                                    continue
-                        else:
-                            self.log.error(f'Max retries reached for message: {msg}')
-                    except (requests.ConnectionError, requests.Timeout, requests.HTTPError) as e:
-                        if self.state == 2:
-                            self.log.error(f'{e.__class__.__name__} ({e.__str__()}) while sending message: {msg}')
-                            errors += 1
-                        else:
-                            self.log.error(f'{e.__class__.__name__} ({e.__str__()}) while sending message')
-                        msg.priority = 1
-                        self.messages.put_nowait(msg)
-                    finally:
-                        self.messages.task_done()
-                except queue.Empty:
-                    pass
-                if errors >= 3:
+                for key, priority, record in self.messages.get(
+                        min(messages_per_tick, max_in_flight - len(self.pending))):
+                    self.dispatch(key, self.load(priority, record))
+                if self.errors >= 3:
                     self.log.warn('Max retries reached. Turning off')
-                    self.messages.unfinished_tasks = 1
-                    self.messages.task_done()
+                    self.messages.release()
                     self.state = 0
             else:
+                self.pool.shutdown()
+                self.session.close()
+                self.messages.close()
                 self.log.info('Thread closed')
                 break
-            self.wait(time() - start)
+            delta: float = time() - start
+            sleep(.1 - delta if delta <= .1 else 0)
 
     def e_monitor_starting(self) -> None:
-        self.messages.put(Message(
+        self.put(Message(
             1, f'INFO\nMonitor starting\nMonitor {__version__} ({__copyright__})'))
 
     def e_monitor_started(self) -> None:
-        self.messages.put(Message(1, 'INFO\nMonitor online'))
+        self.put(Message(1, 'INFO\nMonitor online'))
 
     def e_monitor_stopping(self) -> None:
-        self.messages.put(Message(1, 'INFO\nMonitor stopping'))
+        self.put(Message(1, 'INFO\nMonitor stopping'))
 
     def e_monitor_stopped(self) -> None:
         if self.thread.is_alive():
-            self.messages.put(Message(1, 'INFO\nMonitor offline'))
-            self.log.info(f'Waiting for messages ({self.messages.unfinished_tasks}) to sent')
+            self.put(Message(1, 'INFO\nMonitor offline'))
+            self.log.info(f'Waiting for messages ({self.messages.unfinished}) to sent')
             self.state = 2
             self.messages.join()
             self.log.info('All messages sent') if self.state == 2 else None
@@ -262,11 +450,11 @@ class EventsExecutor(api.EventsExecutor):
             self.log.warn('Script offline (due to raised exception)')
 
     def e_alert(self, code: codes.Code, thread: str) -> None:
-        self.messages.put(Message(3 if str(code.code)[0] == '5' else 4,
-                                  f'<b><u>Alert</u></b>\n{code.format()}\nThread: {thread}'))
+        self.put(Message(3 if str(code.code)[0] == '5' else 4,
+                         f'<b><u>Alert</u></b>\n{code.format()}\nThread: {thread}'))
 
     def e_item(self, item: api.ItemType) -> None:
-        self.messages.put(Message(10, item=item))
+        self.put(Message(10, item=item))
 
     def e_target_end(self, target_end: api.TargetEndType) -> None:
         if isinstance(target_end, api.TEFail):
@@ -276,7 +464,7 @@ class EventsExecutor(api.EventsExecutor):
         else:
             text = "Target Success"
 
-        self.messages.put(Message(
+        self.put(Message(
             5,
             f'<u>[TargetEnd]</u>\n*{text}*\n'
             f'\nDescription: {target_end.description}\nScript: {target_end.target.script}'
@@ -288,5 +476,5 @@ class EventsExecutor(api.EventsExecutor):
         else:
             header = '<b>Information Message</b>'
 
-        self.messages.put(Message(3 if isinstance(msg, api.MAlert) else 15,
-                                  f'{header}\n{msg.text}\n<b>Script: <u>{msg.script}</u></b>', msg.channel))
+        self.put(Message(3 if isinstance(msg, api.MAlert) else 15,
+                         f'{header}\n{msg.text}\n<b>Script: <u>{msg.script}</u></b>', msg.channel))
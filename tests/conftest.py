@@ -0,0 +1,5 @@
+import os
+import sys
+
+# The repository is imported as the `scripts` package from the directory that holds it
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
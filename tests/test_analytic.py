@@ -0,0 +1,110 @@
+import sqlite3
+
+import pytest
+
+from scripts import analytic
+
+legacy = (
+    'create table items (id integer primary key autoincrement, hash blob not null unique, url text not null, '
+    'channel text not null, name text not null, image text not null, description text, price real not null, '
+    'currency integer not null, sizes text not null, publish_date real not null, timestamp real not null);'
+    'create table announces (id integer primary key autoincrement, hash blob not null unique, url text not null, '
+    'channel text not null, name text not null, image text not null, description text, price real not null, '
+    'currency integer not null, sizes text not null, publish_date real not null, timestamp real not null);'
+)
+partitioned = legacy + 'create table sizes (item integer not null references items (id), size text not null, url text);'
+
+url = 'https://kith.com/products/dunk-low'
+
+
+def create(path, schema, items=(), announces=(), sizes=()):
+    db = sqlite3.connect(str(path))
+    with db:
+        db.executescript(schema)
+        for table, rows in (('items', items), ('announces', announces)):
+            db.executemany(f'INSERT INTO {table} VALUES (NULL, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)', [
+                (f'{table}-{timestamp}'.encode(), link, channel, 'Dunk Low', '', '', 100., 1, stock, 0., timestamp)
+                for link, channel, stock, timestamp in rows
+            ])
+        if sizes:
+            db.executemany('INSERT INTO sizes VALUES (?, ?, ?)', sizes)
+    db.close()
+
+
+@pytest.fixture
+def reader(tmp_path):
+    readers = []
+
+    def open_(path=tmp_path):
+        readers.append(analytic.Reader(str(path)))
+        return readers[-1]
+
+    yield open_
+    for i in readers:
+        i.close()
+
+
+def test_partitions(tmp_path):
+    for name in ('data-2026-10.db', 'data-2026-09.db', 'data.db', 'data-2026-10.db-wal', 'other.db'):
+        (tmp_path / name).touch()
+    (tmp_path / 'archive').mkdir()
+
+    assert analytic.partitions(str(tmp_path)) == ['data.db', 'data-2026-09.db', 'data-2026-10.db']
+
+
+def test_no_partitions(tmp_path):
+    with pytest.raises(FileNotFoundError):
+        analytic.Reader(str(tmp_path))
+
+
+def test_legacy_only(tmp_path, reader):
+    create(tmp_path / 'data.db', legacy, items=[
+        (url + '?shash=a', 'kith', '[["9 US", null]]', 10.),
+        (url + '?shash=b', 'kith', '[]', 25.),
+        ('https://kith.com/products/other', 'kith', '[]', 30.)
+    ])
+    db = reader()
+
+    assert db.db.execute('SELECT count(*) FROM sizes').fetchone() == (0,)
+    assert [i[0] for i in db.recent('kith')] == ['https://kith.com/products/other', url + '?shash=b', url + '?shash=a']
+    assert db.restocks(url) == [10., 25.]
+    assert db.sellout(url + '?shash=c') == 15.
+    assert db.sellout('https://kith.com/products/missing') is None
+
+
+def test_legacy_and_partitions(tmp_path, reader):
+    create(tmp_path / 'data.db', legacy, items=[(url, 'kith', '[["9 US", null]]', 10.)])
+    create(tmp_path / 'data-2026-09.db', partitioned, items=[
+        (url + '?shash=a', 'kith', '[["10 US", null]]', 20.),
+        (url + '-kids', 'kith', '[]', 21.),
+        (url + '?shash=b', 'kith', 'unknown', 22.)
+    ], sizes=[(1, '10 US', None)])
+    create(tmp_path / 'data-2026-10.db', partitioned, items=[(url + '?shash=c', 'bape', '[["11 US", null]]', 30.)],
+           announces=[(url + 'f?stype=Announce', 'kith', '[]', 31.), (url + '?stype=Announce', 'kith', '[]', 35.)],
+           sizes=[(1, '11 US', None), (1, '12 US', None)])
+    db = reader()
+
+    assert db.db.execute('SELECT part, count(*) FROM items GROUP BY part').fetchall() == [(0, 1), (1, 3), (2, 1)]
+    assert db.db.execute('SELECT part, size FROM sizes ORDER BY size').fetchall() == [
+        (1, '10 US'), (2, '11 US'), (2, '12 US')
+    ]
+    assert db.restocks(url) == [10., 20., 22., 30.]
+    assert db.restocks(url, 21.) == [22., 30.]
+    assert [i[0] for i in db.recent('kith', 2)] == [url + '?shash=b', url + '-kids']
+    assert db.sellout(url) == 21.
+    assert db.sellout(url + 'f?stype=Announce') == 21.
+    assert db.sellout(url + '-kids') is None
+
+
+def test_reload(tmp_path, reader):
+    create(tmp_path / 'data.db', legacy, items=[(url, 'kith', '[["9 US", null]]', 10.)])
+    db = reader()
+    assert db.sellout(url) is None
+
+    create(tmp_path / 'data-2026-10.db', partitioned, items=[(url + '?shash=a', 'kith', '[]', 40.)],
+           sizes=[(1, '9 US', None)])
+    db.reload()
+
+    assert db.sellout(url) == 30.
+    assert db.db.execute('SELECT count(*) FROM sizes').fetchone() == (1,)
+    assert len([i for i in db.db.execute('pragma database_list') if i[1].startswith('p')]) == 2
@@ -0,0 +1,111 @@
+import os
+import sqlite3
+
+import pytest
+
+from scripts import columnar
+
+numpy = pytest.importorskip('numpy')
+pyarrow = pytest.importorskip('pyarrow')
+pytest.importorskip('pyarrow.parquet')
+
+schema = (
+    'create table items (id integer primary key autoincrement, hash blob not null unique, url text not null, '
+    'channel text not null, name text not null, image text not null, description text, price real not null, '
+    'currency integer not null, sizes text not null, publish_date real not null, timestamp real not null);'
+    'create table announces (id integer primary key autoincrement, hash blob not null unique, url text not null, '
+    'channel text not null, name text not null, image text not null, description text, price real not null, '
+    'currency integer not null, sizes text not null, publish_date real not null, timestamp real not null);'
+)
+
+kith = 'https://kith.com/products/dunk-low'
+bape = 'https://bape.com/products/shark'
+
+
+def create(path, items=(), announces=()):
+    db = sqlite3.connect(str(path))
+    with db:
+        db.executescript(schema)
+        for table, rows in (('items', items), ('announces', announces)):
+            db.executemany(f'INSERT INTO {table} VALUES (NULL, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)', [
+                (f'{table}-{timestamp}'.encode(), url, 'shop', 'Name', '', '', 100., 1, stock, 0., timestamp)
+                for url, stock, timestamp in rows
+            ])
+    db.close()
+
+
+@pytest.mark.parametrize('url, expected', [
+    (kith, kith),
+    (kith + '?shash=00ff', kith),
+    (kith + 'f?stype=Announce', kith),
+    ('https://kith.com/products/fof?shash=00', 'https://kith.com/products/fof'),
+    ('', '')
+])
+def test_product(url, expected):
+    assert columnar.product(url) == expected
+
+
+@pytest.mark.parametrize('raw, expected', [
+    ('[{"size": "9 US", "url": null}, {"size": 10}]', ['9 US', '10']),
+    ('["S", "M"]', ['S', 'M']),
+    ('{"size": "9"}', []),
+    ('unknown', [])
+])
+def test_sizes(raw, expected):
+    assert columnar.sizes(raw) == expected
+
+
+def test_export_round_trip(tmp_path, monkeypatch):
+    monkeypatch.setattr(columnar, 'batch_size', 2)
+    create(tmp_path / 'data-2026-09.db', items=[
+        (kith + '?shash=a', '["9 US"]', 10.),
+        (kith + '?shash=b', '["9 US", "10 US"]', 20.),
+        (bape, '[]', 30.)
+    ], announces=[(kith + 'f?stype=Announce', '[]', 40.)])
+    directory = tmp_path / 'columnar'
+    directory.mkdir()
+
+    target = columnar.export(str(tmp_path / 'data-2026-09.db'), str(directory / 'data-2026-09.parquet'))
+    assert os.listdir(directory) == ['data-2026-09.parquet']
+    assert pyarrow.parquet.ParquetFile(target).num_row_groups == 3
+
+    table = columnar.load(str(directory))
+    assert table.column('kind').to_pylist() == ['items', 'items', 'items', 'announces']
+    assert table.column('site').to_pylist() == ['kith.com', 'kith.com', 'bape.com', 'kith.com']
+    assert table.column('product').to_pylist() == [kith, kith, bape, kith]
+    assert table.column('sizes').to_pylist() == [['9 US'], ['9 US', '10 US'], [], []]
+
+    assert columnar.load(str(directory), ('url', 'timestamp'), 25.).to_pydict() == {
+        'url': [bape, kith + 'f?stype=Announce'], 'timestamp': [30., 40.]
+    }
+
+
+def test_load_empty(tmp_path):
+    table = columnar.load(str(tmp_path), ('product', 'timestamp'))
+
+    assert table.num_rows == 0
+    assert table.column_names == ['product', 'timestamp']
+
+
+def test_medians():
+    codes, values = columnar.medians(numpy.array([1, 0, 1, 0, 0, 2]), numpy.array([20., 3., 10., 1., 2., 5.]))
+
+    assert codes.tolist() == [0, 1, 2]
+    assert values.tolist() == [2., 15., 5.]
+
+
+def test_restock_intervals(tmp_path):
+    create(tmp_path / 'data-2026-09.db', items=[
+        (kith + '?shash=a', '["9 US"]', 10.),
+        (bape + '?shash=a', '["S"]', 15.),
+        (kith + '?shash=b', '["9 US"]', 40.),
+        (kith + '?shash=c', '["9 US"]', 60.),
+        (bape + '?shash=b', '["S"]', 115.),
+        ('https://kith.com/products/other', '["9 US"]', 70.)
+    ], announces=[(kith + 'f?stype=Announce', '[]', 45.)])
+    directory = tmp_path / 'columnar'
+    directory.mkdir()
+    columnar.export(str(tmp_path / 'data-2026-09.db'), str(directory / 'data-2026-09.parquet'))
+
+    assert columnar.restock_intervals(columnar.load(str(directory))) == {'kith.com': 25., 'bape.com': 100.}
+    assert columnar.restock_intervals(columnar.load(str(directory), since=100.)) == {}
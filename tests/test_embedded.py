@@ -0,0 +1,38 @@
+from json import JSONDecodeError
+
+import pytest
+
+from scripts import embedded
+
+html = '<script>window.__STATE__ = {"products": [{"id": 1}, {"id": 2}]};</script>' \
+       '<script>window.__STATE__ = [3, 4]</script>'
+
+
+def test_extract():
+    assert embedded.extract(html, 'window.__STATE__') == {'products': [{'id': 1}, {'id': 2}]}
+    assert embedded.extract(html.encode(), '"products":') == [{'id': 1}, {'id': 2}]
+    assert embedded.extract(html, 'window.__STATE__', html.index('</script>')) == [3, 4]
+
+
+def test_extract_missing():
+    with pytest.raises(JSONDecodeError):
+        embedded.extract(html, 'window.__DATA__')
+    with pytest.raises(JSONDecodeError):
+        embedded.extract('var x = 1;', 'var x')
+
+
+def test_extract_all():
+    assert list(embedded.extract_all(html, 'window.__STATE__')) == [{'products': [{'id': 1}, {'id': 2}]}, [3, 4]]
+
+
+def test_strings():
+    data = '{"sku":"A-1","size":"9"},{"sku":"B-\\u0032"},{"sku": "C-3"},{"sku":7}'
+
+    assert list(embedded.strings(data, '"sku":')) == ['A-1', 'B-2']
+    assert list(embedded.strings(data.encode(), '"size":')) == ['9']
+
+
+def test_strings_skips_malformed():
+    data = '"sku":"A-1\\x",{"sku":"B-2"},"sku":"C-3'
+
+    assert list(embedded.strings(data, '"sku":')) == ['B-2']
@@ -0,0 +1,71 @@
+from urllib.parse import parse_qs
+
+from ujson import loads
+
+from scripts import end
+from scripts.end import Query
+
+brand = frozenset({'brand:Nike'})
+jordan = frozenset({'brand:Nike Jordan'})
+
+
+def covers(planned, query):
+    return planned[:3] == query[:3] and len(planned.filters) == len(query.filters) \
+        and all(any(group <= i for i in planned.filters) for group in query.filters) \
+        and planned.hits >= query.hits
+
+
+def test_merge_same_filters():
+    first = Query('index', '', end.browse, (brand, frozenset({end.available})), 100)
+    second = Query('index', '', end.browse, (frozenset({end.available}), brand), 120)
+
+    assert end.merge(first, second) == first._replace(hits=120)
+
+
+def test_merge_one_group():
+    first = Query('index', '', end.browse, (frozenset({end.latest}), brand), 600)
+    second = Query('index', '', end.browse, (frozenset({end.latest}), jordan), 600)
+
+    merged = end.merge(first, second)
+    assert merged.filters == (frozenset({end.latest}), brand | jordan)
+    assert merged.hits == 1000
+
+
+def test_merge_rejects():
+    first = Query('index', '', end.browse, (frozenset({end.latest}), brand))
+
+    assert end.merge(first, first._replace(index='other')) is None
+    assert end.merge(first, first._replace(query='dunk')) is None
+    assert end.merge(first, first._replace(contexts=end.search)) is None
+    assert end.merge(first, first._replace(filters=(brand,))) is None
+    assert end.merge(first, first._replace(filters=(frozenset({end.footwear}), jordan))) is None
+
+
+def test_plan_covers_watched():
+    planned = end.plan(end.watched)
+
+    assert len(planned) < len(end.watched)
+    for query in end.watched:
+        assert any(covers(i, query) for i in planned)
+
+
+def test_plan_keeps_unrelated():
+    queries = [
+        Query('a', '', end.browse, (brand,)),
+        Query('b', '', end.browse, (brand,)),
+        Query('a', 'dunk', end.search, (brand,))
+    ]
+
+    assert end.plan(queries) == queries
+
+
+def test_body():
+    queries = end.plan(end.watched)
+    requests = loads(end.body(queries))['requests']
+
+    assert [i['indexName'] for i in requests] == [i.index for i in queries]
+    for request, query in zip(requests, queries):
+        params = parse_qs(request['params'])
+        assert params.get('query', [''])[0] == query.query
+        assert int(params['hitsPerPage'][0]) == query.hits
+        assert [frozenset(i) for i in loads(params['facetFilters'][0])] == list(query.filters)
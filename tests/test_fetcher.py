@@ -0,0 +1,30 @@
+import pytest
+
+from scripts import fetcher
+
+
+def request(url, suffix=''):
+    if 'bad' in url:
+        raise ConnectionError(url)
+    return url + suffix
+
+
+@pytest.mark.parametrize('limit', [1, 4])
+def test_fetch_keeps_order(limit):
+    urls = [f'https://a.com/{i}' for i in range(10)] + ['https://b.com/x']
+
+    assert fetcher.fetch(request, urls, limit, suffix='!') == [i + '!' for i in urls]
+
+
+@pytest.mark.parametrize('limit', [1, 4])
+def test_fetch_returns_failures_in_place(limit):
+    results = fetcher.fetch(request, ['https://a.com/1', 'https://a.com/bad', 'https://a.com/3'], limit)
+
+    assert results[0] == 'https://a.com/1' and results[2] == 'https://a.com/3'
+    assert isinstance(results[1], ConnectionError) and results[1].args == ('https://a.com/bad',)
+
+
+def test_fetch_single_failure():
+    result, = fetcher.fetch(request, ['https://a.com/bad'])
+
+    assert isinstance(result, ConnectionError)
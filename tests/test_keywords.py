@@ -0,0 +1,125 @@
+import os
+
+import pytest
+
+from scripts import keywords
+
+
+class Log:
+    def __init__(self):
+        self.errors = []
+
+    def error(self, message):
+        self.errors.append(message)
+
+
+class Kw:
+    def __init__(self):
+        self.calls = []
+
+    def check(self, *args):
+        self.calls.append(args)
+        return True
+
+
+class Parser:
+    def __init__(self):
+        self.log = Log()
+        self.kw = Kw()
+
+
+def write(path, text, mtime):
+    path.write_text(text)
+    os.utime(path, ns=(mtime, mtime))
+
+
+@pytest.fixture
+def registry(tmp_path, monkeypatch):
+    registry = keywords.Registry(str(tmp_path / 'keywords.yaml'), 0.)
+    monkeypatch.setattr(keywords, 'registry', registry)
+    return registry
+
+
+def test_priority():
+    matcher = keywords.Matcher(['yeezy'], ['dunk', 'jordan'], ['kids', 'slide'])
+
+    assert matcher.check('nike dunk low')
+    assert not matcher.check('nike dunk low kids')
+    assert matcher.check('yeezy slide')
+    assert not matcher.check('air max 90')
+
+
+def test_overlapping_terms():
+    matcher = keywords.Matcher(['hers'], ['he', 'she', 'his'], [])
+
+    assert matcher.hits('ushers') == keywords.Hits(frozenset({'hers'}), frozenset({'he', 'she'}), frozenset())
+    assert matcher.hits('ahishe').positive == {'his', 'she', 'he'}
+    assert matcher.hits('') == keywords.Hits(frozenset(), frozenset(), frozenset())
+
+
+def test_empty_term():
+    assert keywords.Matcher([], [''], []).check('anything')
+
+
+def test_build_is_cached():
+    assert keywords.build(('a',), ('b',), ()) is keywords.build(('a',), ('b',), ())
+
+
+def test_load_rejects_malformed(tmp_path):
+    path = tmp_path / 'keywords.yaml'
+
+    path.write_text('- dunk\n')
+    with pytest.raises(TypeError):
+        keywords.load(str(path))
+
+    path.write_text('absolute: []\npositive: dunk\nnegative: []\n')
+    with pytest.raises(TypeError):
+        keywords.load(str(path))
+
+
+def test_registry_reload(registry, tmp_path):
+    path = tmp_path / 'keywords.yaml'
+    assert registry.current() is None
+
+    write(path, 'absolute: []\npositive: [dunk]\nnegative: []\n', 1_000_000_000)
+    assert registry.current().check('dunk low')
+
+    write(path, 'absolute: []\npositive: [jordan]\nnegative: []\n', 2_000_000_000)
+    matcher = registry.current()
+    assert matcher.check('jordan 1') and not matcher.check('dunk low')
+
+    path.unlink()
+    assert registry.current() is None
+
+
+def test_registry_keeps_previous_on_error(registry, tmp_path):
+    path = tmp_path / 'keywords.yaml'
+    log = Log()
+
+    write(path, 'absolute: []\npositive: [dunk]\nnegative: []\n', 1_000_000_000)
+    previous = registry.current(log)
+
+    write(path, 'absolute: [\n', 2_000_000_000)
+    assert registry.current(log) is previous
+    assert len(log.errors) == 1 and 'keeping previous keywords' in log.errors[0]
+
+    assert registry.current(log) is previous
+    assert len(log.errors) == 1
+
+
+def test_check_falls_back_to_script_keywords(registry):
+    parser = Parser()
+
+    assert keywords.check(parser, 'Dunk Low')
+    assert keywords.check(parser, 'dunk-low', '-')
+    assert parser.kw.calls == [('Dunk Low',), ('dunk-low', '-')]
+
+
+def test_check_uses_matcher(registry, tmp_path):
+    write(tmp_path / 'keywords.yaml', 'absolute: []\npositive: [dunk low]\nnegative: []\n', 1_000_000_000)
+    parser = Parser()
+
+    assert keywords.check(parser, 'Nike DUNK LOW')
+    assert keywords.check(parser, 'nike-dunk-low', '-')
+    assert not keywords.check(parser, 'nike-dunk-low')
+    assert parser.kw.calls == []
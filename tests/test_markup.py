@@ -0,0 +1,80 @@
+import pytest
+
+from scripts import markup
+
+title = 'Кроссовки Nike Dunk'
+
+
+class Response:
+    def __init__(self, content, content_type='text/html', encoding=None):
+        self.content = content
+        self.headers = {'Content-Type': content_type}
+        self.encoding = encoding
+
+
+def page(encoding, meta=True):
+    head = f'<meta charset="{encoding}">' if meta else ''
+    return f'<html><head>{head}</head><body><h1>{title}</h1></body></html>'.encode(encoding)
+
+
+@pytest.mark.parametrize('value, expected', [
+    ('UTF-8', 'utf-8'),
+    ('"windows-1251"', 'cp1251'),
+    (b'cp1251', 'cp1251'),
+    ('latin-1', 'iso8859-1'),
+    ('', None),
+    ('no-such-charset', None)
+])
+def test_normalize(value, expected):
+    assert markup.normalize(value) == expected
+
+
+@pytest.mark.parametrize('content_type, expected', [
+    ('text/html; charset=windows-1251', 'cp1251'),
+    ('text/html;Charset="UTF-8"', 'utf-8'),
+    ('text/html', None),
+    ('', None)
+])
+def test_charset(content_type, expected):
+    assert markup.charset(Response(b'', content_type)) == expected
+
+
+@pytest.mark.parametrize('head, expected', [
+    (b'<meta charset="windows-1251">', 'cp1251'),
+    (b"<meta charset='utf-8'/>", 'utf-8'),
+    (b'<meta http-equiv="Content-Type" content="text/html; CHARSET=koi8-r">', 'koi8-r'),
+    (b'<meta name="viewport">', None)
+])
+def test_declared(head, expected):
+    assert markup.declared(head) == expected
+
+
+@pytest.mark.parametrize('encoding, expected', [
+    (None, 'utf-8'),
+    ('ISO-8859-1', 'utf-8'),
+    ('windows-1251', 'cp1251')
+])
+def test_fallback(encoding, expected):
+    assert markup.fallback(Response(b'', encoding=encoding)) == expected
+
+
+@pytest.mark.parametrize('response', [
+    Response(page('cp1251', False), 'text/html; charset=windows-1251'),
+    Response(page('cp1251')),
+    Response(page('utf-8', False), encoding='ISO-8859-1'),
+    Response(page('cp1251', False), encoding='windows-1251'),
+    Response(page('utf-8'), 'text/html; charset=utf-8')
+])
+def test_document(response):
+    assert markup.document(response).findtext('.//h1') == title
+
+
+def test_listing():
+    data = page('cp1251').replace(b'<h1>', b'<div class="header"><h1>skip</h1></div><ul class="grid"><li><h1>')
+
+    tree = markup.listing(data, b'class="grid"')
+    assert tree.findtext('.//h1') == title
+    assert tree.find('.//head') is None
+
+    assert markup.listing(data.decode('cp1251'), 'class="grid"').findtext('.//h1') == title
+    assert markup.listing(data, b'class="missing"').findtext('.//h1') == 'skip'
@@ -0,0 +1,61 @@
+import pytest
+from jsonpath2 import Path
+
+from scripts import paths
+
+document = {
+    'product': {'variants': [{'id': 1, 'title': '9'}, {'id': 2, 'title': '10'}], 'handle': 'dunk-low'},
+    'skus': {'a': {'size': 'S'}, 'b': {'size': 'M'}},
+    'skuList': [],
+    'items': [[1, 2], [3], []],
+    'odd key': {'x-y': 5, 'xy': 6},
+    'scalar': 7
+}
+
+
+@pytest.mark.parametrize('expression', [
+    '$',
+    '$.product.variants.*',
+    '$.product.variants[*]',
+    '$.product.variants[1]',
+    '$.product.variants[5]',
+    '$.product.variants.*.title',
+    '$.product.handle',
+    '$.product.missing',
+    '$.skus.*',
+    '$.skus.*.size',
+    '$.skuList.*',
+    '$.items.*.*',
+    '$.items[0][1]',
+    '$["odd key"]["x-y"]',
+    '$["odd key"].xy',
+    '$.scalar.*',
+    '$.*',
+    '$.product.variants[?(@.id = 2)].title'
+])
+def test_matches_jsonpath2(expression):
+    expected = [i.current_value for i in Path.parse_str(expression).match(document)]
+
+    assert list(paths.parse_path(expression)(document)) == expected
+
+
+@pytest.mark.parametrize('expression, steps', [
+    ('$', ()),
+    ('$.a[*].b', ('a', None, 'b')),
+    ("$['a b'][3]", ('a b', 3)),
+    ('$.a[?(@.b)]', None),
+    ('a.b', None)
+])
+def test_lower(expression, steps):
+    assert paths._lower(expression) == steps
+
+
+def test_single_quotes():
+    expected = [i.current_value for i in Path.parse_str('$["odd key"]["x-y"]').match(document)]
+
+    assert list(paths.parse_path("$['odd key'].x-y")(document)) == expected
+
+
+def test_root_list():
+    assert list(paths.parse_path('$[*]')([{'a': 1}, {'a': 2}])) == [{'a': 1}, {'a': 2}]
+    assert paths.parse_path('$[*]') is paths.parse_path('$[*]')
@@ -1,9 +1,10 @@
 from datetime import datetime, timedelta, timezone
 from typing import List, Union
 
-from lxml import etree
 from pycurl_requests import exceptions
 
+from scripts import fetcher, keywords
+from scripts.markup import document
 from source import api
 from source import logger
 from source.api import CatalogType, TargetType, RestockTargetType, ItemType, TargetEndType, IRelease, FooterItem
@@ -41,57 +42,61 @@ class Parser(api.Parser):
                 if isinstance(resp, exceptions.Timeout):
                     raise Exception('Timeout')
                 else:
-                    raise result
+                    raise resp
 
-            lxml_resp = etree.HTML(resp.text)
+            lxml_resp = document(resp)
 
+            links = []
             for item in lxml_resp.xpath('//a[@class="p_link"]'):
 
                 link = 'https://www.traektoria.ru' + item.get('href')
 
-                if self.kw.check(link.split('/')[4].split('_')[-1], div='-'):
-
-                    if HashStorage.check_target(api.Target(link, self.name, 0).hash()):
-
-                        ok, resp = self.provider.request(link, headers={'user-agent': self.user_agent})
-
-                        if not ok:
-                            if isinstance(resp, exceptions.Timeout):
-                                raise Exception('Timeout')
-                            else:
-                                raise result
-
-                        item_lxml = etree.HTML(resp.text)
-                        name = item_lxml.xpath('//meta[@name="keywords"]')[0].get('content')
-                        image = item_lxml.xpath('//meta[@property="og:image"]')[0].get('content')
-                        price = api.Price(api.CURRENCIES['RUB'],
-                                          float(item_lxml.xpath('//meta[@property="og:product:price:amount"]')[0]
-                                                .get('content')))
-                        sizes = api.Sizes(api.SIZE_TYPES[''],
-                                          [api.Size(size.text + ' US')
-                                           for size in item_lxml.xpath('//div[@class="choose_size_column"]/span')])
-
-                        stockx_link = f'https://stockx.com/search/sneakers?s={name.replace(" ", "%20")}'
-
-                        HashStorage.add_target(api.Target(link, self.name, 0).hash())
-
-                        result.append(
-                            IRelease(
-                                link,
-                                'traektoria',
-                                name,
-                                image,
-                                '',
-                                price,
-                                sizes,
-                                [
-                                    FooterItem('StockX', stockx_link),
-                                    FooterItem('Cart', 'https://www.traektoria.ru/cart/'),
-                                    FooterItem('Login', 'https://www.traektoria.ru/personal/')
-                                ],
-                                {'Site': '[Traektoria](https://www.traektoria.ru)'}
-                            )
+                if keywords.check(self, link.split('/')[4].split('_')[-1], div='-') \
+                        and HashStorage.check_target(api.Target(link, self.name, 0).hash()):
+                    links.append(link)
+
+            pages = fetcher.fetch(self.provider.request, links, headers={'user-agent': self.user_agent})
+
+            for link, page in zip(links, pages):
+
+                if HashStorage.check_target(api.Target(link, self.name, 0).hash()):
+
+                    ok, resp = (False, page) if isinstance(page, Exception) else page
+                    if not ok:
+                        self.log.error(f'{resp.__class__.__name__} ({resp.__str__()}) while fetching {link}')
+                        continue
+
+                    item_lxml = document(resp)
+                    name = item_lxml.xpath('//meta[@name="keywords"]')[0].get('content')
+                    image = item_lxml.xpath('//meta[@property="og:image"]')[0].get('content')
+                    price = api.Price(api.CURRENCIES['RUB'],
+                                      float(item_lxml.xpath('//meta[@property="og:product:price:amount"]')[0]
+                                            .get('content')))
+                    sizes = api.Sizes(api.SIZE_TYPES[''],
+                                      [api.Size(size.text + ' US')
+                                       for size in item_lxml.xpath('//div[@class="choose_size_column"]/span')])
+
+                    stockx_link = f'https://stockx.com/search/sneakers?s={name.replace(" ", "%20")}'
+
+                    HashStorage.add_target(api.Target(link, self.name, 0).hash())
+
+                    result.append(
+                        IRelease(
+                            link,
+                            'traektoria',
+                            name,
+                            image,
+                            '',
+                            price,
+                            sizes,
+                            [
+                                FooterItem('StockX', stockx_link),
+                                FooterItem('Cart', 'https://www.traektoria.ru/cart/'),
+                                FooterItem('Login', 'https://www.traektoria.ru/personal/')
+                            ],
+                            {'Site': '[Traektoria](https://www.traektoria.ru)'}
                         )
+                    )
 
             if isinstance(content, api.CSmart):
                 if result or content.expired:
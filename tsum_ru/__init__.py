@@ -2,11 +2,13 @@ from datetime import datetime, timedelta, timezone
 from json import JSONDecodeError
 from typing import List, Union
 
-from jsonpath2 import Path
 from pycurl_requests import exceptions
 from ujson import loads
 from user_agent import generate_user_agent
 
+from scripts import keywords, paths
+from scripts.conditional import Validators
+from scripts.fingerprints import Fingerprints
 from source import api
 from source import logger
 from source.api import CatalogType, TargetType, RestockTargetType, ItemType, TargetEndType, IRelease, FooterItem
@@ -14,12 +16,17 @@ from source.cache import HashStorage
 from source.library import SubProvider, Keywords
 from source.tools import LinearSmart, ScriptStorage
 
+items = paths.parse_path('$.*')
+skus = paths.parse_path('$.skuList.*')
+
 
 class Parser(api.Parser):
     def __init__(self, name: str, log: logger.Logger, provider_: SubProvider, storage: ScriptStorage, kw: Keywords):
         super().__init__(name, log, provider_, storage, kw)
         self.link: str = 'https://api.tsum.ru/v2/catalog/search?section=18440&brand=2165673,2030075,2375139'
         self.user_agent = generate_user_agent()
+        self.validators = Validators()
+        self.fingerprints = Fingerprints()
 
     @property
     def catalog(self) -> CatalogType:
@@ -38,8 +45,10 @@ class Parser(api.Parser):
         result = []
         if mode == 0:
 
-            ok, resp = self.provider.request(self.link,
-                                             headers={'user-agent': self.user_agent, 'accept': 'application/json'})
+            ok, resp = self.provider.request(
+                self.link,
+                headers=self.validators.headers(self.link, {'user-agent': self.user_agent, 'accept': 'application/json'})
+            )
 
             if not ok:
                 if isinstance(resp, exceptions.Timeout):
@@ -47,17 +56,25 @@ class Parser(api.Parser):
                 else:
                     raise resp
 
-            try:
-                json = loads(resp.content)
-            except ValueError:
-                return [api.CInterval(self.name, 600.), api.MAlert('Script go to sleep', self.name)]
+            if self.validators.modified(self.link, resp):
+                try:
+                    json = loads(resp.content)
+                except ValueError:
+                    self.validators.reset(self.link)
+                    return [api.CInterval(self.name, 600.), api.MAlert('Script go to sleep', self.name)]
+            else:
+                json = {}
 
-            for element in Path.parse_str('$.*').match(json):
+            for element in items(json):
                 try:
-                    name = element.current_value['title']
+                    name = element['title']
+
+                    if keywords.check(self, name):
+                        fingerprint = self.fingerprints.check(element['slug'], element['skuList'])
+                        if fingerprint is None:
+                            continue
 
-                    if self.kw.check(name):
-                        target = api.Target('https://www.tsum.ru/' + element.current_value['slug'], self.name, 0)
+                        target = api.Target('https://www.tsum.ru/' + element['slug'], self.name, 0)
 
                         if HashStorage.check_target(target.hash()):
                             HashStorage.add_target(target.hash())
@@ -70,25 +87,25 @@ class Parser(api.Parser):
                                     api.SIZE_TYPES[''],
                                     [
                                         api.Size(
-                                            size.current_value['size_vendor_name'] + ' US',
+                                            size['size_vendor_name'] + ' US',
                                             f'http://static.sellars.cf/'
-                                            f'links?site=tsum&id={size.current_value["item_id"]}'
-                                        ) for size in Path.parse_str('$.skuList.*').match(element.current_value)
-                                        if size.current_value['availabilityInStock'] is True
+                                            f'links?site=tsum&id={size["item_id"]}'
+                                        ) for size in skus(element)
+                                        if size['availabilityInStock'] is True
                                     ][1:]
                                 )
 
                         result.append(
                             IRelease(
                                 'https://www.tsum.ru/product/' +
-                                element.current_value['slug'] + f'?shash={sizes.hash().hex()}',
+                                element['slug'] + f'?shash={sizes.hash().hex()}',
                                 'tsum',
                                 name,
-                                element.current_value['photos'][0]['middle'],
+                                element['photos'][0]['middle'],
                                 '',
                                 api.Price(
                                     api.CURRENCIES['RUB'],
-                                    float(element.current_value['skuList'][0]['price_original'])
+                                    float(element['skuList'][0]['price_original'])
                                 ),
                                 sizes,
                                 [
@@ -100,7 +117,7 @@ class Parser(api.Parser):
                                     FooterItem(
                                         'Urban QT',
                                         f'https://autofill.cc/api/v1/qt?storeId=tsum&monitor='
-                                        f'{"https://www.tsum.ru/" + element.current_value["slug"]}'
+                                        f'{"https://www.tsum.ru/" + element["slug"]}'
                                     ),
                                     FooterItem('Cart', 'https://www.tsum.ru/cart'),
                                     FooterItem('Login', 'https://www.tsum.ru/login')
@@ -108,6 +125,7 @@ class Parser(api.Parser):
                                 additional_columns
                             )
                         )
+                        self.fingerprints.add(element['slug'], fingerprint)
                 except JSONDecodeError as e:
                     raise e
 
@@ -1,8 +1,7 @@
 from json import loads, JSONDecodeError
 from typing import List
 
-from jsonpath2 import Path
-
+from scripts import paths
 from source import api
 from source.api import IndexType, TargetType, StatusType
 from source.logger import Logger
@@ -16,6 +15,10 @@ headers = {
     'accept-language': 'en-US,en;q=0.5',
 }
 
+products = paths.parse_path('$[*]')
+variations = paths.parse_path('$.variation_list.*')
+skus = paths.parse_path('$.skus.*')
+
 
 class Parser(api.Parser):
     def __init__(self, name: str, log: Logger, provider: api.SubProvider, storage):
@@ -30,12 +33,12 @@ class Parser(api.Parser):
         try:
             data = [
                 api.TInterval(
-                    i.current_value['product_id'],
+                    i['product_id'],
                     self.name,
-                    'https://www.yeezysupply.com/api/products/' + i.current_value['product_id'],
+                    'https://www.yeezysupply.com/api/products/' + i['product_id'],
                     self.interval
                 )
-                for i in Path.parse_str('$[*]').match(
+                for i in products(
                     loads(self.provider.get(self.catalog, headers=headers, proxy=True, mode=1))
                 )
             ]
@@ -93,17 +96,17 @@ class Parser(api.Parser):
             return api.SFail(self.name, 'Wrong scheme')
         if available:
             if version_json == 1:
-                sizes_json = Path.parse_str('$.variation_list.*').match(availability_json)
+                sizes_json = variations(availability_json)
                 sizes = tuple(
-                    size.current_value['size'] + ' US' + ' [' + str(size.current_value['availability']) + ']' for size
+                    size['size'] + ' US' + ' [' + str(size['availability']) + ']' for size
                     in sizes_json
-                    if size.current_value['availability'] > 0)
+                    if size['availability'] > 0)
             else:
-                sizes_json = Path.parse_str('$.skus.*').match(availability_json)
+                sizes_json = skus(availability_json)
                 sizes = tuple(
-                    size.current_value['displaySize'] + ' US' + ' [' + str(size.current_value['hypeAvailability']) + ']'
+                    size['displaySize'] + ' US' + ' [' + str(size['hypeAvailability']) + ']'
                     for size in sizes_json
-                    if size.current_value['hypeAvailability'] > 0)
+                    if size['hypeAvailability'] > 0)
             return api.SSuccess(
                 self.name,
                 api.Result(
@@ -3,6 +3,8 @@ from typing import List, Union
 import pycurl
 import yaml
 
+from scripts import keywords
+from scripts.fingerprints import Fingerprints
 from source import api
 from source import logger
 from source.api import CatalogType, TargetType, RestockTargetType, ItemType, TargetEndType, IRelease, FooterItem
@@ -93,6 +95,7 @@ HEADERS = [
 class Parser(api.Parser):
     def __init__(self, name: str, log: logger.Logger, provider_: SubProvider, storage: ScriptStorage, kw: Keywords):
         super().__init__(name, log, provider_, storage, kw)
+        self.fingerprints = Fingerprints()
 
     @property
     def catalog(self) -> CatalogType:
@@ -132,7 +135,11 @@ class Parser(api.Parser):
                     currencies = 'EUR'
                     if LINKS[content.data][0] == 'uk':
                         currencies = 'GBP'
-                    if self.kw.check(name.lower()):
+                    if keywords.check(self, name.lower()):
+                        fingerprint = self.fingerprints.check(link, element['price'], element['sizes'])
+                        if fingerprint is None:
+                            continue
+
                         if float(element['price']['original'].replace(' ', '').replace(',', '.').replace('€', '').replace('£', ' ')) != \
                                 float(element['price']['promotional'].replace(' ', '').replace(',', '.').replace('€', '').replace('£', ' ')):
                             price = api.Price(api.CURRENCIES[currencies],
@@ -169,6 +176,7 @@ class Parser(api.Parser):
                                     {'Site': '[Zalando](https://en.zalando.de)'}
                                 )
                             )
+                        self.fingerprints.add(link, fingerprint)
             except Exception:
                  result.extend([self.catalog, api.MAlert('Script is crashed', self.name)])
 